@@ -0,0 +1,117 @@
+"""
+Compares parsing an arXiv search-results HTML page (BeautifulSoup) with parsing
+the equivalent Atom API feed (ElementTree iterparse, entry by entry).
+
+By default both fixtures are generated with the structure of the real responses
+and the same papers; pass recorded responses with --html / --atom instead.
+
+Usage (from backend/):
+    python -m benchmarks.bench_arxiv_parsing --papers 25 --repeat 50
+    python -m benchmarks.bench_arxiv_parsing --html search.html --atom query.xml
+"""
+import argparse
+import time
+from html import escape
+
+from src.tools.arxiv_search_tool import _parse_atom, _parse_results
+
+
+def make_papers(n: int) -> list[dict]:
+    abstract = ("We study retrieval-augmented generation with hybrid dense and sparse retrieval. " * 12).strip()
+    return [
+        {
+            "id": f"2401.{10000 + i:05d}",
+            "title": f"Hybrid retrieval for grounded generation, part {i}",
+            "authors": [f"Author {i}-{j}" for j in range(4)],
+            "abstract": abstract,
+        }
+        for i in range(n)
+    ]
+
+
+def make_html(papers: list[dict]) -> bytes:
+    items = []
+    for p in papers:
+        authors = ", ".join(f'<a href="/a/{escape(a)}">{escape(a)}</a>' for a in p["authors"])
+        items.append(f"""
+<li class="arxiv-result">
+  <div class="is-marginless">
+    <p class="list-title is-inline-block"><a href="https://arxiv.org/abs/{p['id']}">arXiv:{p['id']}</a>
+      <span>&nbsp;[<a href="https://arxiv.org/pdf/{p['id']}">pdf</a>, <a href="https://arxiv.org/format/{p['id']}">other</a>]&nbsp;</span>
+    </p>
+    <div class="tags is-inline-block"><span class="tag is-small is-link">cs.CL</span><span class="tag is-small is-grey">cs.IR</span></div>
+  </div>
+  <p class="title is-5 mathjax">{escape(p['title'])}</p>
+  <p class="authors"><span class="search-hit">Authors:</span> {authors}</p>
+  <p class="abstract mathjax">
+    <span class="search-hit">Abstract</span>:
+    <span class="abstract-short has-text-grey-dark mathjax">{escape(p['abstract'][:200])}&hellip;</span>
+    <span class="abstract-full has-text-grey-dark mathjax" style="display: none;">{escape(p['abstract'])}
+      <a class="is-size-7" style="white-space: nowrap;">&#9651; Less</a></span>
+  </p>
+  <p class="is-size-7"><span class="has-text-black-bis has-text-weight-semibold">Submitted</span> 1 January, 2024</p>
+</li>""")
+    page = f"""<!DOCTYPE html><html lang="en"><head><title>Search | arXiv e-print repository</title>
+<meta charset="utf-8"/><link rel="stylesheet" href="/static/base.css"/></head>
+<body><header><nav>{'<a href="#">menu</a>' * 40}</nav></header>
+<main><div class="content"><ol class="breathe-horizontal" start="1">{''.join(items)}</ol></div></main>
+<footer>{'<p>footer links</p>' * 20}</footer></body></html>"""
+    return page.encode("utf-8")
+
+
+def make_atom(papers: list[dict]) -> bytes:
+    entries = []
+    for p in papers:
+        authors = "".join(f"<author><name>{escape(a)}</name></author>" for a in p["authors"])
+        entries.append(f"""
+  <entry>
+    <id>http://arxiv.org/abs/{p['id']}v1</id>
+    <updated>2024-01-01T00:00:00Z</updated>
+    <published>2024-01-01T00:00:00Z</published>
+    <title>{escape(p['title'])}</title>
+    <summary>  {escape(p['abstract'])}
+</summary>
+    {authors}
+    <link href="http://arxiv.org/abs/{p['id']}v1" rel="alternate" type="text/html"/>
+    <link title="pdf" href="http://arxiv.org/pdf/{p['id']}v1" rel="related" type="application/pdf"/>
+    <arxiv:primary_category xmlns:arxiv="http://arxiv.org/schemas/atom" term="cs.CL" scheme="http://arxiv.org/schemas/atom"/>
+    <category term="cs.CL" scheme="http://arxiv.org/schemas/atom"/>
+  </entry>""")
+    feed = f"""<?xml version="1.0" encoding="UTF-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom">
+  <link href="http://arxiv.org/api/query" rel="self" type="application/atom+xml"/>
+  <title type="html">ArXiv Query</title>
+  <id>http://arxiv.org/api/query</id>
+  <updated>2024-01-01T00:00:00-05:00</updated>
+  <opensearch:totalResults xmlns:opensearch="http://a9.com/-/spec/opensearch/1.1/">{len(papers)}</opensearch:totalResults>
+  {''.join(entries)}
+</feed>"""
+    return feed.encode("utf-8")
+
+
+def bench(name: str, parse, content: bytes, repeat: int) -> None:
+    parse(content)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        results = parse(content)
+    per_call = (time.perf_counter() - start) / repeat
+    print(f"{name:<5} bytes={len(content):>8} papers={len(results):>3} "
+          f"{per_call * 1000:.2f} ms/page {len(results) / per_call:,.0f} papers/s")
+
+
+def main(papers: int, repeat: int, html_path: str | None, atom_path: str | None) -> None:
+    fixture = make_papers(papers)
+    html = open(html_path, "rb").read() if html_path else make_html(fixture)
+    atom = open(atom_path, "rb").read() if atom_path else make_atom(fixture)
+    bench("html", _parse_results, html, repeat)
+    bench("atom", _parse_atom, atom, repeat)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--papers", type=int, default=25, help="Papers per generated page.")
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--html", default=None, help="Recorded arxiv.org/search response.")
+    parser.add_argument("--atom", default=None, help="Recorded export.arxiv.org/api/query response.")
+    args = parser.parse_args()
+    main(args.papers, args.repeat, args.html, args.atom)
@@ -0,0 +1,75 @@
+"""
+Measures chunking throughput for source-text storage.
+
+Splits synthetic page/PDF texts with make_source_chunks (CHUNK_SIZE/CHUNK_OVERLAP
+from config unless overridden) and reports chars/s and chunks/s. With --embed,
+also embeds the chunks (dense + sparse) to show the cost add_to_db pays per source.
+
+Usage (from backend/):
+    python -m benchmarks.bench_chunking --docs 200 --chars 30000 --embed
+"""
+import argparse
+import random
+import time
+
+from src.vectordb import store
+
+
+WORDS = ["attention", "gradient", "mô hình", "retrieval", "embedding", "layer", "benchmark",
+         "dataset", "transformer", "loss", "optimizer", "token", "graph", "kernel", "sparse"]
+
+
+def make_text(chars: int, rng: random.Random) -> str:
+    paragraphs, size = [], 0
+    while size < chars:
+        sentence_count = rng.randint(3, 8)
+        paragraph = " ".join(
+            " ".join(rng.choice(WORDS) for _ in range(rng.randint(8, 20))).capitalize() + "."
+            for _ in range(sentence_count)
+        )
+        paragraphs.append(paragraph)
+        size += len(paragraph) + 2
+    return "\n\n".join(paragraphs)[:chars]
+
+
+def main(docs: int, chars: int, chunk_size: int | None, chunk_overlap: int | None, embed: bool) -> None:
+    if chunk_size is not None:
+        store.CHUNK_SIZE = chunk_size
+    if chunk_overlap is not None:
+        store.CHUNK_OVERLAP = chunk_overlap
+
+    rng = random.Random(0)
+    texts = [make_text(chars, rng) for _ in range(docs)]
+    total_chars = sum(len(text) for text in texts)
+
+    start = time.perf_counter()
+    chunks = []
+    for i, text in enumerate(texts):
+        documents, _ = store.make_source_chunks(text, {"title": f"doc {i}", "source": f"https://example.org/{i}"})
+        chunks += documents
+    elapsed = time.perf_counter() - start
+    print(f"chunking  docs={docs} chars={total_chars} chunks={len(chunks)} "
+          f"(size={store.CHUNK_SIZE}, overlap={store.CHUNK_OVERLAP}) wall={elapsed:.3f}s "
+          f"{total_chars / elapsed:,.0f} chars/s {len(chunks) / elapsed:,.0f} chunks/s")
+
+    if embed:
+        from src.config import get_embedding_model, get_sparse_embedding_model
+
+        contents = [chunk.page_content for chunk in chunks]
+        for name, model in (("dense", get_embedding_model()), ("sparse", get_sparse_embedding_model())):
+            model.embed_query("warm up")
+            start = time.perf_counter()
+            model.embed_documents(contents)
+            elapsed = time.perf_counter() - start
+            print(f"embedding {name:<6} chunks={len(contents)} wall={elapsed:.2f}s {len(contents) / elapsed:.1f} chunks/s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs", type=int, default=200)
+    parser.add_argument("--chars", type=int, default=30000, help="Characters of text per source.")
+    parser.add_argument("--chunk-size", type=int, default=None)
+    parser.add_argument("--chunk-overlap", type=int, default=None)
+    parser.add_argument("--embed", action="store_true", help="Also embed the chunks with the configured models.")
+    args = parser.parse_args()
+    main(args.docs, args.chars, args.chunk_size, args.chunk_overlap, args.embed)
@@ -0,0 +1,136 @@
+"""
+Compares collection profiles (quantization, HNSW, on-disk storage) on memory and
+search latency.
+
+For every profile a scratch collection is created with the same setup code as
+`python -m src.vectordb.setup`, filled with random dense + sparse vectors and
+queried with the hybrid prefetch/fusion request used by retrieve_from_db.
+
+Memory is reported two ways: an estimate of the RAM held by dense vectors for
+the profile, and, against a real server, Qdrant's own `memory_resident_bytes`
+from /metrics after loading. The in-memory client (`--url :memory:`) ignores
+quantization, HNSW and on-disk settings, so use it only to smoke-test the script.
+
+Usage (from backend/):
+    python -m benchmarks.bench_collection_profiles --url http://localhost:6333 --points 50000 --queries 500
+"""
+import argparse
+import random
+import statistics
+import time
+
+import httpx
+from qdrant_client import QdrantClient
+from qdrant_client.http import models
+
+from src.config import DENSE_VECTOR_DIM, DENSE_VECTOR_NAME, SPARSE_VECTOR_NAME
+from src.vectordb.profiles import COLLECTION_PROFILES, search_params
+from src.vectordb.setup import create_qdrant_collection
+
+SPARSE_VOCAB = 30000
+
+
+def random_dense(rng: random.Random) -> list[float]:
+    return [rng.gauss(0, 1) for _ in range(DENSE_VECTOR_DIM)]
+
+
+def random_sparse(rng: random.Random) -> models.SparseVector:
+    indices = sorted(rng.sample(range(SPARSE_VOCAB), 40))
+    return models.SparseVector(indices=indices, values=[rng.random() for _ in indices])
+
+
+def estimated_dense_ram(profile: dict, points: int) -> int:
+    if profile["quantization"] == "scalar":
+        return points * DENSE_VECTOR_DIM
+    if profile["quantization"] == "binary":
+        return points * DENSE_VECTOR_DIM // 8
+    return 0 if profile["on_disk"] else points * DENSE_VECTOR_DIM * 4
+
+
+def server_resident_bytes(url: str) -> int | None:
+    try:
+        metrics = httpx.get(f"{url.rstrip('/')}/metrics", timeout=5).text
+    except httpx.HTTPError:
+        return None
+    for line in metrics.splitlines():
+        if line.startswith("memory_resident_bytes"):
+            return int(float(line.split()[-1]))
+    return None
+
+
+def load(client: QdrantClient, collection: str, points: int, rng: random.Random) -> None:
+    batch = 256
+    for start in range(0, points, batch):
+        client.upsert(
+            collection_name=collection,
+            points=[
+                models.PointStruct(
+                    id=i,
+                    vector={DENSE_VECTOR_NAME: random_dense(rng), SPARSE_VECTOR_NAME: random_sparse(rng)},
+                    payload={"page_content": f"doc {i}", "metadata": {"source": f"https://example.com/{i}"}},
+                )
+                for i in range(start, min(start + batch, points))
+            ],
+        )
+
+
+def wait_for_green(client: QdrantClient, collection: str) -> None:
+    while client.get_collection(collection).status != models.CollectionStatus.GREEN:
+        time.sleep(0.5)
+
+
+def search_latencies(client, collection, profile, queries, oversampling, rng) -> list[float]:
+    latencies = []
+    for _ in range(queries):
+        start = time.perf_counter()
+        client.query_points(
+            collection_name=collection,
+            prefetch=[
+                models.Prefetch(
+                    query=random_dense(rng), using=DENSE_VECTOR_NAME, limit=20,
+                    params=search_params(profile, oversampling),
+                ),
+                models.Prefetch(query=random_sparse(rng), using=SPARSE_VECTOR_NAME, limit=20),
+            ],
+            query=models.FusionQuery(fusion=models.Fusion.RRF),
+            limit=3,
+        )
+        latencies.append((time.perf_counter() - start) * 1000)
+    return sorted(latencies)
+
+
+def main(url: str, profiles: list[str], points: int, queries: int, oversampling: float) -> None:
+    client = QdrantClient(":memory:") if url == ":memory:" else QdrantClient(url=url)
+    rng = random.Random(0)
+    print(f"{'profile':<12}{'est. dense RAM':>16}{'server RSS':>14}{'load s':>9}{'p50 ms':>9}{'p99 ms':>9}")
+    for name in profiles:
+        profile = COLLECTION_PROFILES[name]
+        collection = f"bench_profile_{name}"
+        if client.collection_exists(collection):
+            client.delete_collection(collection)
+        create_qdrant_collection(name, client=client, collection_name=collection)
+
+        start = time.perf_counter()
+        load(client, collection, points, rng)
+        if url != ":memory:":
+            wait_for_green(client, collection)
+        load_s = time.perf_counter() - start
+
+        rss = server_resident_bytes(url) if url != ":memory:" else None
+        latencies = search_latencies(client, collection, profile, queries, oversampling, rng)
+        p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+        print(f"{name:<12}{estimated_dense_ram(profile, points) / 2**20:>13.1f}MiB"
+              f"{(f'{rss / 2**20:.0f}MiB' if rss else '-'):>14}{load_s:>9.1f}"
+              f"{statistics.median(latencies):>9.2f}{p99:>9.2f}")
+        client.delete_collection(collection)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default=":memory:")
+    parser.add_argument("--profiles", default=",".join(COLLECTION_PROFILES))
+    parser.add_argument("--points", type=int, default=10000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--oversampling", type=float, default=2.0)
+    args = parser.parse_args()
+    main(args.url, args.profiles.split(","), args.points, args.queries, args.oversampling)
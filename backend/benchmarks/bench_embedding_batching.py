@@ -0,0 +1,62 @@
+"""
+Compares per-call embedding against the cross-session micro-batcher.
+
+Simulates many concurrent sessions that each embed one query (dense + sparse),
+as retrieve_from_db does, and reports wall time, throughput and the average
+batch size the batcher achieved.
+
+Usage (from backend/):
+    python -m benchmarks.bench_embedding_batching --sessions 256 --batch-size 64 --wait-ms 10
+"""
+import argparse
+import asyncio
+import time
+
+from langchain_huggingface import HuggingFaceEmbeddings
+from langchain_qdrant import FastEmbedSparse
+
+from src.vectordb.batching import BatchedEmbeddings, BatchedSparseEmbeddings
+
+
+def make_queries(n: int) -> list[str]:
+    topics = ["transformers", "graph neural networks", "học máy", "quantum computing", "diffusion models"]
+    return [f"{topics[i % len(topics)]} survey {i}" for i in range(n)]
+
+
+async def run(dense, sparse, queries: list[str]) -> float:
+    async def session(query: str):
+        await asyncio.gather(dense.aembed_query(query), sparse.aembed_query(query))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(session(q) for q in queries))
+    return time.perf_counter() - start
+
+
+async def main(sessions: int, batch_size: int, wait_ms: float) -> None:
+    dense = HuggingFaceEmbeddings(model_name="BAAI/bge-m3")
+    sparse = FastEmbedSparse(model_name="Qdrant/bm25")
+    queries = make_queries(sessions)
+
+    dense.embed_query("warm up")
+    sparse.embed_query("warm up")
+
+    unbatched = await run(dense, sparse, queries)
+    print(f"per-call  sessions={sessions} wall={unbatched:.2f}s throughput={sessions / unbatched:.1f} queries/s")
+
+    batched_dense = BatchedEmbeddings(dense, batch_size, wait_ms / 1000)
+    batched_sparse = BatchedSparseEmbeddings(sparse, batch_size, wait_ms / 1000)
+    batched = await run(batched_dense, batched_sparse, queries)
+    print(f"batched   sessions={sessions} wall={batched:.2f}s throughput={sessions / batched:.1f} queries/s")
+    for batcher in (batched_dense.batcher, batched_sparse.batcher):
+        summary = batcher.summary("queries")
+        print(f"  {batcher.name:<16} batches={summary['batches']} avg_batch={summary['avg_batch_size']:.1f} "
+              f"model_throughput={summary['texts_per_s']:.1f} texts/s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=128)
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--wait-ms", type=float, default=10)
+    args = parser.parse_args()
+    asyncio.run(main(args.sessions, args.batch_size, args.wait_ms))
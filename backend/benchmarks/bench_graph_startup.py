@@ -0,0 +1,51 @@
+"""
+Measures connection-to-first-event latency of the agent graph.
+
+"before" rebuilds and compiles the graph for every connection (the old
+`create_graph()` per WebSocket), "after" reuses the process-wide compiled graph
+from `get_graph()`. Only the first streamed event is awaited, so no LLM or
+search call is made.
+
+Usage (from backend/):
+    python -m benchmarks.bench_graph_startup --connections 200
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from src.agent.graph import create_graph, get_graph
+
+
+async def first_event_latency(acquire_graph) -> float:
+    start = time.perf_counter()
+    graph = acquire_graph()
+    events = graph.astream_events({"user_query": "benchmark"}, config={"recursion_limit": 50}, version="v2")
+    try:
+        await events.__anext__()
+    finally:
+        await events.aclose()
+    return time.perf_counter() - start
+
+
+def report(label: str, samples: list[float]) -> None:
+    samples_ms = sorted(s * 1000 for s in samples)
+    p50 = statistics.median(samples_ms)
+    p99 = samples_ms[min(len(samples_ms) - 1, int(len(samples_ms) * 0.99))]
+    print(f"{label:<8} n={len(samples_ms):<5} mean={statistics.mean(samples_ms):8.2f}ms "
+          f"p50={p50:8.2f}ms p99={p99:8.2f}ms")
+
+
+async def main(connections: int) -> None:
+    before = [await first_event_latency(create_graph) for _ in range(connections)]
+    get_graph()
+    after = [await first_event_latency(get_graph) for _ in range(connections)]
+    report("before", before)
+    report("after", after)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--connections", type=int, default=100)
+    args = parser.parse_args()
+    asyncio.run(main(args.connections))
@@ -0,0 +1,103 @@
+"""
+Benchmarks HTML text extraction on a corpus of saved pages.
+
+Compares the old approach (BeautifulSoup html.parser, every <p> joined) with each
+installed backend of src/tools/html_text.py. Reports parse time per page and the
+approximate number of context tokens each would send to the summary prompt.
+With --pool, also measures throughput through the shared process pool.
+
+Save pages with e.g. `curl -L -o corpus/page1.html <url>`. Without --corpus, a
+set of generated article pages with navigation, sidebars and footers is used.
+
+Usage (from backend/):
+    python -m benchmarks.bench_html_extraction --corpus path/to/html --max-tokens 3000 --pool
+"""
+import argparse
+import asyncio
+import glob
+import os
+import time
+
+from src.tools.html_text import CHARS_PER_TOKEN, EXTRACTORS, extract_html_text
+
+
+def make_page(i: int) -> bytes:
+    nav = "".join(f'<li><a href="/section/{j}">Section {j}</a></li>' for j in range(60))
+    sidebar = "".join(f'<li><a href="/post/{j}">Related post number {j} you may like</a></li>' for j in range(30))
+    body = "".join(
+        f"<h2>Part {k}</h2>" + "".join(
+            f"<p>Paragraph {k}.{m} of article {i} explains how retrieval pipelines trade recall for latency, "
+            f"with <a href='/ref/{m}'>a reference</a> and some more explanatory text.</p>"
+            for m in range(8)
+        )
+        for k in range(6)
+    )
+    footer = "".join(f'<p><a href="/legal/{j}">Legal link {j}</a></p>' for j in range(25))
+    return f"""<!DOCTYPE html><html><head><title>Article {i}</title>
+<script>{'var x = 1;' * 500}</script><style>{'.a {{ color: red; }}' * 300}</style></head>
+<body><header><nav><ul>{nav}</ul></nav></header>
+<main><article><h1>Article {i}</h1>{body}</article></main>
+<aside><ul>{sidebar}</ul></aside><footer>{footer}</footer></body></html>""".encode("utf-8")
+
+
+def old_extract(content: bytes) -> str:
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(content, "html.parser")
+    return "\n".join([p.get_text() for p in soup.find_all("p")])
+
+
+def installed_backends() -> list[str]:
+    names = []
+    for name in EXTRACTORS:
+        try:
+            EXTRACTORS[name](b"<html><body><p>probe</p></body></html>")
+        except ImportError:
+            continue
+        names.append(name)
+    return names
+
+
+def bench(name: str, extract, pages: list[bytes]) -> None:
+    start = time.perf_counter()
+    chars = sum(len(extract(page)) for page in pages)
+    elapsed = time.perf_counter() - start
+    print(f"{name:<22} {elapsed / len(pages) * 1000:7.2f} ms/page  "
+          f"~{chars / CHARS_PER_TOKEN / len(pages):8.0f} tokens/page")
+
+
+async def bench_pool(pages: list[bytes], max_tokens: int) -> None:
+    from src.tools.web_search_tool import extract_page
+    from src.workers import shutdown_process_pool
+
+    await extract_page(pages[0], "auto", max_tokens)
+    start = time.perf_counter()
+    await asyncio.gather(*(extract_page(page, "auto", max_tokens) for page in pages))
+    elapsed = time.perf_counter() - start
+    print(f"{'pool (auto)':<22} {len(pages) / elapsed:7.1f} pages/s over {len(pages)} pages")
+    shutdown_process_pool()
+
+
+def main(corpus: str | None, pages: int, max_tokens: int, pool: bool) -> None:
+    if corpus:
+        documents = [open(path, "rb").read() for path in sorted(glob.glob(os.path.join(corpus, "*.htm*")))]
+    else:
+        documents = [make_page(i) for i in range(pages)]
+    print(f"{len(documents)} pages, {sum(map(len, documents)) / len(documents) / 1024:.0f} KiB on average")
+
+    bench("old (bs4, all <p>)", old_extract, documents)
+    for name in installed_backends():
+        bench(name, lambda page, name=name: extract_html_text(page, name)[1], documents)
+        bench(f"{name} + cap {max_tokens}", lambda page, name=name: extract_html_text(page, name, max_tokens)[1], documents)
+    if pool:
+        asyncio.run(bench_pool(documents, max_tokens))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", default=None, help="Directory of saved .html pages.")
+    parser.add_argument("--pages", type=int, default=50, help="Generated pages when no corpus is given.")
+    parser.add_argument("--max-tokens", type=int, default=3000)
+    parser.add_argument("--pool", action="store_true", help="Also measure extraction through the process pool.")
+    args = parser.parse_args()
+    main(args.corpus, args.pages, args.max_tokens, args.pool)
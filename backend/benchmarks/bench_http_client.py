@@ -0,0 +1,108 @@
+"""
+Exercises the shared outbound HTTP layer against a local stub server.
+
+The stub answers over keep-alive HTTP/1.1 with a fixed body, an optional delay,
+and a share of 503 responses to trigger retries. It compares a fresh client per
+request (the old `requests.get` pattern) with the pooled `src.http_client.request`,
+then prints the per-host metrics (connection reuse, retries, latency).
+
+Usage (from backend/):
+    python -m benchmarks.bench_http_client --requests 200 --concurrency 20 --fail-rate 0.05
+"""
+import argparse
+import asyncio
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+
+from src import http_client
+
+
+def start_stub_server(body_bytes: int, delay_ms: float, fail_rate: float) -> ThreadingHTTPServer:
+    body = b"x" * body_bytes
+    rng = random.Random(0)
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            time.sleep(delay_ms / 1000)
+            with lock:
+                fail = rng.random() < fail_rate
+            status, payload = (503, b"busy") if fail else (200, body)
+            self.send_response(status)
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+async def run_fresh(url: str, n: int, concurrency: int) -> tuple[float, int]:
+    semaphore = asyncio.Semaphore(concurrency)
+    failures = 0
+
+    async def one():
+        nonlocal failures
+        async with semaphore:
+            async with httpx.AsyncClient() as client:
+                response = await client.get(url)
+                failures += response.status_code >= 400
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(n)))
+    return time.perf_counter() - start, failures
+
+
+async def run_pooled(url: str, n: int, concurrency: int) -> tuple[float, int]:
+    semaphore = asyncio.Semaphore(concurrency)
+    failures = 0
+
+    async def one():
+        nonlocal failures
+        async with semaphore:
+            response = await http_client.get(url)
+            failures += response.status_code >= 400
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(n)))
+    return time.perf_counter() - start, failures
+
+
+async def main(requests: int, concurrency: int, body_bytes: int, delay_ms: float, fail_rate: float) -> None:
+    server = start_stub_server(body_bytes, delay_ms, fail_rate)
+    url = f"http://127.0.0.1:{server.server_address[1]}/page"
+    try:
+        wall, failures = await run_fresh(url, requests, concurrency)
+        print(f"fresh   requests={requests} wall={wall:.2f}s {requests / wall:.1f} req/s failed={failures}")
+
+        http_client.http_metrics.reset()
+        wall, failures = await run_pooled(url, requests, concurrency)
+        print(f"pooled  requests={requests} wall={wall:.2f}s {requests / wall:.1f} req/s failed={failures}")
+        for host, stats in http_client.http_metrics.summary().items():
+            print(f"  {host}: attempts={stats['requests']} retries={stats['retries']} "
+                  f"connections={stats['connections']} reuse={stats['reuse_rate']:.1%} "
+                  f"p50={stats['latency_p50_s'] * 1000:.1f}ms p95={stats['latency_p95_s'] * 1000:.1f}ms")
+    finally:
+        await http_client.aclose_async_client()
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--body-bytes", type=int, default=20000)
+    parser.add_argument("--delay-ms", type=float, default=5)
+    parser.add_argument("--fail-rate", type=float, default=0.05)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.concurrency, args.body_bytes, args.delay_ms, args.fail_rate))
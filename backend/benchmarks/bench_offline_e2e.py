@@ -0,0 +1,193 @@
+"""
+Offline end-to-end benchmark of the agent graph and the /feedback endpoint.
+
+Everything external is replaced by the deterministic stand-ins in
+benchmarks/offline.py (fake chat model, hashing embeddings, in-memory Qdrant,
+recorded HTTP fixtures, fake Google listing), each with a configurable latency,
+so the run needs no network, API keys or Qdrant server.
+
+Simulated WebSocket clients drive the real /ws handler concurrently. The report
+covers end-to-end and per-node p50/p95/p99 latency (from the handler's timing
+events), time to the first streamed passage, session throughput, /feedback latency and LLM usage per prompt template.
+
+Usage (from backend/):
+    python -m benchmarks.bench_offline_e2e --sessions 200 --concurrency 20 --llm-ms 300 --http-ms 80
+    python -m benchmarks.bench_offline_e2e --variant parallel --distinct-queries 20 --semantic-cache
+    python -m benchmarks.bench_offline_e2e --distinct-queries 10 --llm-cache
+"""
+import argparse
+import asyncio
+import os
+import time
+from collections import defaultdict
+
+TOPICS = [
+    "hybrid retrieval", "học máy ứng dụng", "vector quantization", "tin tức công nghệ",
+    "cross-encoder reranking", "giáo dục trực tuyến", "graph neural networks", "năng lượng tái tạo",
+]
+
+
+def percentile(values: list[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q / 100 * (len(ordered) - 1))))]
+
+
+def describe(values: list[float]) -> str:
+    return (f"n={len(values):<5} p50={percentile(values, 50) * 1000:8.1f}ms "
+            f"p95={percentile(values, 95) * 1000:8.1f}ms p99={percentile(values, 99) * 1000:8.1f}ms")
+
+
+class SimulatedWebSocket:
+    """The subset of starlette's WebSocket the /ws handler uses, recording what it sends."""
+
+    def __init__(self, query: str, variant: str):
+        self.query = query
+        self.query_params = {"variant": variant, "timings": "1"}
+        self.messages = []
+
+    async def accept(self):
+        self.started = time.perf_counter()
+
+    async def receive_text(self) -> str:
+        return self.query
+
+    async def send_json(self, message: dict):
+        self.messages.append((time.perf_counter() - self.started, message))
+
+    async def close(self):
+        self.finished = time.perf_counter()
+
+
+async def run_sessions(sessions: int, concurrency: int, distinct: int, variant: str) -> dict:
+    from src.api.endpoints import websocket_endpoint
+
+    semaphore = asyncio.Semaphore(concurrency)
+    totals, first_events, first_documents = [], [], []
+    node_times, outcomes = defaultdict(list), defaultdict(int)
+    streamed_tokens = [0]
+
+    async def session(i: int):
+        query = f"{TOPICS[i % distinct % len(TOPICS)]} {i % distinct}"
+        ws = SimulatedWebSocket(query, variant)
+        async with semaphore:
+            await websocket_endpoint(ws)
+        totals.append(ws.finished - ws.started)
+        if ws.messages:
+            first_events.append(ws.messages[0][0])
+        streamed_tokens[0] += sum(message["type"] == "token" for _, message in ws.messages)
+        documents = [at for at, message in ws.messages if message["type"] == "document"]
+        if documents:
+            first_documents.append(documents[0])
+        for _, message in ws.messages:
+            if message["type"] == "timing":
+                node_times[message["node"]].append(message["duration_s"])
+        last = ws.messages[-1][1] if ws.messages else {}
+        outcome = last.get("type", "none")
+        if outcome == "result":
+            outcome = "answered" if last["data"].get("final_results") else "empty"
+        outcomes[outcome] += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(session(i) for i in range(sessions)))
+    wall = time.perf_counter() - start
+    return {
+        "wall": wall,
+        "totals": totals,
+        "first_events": first_events,
+        "first_documents": first_documents,
+        "nodes": node_times,
+        "outcomes": outcomes,
+        "streamed_tokens": streamed_tokens[0],
+    }
+
+
+async def run_feedback(requests: int, concurrency: int) -> list[float]:
+    from src.api.endpoints import get_translation_feedback
+    from src.schemas import TranslationFeedbackRequest
+
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one(i: int):
+        request = TranslationFeedbackRequest(
+            original_passage="Học máy đang thay đổi cách chúng ta làm việc. Nhiều công ty đã áp dụng nó.",
+            current_sentence="Học máy đang thay đổi cách chúng ta làm việc.",
+            user_translation=f"Machine learning is changing how we work ({i}).",
+        )
+        async with semaphore:
+            start = time.perf_counter()
+            await get_translation_feedback(request)
+            latencies.append(time.perf_counter() - start)
+
+    await asyncio.gather(*(one(i) for i in range(requests)))
+    return latencies
+
+
+async def main(args) -> None:
+    from benchmarks import offline
+    from src.agent.graph import preload_graphs
+    from src.http_client import aclose_async_client
+    from src.metrics import llm_calls, llm_tokens, llm_cache_lookups, llm_cache_saved_tokens
+    from src.workers import shutdown_process_pool
+
+    offline.install(
+        llm_latency_s=args.llm_ms / 1000,
+        embed_latency_s=args.embed_ms / 1000,
+        http_latency_s=args.http_ms / 1000,
+        search_latency_s=args.search_ms / 1000,
+        route=args.route,
+    )
+    preload_graphs([args.variant])
+    try:
+        result = await run_sessions(args.sessions, args.concurrency, args.distinct_queries or args.sessions, args.variant)
+        feedback = await run_feedback(args.feedback_requests, args.concurrency)
+    finally:
+        await aclose_async_client()
+        shutdown_process_pool()
+
+    print(f"variant={args.variant} sessions={args.sessions} concurrency={args.concurrency} "
+          f"latency: llm={args.llm_ms}ms embed={args.embed_ms}ms http={args.http_ms}ms search={args.search_ms}ms")
+    print(f"throughput  {args.sessions / result['wall']:.2f} sessions/s (wall {result['wall']:.2f}s)  "
+          f"outcomes={dict(result['outcomes'])}")
+    print(f"end-to-end  {describe(result['totals'])}")
+    print(f"first event {describe(result['first_events'])}")
+    print(f"first doc   {describe(result['first_documents'])}  streamed tokens={result['streamed_tokens']}")
+    print("per node (by total time):")
+    for node, times in sorted(result["nodes"].items(), key=lambda item: -sum(item[1])):
+        print(f"  {node:<22} {describe(times)} total={sum(times):.2f}s")
+    print(f"/feedback   {describe(feedback)}")
+    calls, tokens = llm_calls.snapshot(), llm_tokens.snapshot()
+    print("llm calls by template:")
+    for template, count in sorted(calls.items()):
+        print(f"  {template:<22} calls={count:<6.0f} input_tokens={tokens.get(f'{template},input', 0):<8.0f} "
+              f"output_tokens={tokens.get(f'{template},output', 0):.0f}")
+    lookups, saved = llm_cache_lookups.snapshot(), llm_cache_saved_tokens.snapshot()
+    if lookups:
+        print("llm cache by template:")
+        for template in sorted({key.split(",")[0] for key in lookups}):
+            hits, misses = lookups.get(f"{template},hit", 0), lookups.get(f"{template},miss", 0)
+            print(f"  {template:<22} hit_rate={hits / (hits + misses):.2f} hits={hits:<6.0f} "
+                  f"saved_tokens={saved.get(template, 0):.0f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--distinct-queries", type=int, default=0,
+                        help="Cycle over this many distinct queries (0: every session asks something new).")
+    parser.add_argument("--variant", default="default", help="Graph variant, e.g. default or parallel.")
+    parser.add_argument("--route", choices=["mixed", "web", "arxiv"], default="mixed")
+    parser.add_argument("--llm-ms", type=float, default=200)
+    parser.add_argument("--embed-ms", type=float, default=5)
+    parser.add_argument("--http-ms", type=float, default=50)
+    parser.add_argument("--search-ms", type=float, default=100, help="Latency of the Google result listing.")
+    parser.add_argument("--feedback-requests", type=int, default=50)
+    parser.add_argument("--semantic-cache", action="store_true", help="Enable the semantic answer cache.")
+    parser.add_argument("--llm-cache", action="store_true", help="Enable the in-memory LLM response cache.")
+    args = parser.parse_args()
+    os.environ["SEMANTIC_CACHE_ENABLED"] = "true" if args.semantic_cache else "false"
+    os.environ["LLM_CACHE_ENABLED"] = "true" if args.llm_cache else "false"
+    asyncio.run(main(args))
@@ -0,0 +1,52 @@
+"""
+Measures import and cold-start time of the app and the setup script.
+
+Every measurement runs in a fresh interpreter so module caches do not hide
+the cost:
+  - import main                : what uvicorn pays before serving
+  - import src.vectordb.setup  : what `python -m src.vectordb.setup` pays
+  - cold start                 : import main + warm_up() (models loaded, first embedding done)
+
+Usage (from backend/):
+    python -m benchmarks.bench_startup --repeat 3
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+
+SNIPPETS = {
+    "import main": "import main",
+    "import src.vectordb.setup": "import src.vectordb.setup",
+    "cold start (import + warm_up)": "import main\nfrom src.config import warm_up\nwarm_up()",
+}
+
+TIMER = """
+import time
+_start = time.perf_counter()
+{body}
+print(time.perf_counter() - _start)
+"""
+
+
+def measure(body: str) -> float:
+    output = subprocess.run(
+        [sys.executable, "-c", TIMER.format(body=body)],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return float(output.strip().splitlines()[-1])
+
+
+def main(repeat: int) -> None:
+    for label, body in SNIPPETS.items():
+        samples = [measure(body) for _ in range(repeat)]
+        print(f"{label:<32} median={statistics.median(samples):7.3f}s min={min(samples):7.3f}s max={max(samples):7.3f}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    main(args.repeat)
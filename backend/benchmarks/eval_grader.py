@@ -0,0 +1,87 @@
+"""
+Offline evaluation of the document grader modes.
+
+Runs every labeled query/document set through the LLM grader and the local
+modes, then reports per-query latency, LLM fallbacks, agreement with the LLM
+grader (per-document relevant/irrelevant decisions) and accuracy against the
+labels. The "score" mode grades on each document's dense cosine similarity
+to the query, as retrieval reports it; rows without recorded `scores` get them
+from the configured embedding model (outside the timed part, since retrieval
+returns them for free).
+
+Dataset format (JSONL), one row per query; `scores` is optional:
+    {"query": "...", "documents": ["...", ...], "relevant": [0, 2], "scores": [0.8, ...]}
+
+Usage (from backend/):
+    python -m benchmarks.eval_grader --data benchmarks/data/grading_eval.jsonl
+"""
+import argparse
+import asyncio
+import json
+import math
+import statistics
+import time
+
+from langchain_core.documents import Document
+
+from src.agent.grading import grade_documents
+from src.config import get_embedding_model
+
+
+def decisions(indices: list[int], n: int) -> list[bool]:
+    chosen = set(indices)
+    return [i in chosen for i in range(n)]
+
+
+def cosine(a: list[float], b: list[float]) -> float:
+    norms = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(x * x for x in b))
+    return sum(x * y for x, y in zip(a, b)) / norms if norms else 0.0
+
+
+async def similarity_scores(query: str, documents: list[str]) -> list[float]:
+    """Dense cosine similarity of the query and each document, as score grading sees it."""
+    model = get_embedding_model()
+    query_vector, vectors = await asyncio.gather(model.aembed_query(query), model.aembed_documents(documents))
+    return [cosine(query_vector, vector) for vector in vectors]
+
+
+async def evaluate(rows: list[dict], modes: list[str]) -> None:
+    results = {mode: {"latency": [], "decisions": [], "llm_docs": 0, "docs": 0} for mode in modes}
+    for row in rows:
+        docs = [Document(page_content=text) for text in row["documents"]]
+        if "score" in modes and "scores" not in row:
+            row["scores"] = await similarity_scores(row["query"], row["documents"])
+        for mode in modes:
+            start = time.perf_counter()
+            indices, _, counts = await grade_documents(row["query"], docs, row.get("scores"), mode=mode)
+            results[mode]["latency"].append(time.perf_counter() - start)
+            results[mode]["decisions"].append(decisions(indices, len(docs)))
+            results[mode]["llm_docs"] += counts.get("llm", 0)
+            results[mode]["docs"] += len(docs)
+
+    labels = [decisions(row["relevant"], len(row["documents"])) for row in rows]
+    reference = results.get("llm", {}).get("decisions")
+    print(f"{'mode':<10}{'queries':>8}{'p50 ms':>10}{'max ms':>10}{'llm docs':>10}{'agree llm':>11}{'accuracy':>10}")
+    for mode, result in results.items():
+        if not result["latency"]:
+            continue
+        latencies = sorted(l * 1000 for l in result["latency"])
+        flat = [d for row in result["decisions"] for d in row]
+        flat_labels = [d for row in labels[:len(result["decisions"])] for d in row]
+        accuracy = sum(a == b for a, b in zip(flat, flat_labels)) / len(flat)
+        agreement = "-"
+        if reference and mode != "llm" and len(reference) == len(result["decisions"]):
+            flat_ref = [d for row in reference for d in row]
+            agreement = f"{sum(a == b for a, b in zip(flat, flat_ref)) / len(flat):.0%}"
+        print(f"{mode:<10}{len(latencies):>8}{statistics.median(latencies):>10.1f}{latencies[-1]:>10.1f}"
+              f"{result['llm_docs']:>5}/{result['docs']:<4}{agreement:>11}{accuracy:>10.0%}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--data", default="benchmarks/data/grading_eval.jsonl")
+    parser.add_argument("--modes", default="llm,reranker,score")
+    args = parser.parse_args()
+    with open(args.data, encoding="utf-8") as f:
+        rows = [json.loads(line) for line in f if line.strip()]
+    asyncio.run(evaluate(rows, args.modes.split(",")))
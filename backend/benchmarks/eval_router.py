@@ -0,0 +1,89 @@
+"""
+Offline evaluation of the router modes: accuracy versus latency.
+
+Runs every labeled query through
+  - "llm":       the LLM router alone,
+  - "embedding": the prototype router with LLM fallback below the thresholds,
+  - "prototype": the prototype router alone (what it would decide without fallback),
+then reports per-query latency, LLM calls, route accuracy, arXiv field accuracy
+(over rows labeled and routed to arXiv) and route agreement with the LLM router.
+The LLM response cache is disabled so every LLM call is paid for.
+
+Dataset format (JSONL), one row per query:
+    {"query": "...", "route": "web_search" | "arxiv_search", "arxiv_field": "all" | "title" | "author" | "abstract" | null}
+
+Usage (from backend/):
+    python -m benchmarks.eval_router --data benchmarks/data/routing_eval.jsonl
+    python -m benchmarks.eval_router --min-similarity 0.55 --min-margin 0.08
+    python -m benchmarks.eval_router --offline --llm-ms 400
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import time
+
+
+async def evaluate(rows: list[dict], modes: list[str], min_similarity: float | None, min_margin: float | None) -> None:
+    from src.agent.routing import prototype_router, route_query
+
+    if min_similarity is not None:
+        prototype_router.min_similarity = min_similarity
+    if min_margin is not None:
+        prototype_router.min_margin = min_margin
+    await prototype_router.load()
+
+    results = {mode: {"latency": [], "decisions": [], "llm_calls": 0} for mode in modes}
+    for row in rows:
+        for mode in modes:
+            start = time.perf_counter()
+            if mode == "prototype":
+                decision, _ = await prototype_router.route(row["query"])
+                method = "embedding"
+            else:
+                decision, _, method = await route_query(row["query"], mode=mode)
+            results[mode]["latency"].append(time.perf_counter() - start)
+            results[mode]["decisions"].append(decision)
+            results[mode]["llm_calls"] += method != "embedding"
+
+    reference = results.get("llm", {}).get("decisions")
+    print(f"{'mode':<11}{'queries':>8}{'p50 ms':>10}{'p95 ms':>10}{'llm calls':>11}"
+          f"{'route acc':>11}{'field acc':>11}{'agree llm':>11}")
+    for mode, result in results.items():
+        latencies = sorted(l * 1000 for l in result["latency"])
+        decisions = result["decisions"]
+        route_hits = sum(d["route"] == row["route"] for d, row in zip(decisions, rows))
+        arxiv = [(d, row) for d, row in zip(decisions, rows)
+                 if row["route"] == "arxiv_search" and d["route"] == "arxiv_search"]
+        field_acc = f"{sum(d['arxiv_field'] == row['arxiv_field'] for d, row in arxiv) / len(arxiv):.0%}" if arxiv else "-"
+        agreement = "-"
+        if reference and mode != "llm":
+            agreement = f"{sum(a['route'] == b['route'] for a, b in zip(decisions, reference)) / len(rows):.0%}"
+        print(f"{mode:<11}{len(latencies):>8}{statistics.median(latencies):>10.1f}"
+              f"{latencies[int(len(latencies) * 0.95)]:>10.1f}{result['llm_calls']:>6}/{len(rows):<4}"
+              f"{route_hits / len(rows):>11.0%}{field_acc:>11}{agreement:>11}")
+
+    if "prototype" in results:
+        misses = [(row, d) for row, d in zip(rows, results["prototype"]["decisions"]) if d["route"] != row["route"]]
+        for row, d in misses:
+            print(f"  prototype misroute: '{row['query']}' -> {d['route']} (expected {row['route']})")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--data", default="benchmarks/data/routing_eval.jsonl")
+    parser.add_argument("--modes", default="llm,embedding,prototype")
+    parser.add_argument("--min-similarity", type=float, help="Override ROUTER_MIN_SIMILARITY.")
+    parser.add_argument("--min-margin", type=float, help="Override ROUTER_MIN_MARGIN.")
+    parser.add_argument("--offline", action="store_true",
+                        help="Use the offline stand-ins (fake LLM, hashing embeddings) from benchmarks/offline.py.")
+    parser.add_argument("--llm-ms", type=float, default=300, help="Latency of the fake LLM with --offline.")
+    args = parser.parse_args()
+    os.environ["LLM_CACHE_ENABLED"] = "false"
+    if args.offline:
+        from benchmarks import offline
+        offline.install(llm_latency_s=args.llm_ms / 1000)
+    with open(args.data, encoding="utf-8") as f:
+        rows = [json.loads(line) for line in f if line.strip()]
+    asyncio.run(evaluate(rows, args.modes.split(","), args.min_similarity, args.min_margin))
@@ -0,0 +1,75 @@
+"""
+Concurrent-session load test for the /ws agent endpoint.
+
+Opens many WebSocket sessions against a running backend at once and reports
+completed sessions per second plus per-session latency. Run it against a single
+uvicorn worker to see how many agent runs it can interleave:
+
+    uvicorn main:app --workers 1
+    python -m benchmarks.load_test_ws --url ws://localhost:8000/ws --sessions 50 --concurrency 25
+
+Requires the `websockets` package.
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+
+import websockets
+
+DEFAULT_QUERIES = [
+    "retrieval augmented generation evaluation",
+    "tin tức công nghệ hôm nay",
+    "graph neural networks for molecules",
+    "lợi ích của việc học tiếng Anh",
+]
+
+
+async def run_session(url: str, query: str) -> tuple[float, float | None, str]:
+    """Runs one agent session, returning (total_s, first_event_s, outcome)."""
+    start = time.perf_counter()
+    first_event = None
+    async with websockets.connect(url, max_size=None) as ws:
+        await ws.send(query)
+        async for raw in ws:
+            if first_event is None:
+                first_event = time.perf_counter() - start
+            message = json.loads(raw)
+            if message["type"] in ("result", "error"):
+                return time.perf_counter() - start, first_event, message["type"]
+    return time.perf_counter() - start, first_event, "closed"
+
+
+async def main(url: str, sessions: int, concurrency: int) -> None:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def bounded(i: int):
+        async with semaphore:
+            try:
+                return await run_session(url, DEFAULT_QUERIES[i % len(DEFAULT_QUERIES)])
+            except Exception as e:
+                print(f"[WARN] Session {i} failed: {e}")
+                return None
+
+    start = time.perf_counter()
+    outcomes = await asyncio.gather(*(bounded(i) for i in range(sessions)))
+    wall = time.perf_counter() - start
+
+    completed = [o for o in outcomes if o is not None and o[2] == "result"]
+    totals = sorted(o[0] for o in completed)
+    firsts = sorted(o[1] for o in completed if o[1] is not None)
+    print(f"sessions={sessions} concurrency={concurrency} completed={len(completed)} wall={wall:.2f}s")
+    print(f"throughput={len(completed) / wall:.2f} sessions/s")
+    if totals:
+        print(f"session latency p50={statistics.median(totals):.2f}s max={totals[-1]:.2f}s")
+        print(f"first event     p50={statistics.median(firsts) * 1000:.1f}ms max={firsts[-1] * 1000:.1f}ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="ws://localhost:8000/ws")
+    parser.add_argument("--sessions", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=10)
+    args = parser.parse_args()
+    asyncio.run(main(args.url, args.sessions, args.concurrency))
@@ -0,0 +1,302 @@
+"""
+Deterministic stand-ins for the agent's external dependencies, for offline runs.
+
+- FakeChatModel answers each prompt template (rewrite, router, summaries, grader,
+  feedback) with a fixed-shape response and reports token usage.
+- HashEmbeddings / HashSparseEmbeddings embed text with the hashing trick.
+- fixture_transport serves the recorded arXiv feed, a generated PDF and the
+  saved web page from benchmarks/data/offline through httpx.MockTransport.
+- fake_search replaces the Google result listing.
+- Qdrant runs in-process (QDRANT_URL=":memory:").
+
+Every stand-in can add a fixed latency. Call `install()` before building graphs.
+Environment defaults are set before src is imported, so import this module first.
+"""
+import asyncio
+import hashlib
+import json
+import math
+import os
+import re
+import threading
+import time
+import zlib
+from typing import Any, List, Optional
+
+os.environ.setdefault("QDRANT_URL", ":memory:")
+os.environ.setdefault("HTTP_HOST_MIN_INTERVAL", "")
+os.environ.setdefault("CONTENT_CACHE_ENABLED", "false")
+os.environ.setdefault("SEMANTIC_CACHE_ENABLED", "false")
+os.environ.setdefault("LLM_CACHE_ENABLED", "false")
+os.environ.setdefault("LLM_CACHE_BACKEND", "memory")
+os.environ.setdefault("GRADER_MODE", "llm")
+
+import httpx
+from langchain_core.embeddings import Embeddings
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_qdrant import SparseEmbeddings, SparseVector
+
+from src import http_client
+from src.config import DENSE_VECTOR_DIM, override_instances
+from src.tools import web_search_tool
+from src.vectordb.client import get_qdrant_client
+from src.vectordb.setup import create_qdrant_collection
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "data", "offline")
+WORD = re.compile(r"\w+", re.UNICODE)
+
+
+def _tokens(text: str) -> List[str]:
+    return WORD.findall(text.lower())
+
+
+def _stable_hash(text: str) -> int:
+    return int.from_bytes(hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+class FakeChatModel(BaseChatModel):
+    """Chat model that recognises each prompt template and answers it deterministically."""
+
+    latency_s: float = 0.0
+    route: str = "mixed"
+
+    @property
+    def _llm_type(self) -> str:
+        return "offline-fake"
+
+    def _respond(self, prompt: str, last: str) -> str:
+        if "relevance grader" in prompt:
+            match = re.search(r"USER QUERY:\s*(.*?)\s*---\s*DOCUMENTS:(.*)", prompt, re.S)
+            query, documents = (match.group(1).strip(), match.group(2)) if match else ("", "")
+            parts = re.split(r"--- Document (\d+) ---", documents)
+            relevant = [int(i) for i, text in zip(parts[1::2], parts[2::2]) if query and query in text]
+            return json.dumps({"relevant_indices": relevant})
+        if "intelligent routing agent" in prompt:
+            query = re.search(r"Query: (.*)", prompt).group(1).strip()
+            route = self.route
+            if route == "mixed":
+                route = "arxiv" if _stable_hash(query) % 2 else "web"
+            return json.dumps({"route": f"{route}_search", "arxiv_field": "all" if route == "arxiv" else None})
+        if "Vietnamese paragraph" in prompt:
+            query = re.search(r"Query: (.*)", prompt).group(1).strip()
+            return (
+                f"Đoạn văn này trả lời câu hỏi về {query}. Nội dung được tóm tắt từ nguồn đã tìm thấy. "
+                "Các ý chính được trình bày ngắn gọn và rõ ràng. Người học có thể dịch từng câu sang tiếng Anh."
+            )
+        if "Previous queries" in prompt:
+            query = re.search(r"User's question: (.*)", prompt).group(1).strip()
+            return f"{query} overview"
+        if "language examiner" in prompt:
+            return json.dumps({
+                "score": 80,
+                "categorized_feedback": {"grammar": "Good.", "vocabulary": "Accurate.", "nuance": "Natural."},
+                "suggestions": ["An alternative translation."],
+            })
+        # The rewrite prompt is a system message followed by the user's query.
+        return last
+
+    def _result(self, messages: List[BaseMessage]) -> ChatResult:
+        prompt = "\n".join(str(m.content) for m in messages)
+        content = self._respond(prompt, str(messages[-1].content))
+        input_tokens, output_tokens = len(prompt) // 4, len(content) // 4
+        message = AIMessage(
+            content=content,
+            usage_metadata={
+                "input_tokens": input_tokens,
+                "output_tokens": output_tokens,
+                "total_tokens": input_tokens + output_tokens,
+            },
+        )
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, run_manager: Any = None, **kwargs) -> ChatResult:
+        time.sleep(self.latency_s)
+        return self._result(messages)
+
+    async def _agenerate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, run_manager: Any = None, **kwargs) -> ChatResult:
+        await asyncio.sleep(self.latency_s)
+        return self._result(messages)
+
+    async def _astream(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, run_manager: Any = None, **kwargs):
+        """Streams the response word by word, spreading the latency over the words."""
+        message = self._result(messages).generations[0].message
+        words = re.findall(r"\S+\s*", message.content) or [message.content]
+        for i, word in enumerate(words):
+            await asyncio.sleep(self.latency_s / len(words))
+            usage = message.usage_metadata if i == len(words) - 1 else None
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=word, usage_metadata=usage))
+            if run_manager:
+                await run_manager.on_llm_new_token(word, chunk=chunk)
+            yield chunk
+
+
+class HashEmbeddings(Embeddings):
+    """Bag-of-words embeddings via the hashing trick; texts sharing words end up close."""
+
+    def __init__(self, dim: int = DENSE_VECTOR_DIM, latency_s: float = 0.0):
+        self.dim = dim
+        self.latency_s = latency_s
+
+    def _embed(self, text: str) -> List[float]:
+        vector = [0.0] * self.dim
+        for token in _tokens(text):
+            h = _stable_hash(token)
+            vector[h % self.dim] += 1.0 if (h >> 32) & 1 else -1.0
+        norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+        return [v / norm for v in vector]
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        time.sleep(self.latency_s)
+        return [self._embed(text) for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        time.sleep(self.latency_s)
+        return self._embed(text)
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        await asyncio.sleep(self.latency_s)
+        return [self._embed(text) for text in texts]
+
+    async def aembed_query(self, text: str) -> List[float]:
+        await asyncio.sleep(self.latency_s)
+        return self._embed(text)
+
+
+class HashSparseEmbeddings(SparseEmbeddings):
+    """Term-frequency sparse vectors over hashed tokens, standing in for BM25."""
+
+    def __init__(self, latency_s: float = 0.0):
+        self.latency_s = latency_s
+
+    def _embed(self, text: str) -> SparseVector:
+        counts = {}
+        for token in _tokens(text):
+            index = _stable_hash(token) % (1 << 20)
+            counts[index] = counts.get(index, 0.0) + 1.0
+        indices = sorted(counts)
+        return SparseVector(indices=indices, values=[counts[i] for i in indices])
+
+    def embed_documents(self, texts: List[str]) -> List[SparseVector]:
+        time.sleep(self.latency_s)
+        return [self._embed(text) for text in texts]
+
+    def embed_query(self, text: str) -> SparseVector:
+        time.sleep(self.latency_s)
+        return self._embed(text)
+
+    async def aembed_documents(self, texts: List[str]) -> List[SparseVector]:
+        await asyncio.sleep(self.latency_s)
+        return [self._embed(text) for text in texts]
+
+    async def aembed_query(self, text: str) -> SparseVector:
+        await asyncio.sleep(self.latency_s)
+        return self._embed(text)
+
+
+def minimal_pdf(text: str) -> bytes:
+    """A one-page PDF whose text layer is `text`, readable by pypdf."""
+    escaped = text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+    lines = [escaped[i:i + 90] for i in range(0, len(escaped), 90)]
+    stream = "BT /F1 10 Tf 14 TL 50 780 Td " + " ".join(f"({line}) '" for line in lines) + " ET"
+    stream_bytes = zlib.compress(stream.encode("latin-1", "replace"))
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 842] /Contents 4 0 R "
+        b"/Resources << /Font << /F1 5 0 R >> >> >>",
+        b"<< /Length %d /Filter /FlateDecode >>\nstream\n" % len(stream_bytes) + stream_bytes + b"\nendstream",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(out)
+
+
+def _read_fixture(name: str) -> str:
+    with open(os.path.join(FIXTURES_DIR, name), encoding="utf-8") as f:
+        return f.read()
+
+
+def fixture_transport(latency_s: float = 0.0) -> httpx.MockTransport:
+    """
+    Serves the arXiv API from the recorded feed (paper IDs derived from the query,
+    so different queries find different papers), PDFs for any /pdf/ link and the
+    saved article page for every other URL.
+    """
+    atom = _read_fixture("arxiv_query.xml")
+    page = _read_fixture("web_page.html")
+    paper_text = (
+        "Abstract. We study hybrid retrieval for retrieval-augmented generation and measure "
+        "latency, recall and faithfulness across benchmarks. " * 40
+    )
+    pdf = minimal_pdf(paper_text)
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(latency_s)
+        url = request.url
+        if url.host == "export.arxiv.org":
+            prefix = f"{_stable_hash(url.params.get('search_query', '')) % 10000:04d}"
+            return httpx.Response(200, text=atom.replace("{prefix}", prefix),
+                                  headers={"Content-Type": "application/atom+xml"})
+        if "/pdf/" in url.path:
+            return httpx.Response(200, content=pdf, headers={"Content-Type": "application/pdf"})
+        title = f"Bài viết {url.path.strip('/').replace('/', ' ')}"
+        return httpx.Response(200, text=page.replace("{title}", title), headers={"Content-Type": "text/html"})
+
+    return httpx.MockTransport(handler)
+
+
+def fake_search(latency_s: float = 0.0):
+    """Replacement for googlesearch.search: yields example.org URLs derived from the query."""
+    def search(query: str, num_results: int = 10, **kwargs):
+        time.sleep(latency_s)
+        slug = f"{_stable_hash(query) % 100000:05d}"
+        for i in range(num_results):
+            yield f"https://example.org/{slug}/{i}"
+    return search
+
+
+def _serialise_client(client) -> None:
+    """The local Qdrant engine is not thread-safe, so calls made through asyncio.to_thread are serialised."""
+    lock = threading.Lock()
+    for name in ("query_points", "query_points_groups", "upsert", "upload_points", "retrieve", "delete",
+                 "set_payload", "scroll", "count", "collection_exists", "create_collection", "get_collection"):
+        method = getattr(client, name)
+
+        def locked(*args, _method=method, **kwargs):
+            with lock:
+                return _method(*args, **kwargs)
+
+        setattr(client, name, locked)
+
+
+def install(
+    llm_latency_s: float = 0.0,
+    embed_latency_s: float = 0.0,
+    http_latency_s: float = 0.0,
+    search_latency_s: float = 0.0,
+    route: str = "mixed",
+) -> FakeChatModel:
+    """Swaps every external dependency for its offline stand-in and creates the collection."""
+    llm = FakeChatModel(latency_s=llm_latency_s, route=route)
+    override_instances(
+        llm=llm,
+        embedding_model=HashEmbeddings(latency_s=embed_latency_s),
+        sparse_embedding_model=HashSparseEmbeddings(latency_s=embed_latency_s),
+    )
+    http_client.use_transport(fixture_transport(http_latency_s))
+    web_search_tool.search = fake_search(search_latency_s)
+
+    client = get_qdrant_client()
+    _serialise_client(client)
+    create_qdrant_collection(client=client)
+    return llm
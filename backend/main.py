@@ -1,11 +1,33 @@
 import os
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import FileResponse
 
 from src.api.endpoints import router as api_router
+from src.agent.graph import preload_graphs
+from src.agent.routing import prototype_router
+from src.http_client import aclose_async_client
+from src.workers import shutdown_process_pool
+from src.config import PRELOAD_GRAPH_VARIANTS, WARM_UP_ON_STARTUP, ROUTER_MODE, warm_up
 from fastapi.middleware.cors import CORSMiddleware
-app = FastAPI(title="AI-Coach Backend")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Compiles the agent graphs and warms up the models once at startup."""
+    preload_graphs(PRELOAD_GRAPH_VARIANTS)
+    if WARM_UP_ON_STARTUP:
+        await asyncio.to_thread(warm_up)
+        if ROUTER_MODE == "embedding":
+            await prototype_router.load()
+    yield
+    await aclose_async_client()
+    shutdown_process_pool()
+
+
+app = FastAPI(title="AI-Coach Backend", lifespan=lifespan)
 
 
 app.add_middleware(
@@ -0,0 +1,88 @@
+import asyncio
+from typing import List, Tuple
+
+from langchain_core.documents import Document
+from langchain_core.output_parsers import JsonOutputParser
+
+from ..config import (
+    get_reranker,
+    GRADER_MODE,
+    GRADER_RELEVANT_THRESHOLD,
+    GRADER_IRRELEVANT_THRESHOLD,
+)
+from ..prompts import DOCUMENT_GRADER_PROMPT_TEMPLATE
+from .utils import token_count, invoke_llm
+
+
+async def llm_grade(query: str, docs: List[Document]) -> Tuple[List[int], int]:
+    """Asks the LLM which documents are relevant. Returns (indices in LLM order, tokens used)."""
+    formatted_docs = ""
+    for i, doc in enumerate(docs):
+        formatted_docs += f"\n\n--- Document {i} ---\n{doc.page_content}"
+
+    tokens = 0
+    try:
+        prompt = DOCUMENT_GRADER_PROMPT_TEMPLATE.invoke({"query": query, "documents": formatted_docs})
+        message = await invoke_llm("document_grader", prompt)
+        tokens = token_count(message)
+        relevant_indices = JsonOutputParser().invoke(message).get("relevant_indices", [])
+    except Exception:
+        relevant_indices = []
+    return [i for i in relevant_indices if isinstance(i, int) and 0 <= i < len(docs)], tokens
+
+
+async def rerank_scores(query: str, docs: List[Document]) -> List[float]:
+    """Scores (query, document) pairs with the local cross-encoder, in [0, 1]."""
+    pairs = [(query, doc.page_content) for doc in docs]
+    scores = await asyncio.to_thread(get_reranker().predict, pairs)
+    return [float(score) for score in scores]
+
+
+async def grade_documents(
+    query: str,
+    docs: List[Document],
+    similarity_scores: List[float] | None = None,
+    mode: str = GRADER_MODE,
+) -> Tuple[List[int], int, dict]:
+    """
+    Decides which retrieved documents are relevant.
+
+    Modes:
+      - "llm":      every retrieval is graded by the LLM (the original behaviour).
+      - "reranker": a local cross-encoder scores each document.
+      - "score":    `similarity_scores`, each document's dense cosine similarity
+                    to the query, are used as-is.
+
+    In the local modes, scores at or above GRADER_RELEVANT_THRESHOLD are accepted,
+    scores at or below GRADER_IRRELEVANT_THRESHOLD are rejected, and only the
+    borderline documents in between are sent to the LLM grader.
+
+    Returns (relevant indices, best first; tokens spent; per-method decision counts).
+    """
+    if mode == "llm":
+        indices, tokens = await llm_grade(query, docs)
+        return indices, tokens, {"llm": len(docs)}
+
+    if mode == "reranker":
+        scores = await rerank_scores(query, docs)
+    elif mode == "score":
+        if similarity_scores is None or len(similarity_scores) != len(docs) or None in similarity_scores:
+            raise ValueError("Score grading needs one similarity score per document.")
+        scores = similarity_scores
+    else:
+        raise ValueError(f"Unknown grader mode: {mode}")
+
+    relevant = [i for i, score in enumerate(scores) if score >= GRADER_RELEVANT_THRESHOLD]
+    borderline = [
+        i for i, score in enumerate(scores)
+        if GRADER_IRRELEVANT_THRESHOLD < score < GRADER_RELEVANT_THRESHOLD
+    ]
+
+    tokens = 0
+    if borderline:
+        borderline_indices, tokens = await llm_grade(query, [docs[i] for i in borderline])
+        relevant += [borderline[i] for i in borderline_indices]
+
+    relevant.sort(key=lambda i: scores[i], reverse=True)
+    counts = {mode: len(docs) - len(borderline), "llm": len(borderline)}
+    return relevant, tokens, counts
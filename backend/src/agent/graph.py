@@ -1,66 +1,155 @@
+import threading
+from functools import partial
 from langgraph.graph import StateGraph, START, END
 from ..schemas import GraphState, GraphInput, GraphOutput
+from ..config import BRANCH_TIME_BUDGET
+from ..metrics import timed_node
 from .nodes import (
     rewrite_query_node,
+    reformulate_query_node,
+    semantic_cache_node,
+    check_cache_hit,
     router_node,
+    parallel_search_node,
     web_search_node,
     process_web_results_node,
     arxiv_search_node,
     process_arxiv_results_node,
     conditional_router,
+    merge_results_node,
     add_to_db_node,
     retrieve_from_db_node,
     grade_retrieved_documents_node,
     should_continue_to_external_search,
+    check_new_documents,
     final_results_node
 )
 
-def create_graph():
+def create_graph(parallel_search: bool = False, branch_time_budget: float = BRANCH_TIME_BUDGET):
     """
     Create and compile LangGraph graphs.
+
+    With `parallel_search`, an external search round runs the web and arXiv
+    branches concurrently instead of routing to one of them, each bounded by
+    `branch_time_budget` seconds, and merges their results before add_to_db.
     """
     builder = StateGraph(GraphState, input_schema=GraphInput, output_schema=GraphOutput)
+    search_entry = 'parallel_search' if parallel_search else 'router'
+
+    def add_node(name, node):
+        builder.add_node(name, timed_node(name, node))
 
-    builder.add_node('rewrite_query', rewrite_query_node)
-    builder.add_node('router', router_node)
-    builder.add_node('web_search', web_search_node)
-    builder.add_node('process_web_results', process_web_results_node)
-    builder.add_node('arxiv_search', arxiv_search_node)
-    builder.add_node('process_arxiv_results', process_arxiv_results_node)
-    builder.add_node("add_to_db", add_to_db_node)
-    builder.add_node('retrieve_from_db', retrieve_from_db_node)
-    builder.add_node('grade', grade_retrieved_documents_node)
-    builder.add_node('final', final_results_node)
+    add_node('rewrite_query', rewrite_query_node)
+    add_node('semantic_cache', semantic_cache_node)
+    add_node('reformulate_query', reformulate_query_node)
+    if parallel_search:
+        add_node('parallel_search', partial(parallel_search_node, time_budget=branch_time_budget))
+    else:
+        add_node('router', router_node)
+    add_node('web_search', web_search_node)
+    add_node('process_web_results', process_web_results_node)
+    add_node('arxiv_search', arxiv_search_node)
+    add_node('process_arxiv_results', process_arxiv_results_node)
+    add_node('merge_results', merge_results_node)
+    add_node("add_to_db", add_to_db_node)
+    add_node('retrieve_from_db', retrieve_from_db_node)
+    add_node('grade', grade_retrieved_documents_node)
+    add_node('final', final_results_node)
 
 
     builder.add_edge(START, 'rewrite_query')
-    builder.add_edge('rewrite_query', 'retrieve_from_db')
+    builder.add_edge('rewrite_query', 'semantic_cache')
+    builder.add_conditional_edges(
+        'semantic_cache',
+        check_cache_hit,
+        {
+            'hit': END,
+            'miss': 'retrieve_from_db'
+        }
+    )
     builder.add_edge('retrieve_from_db', 'grade')
     builder.add_conditional_edges(
         'grade', 
         should_continue_to_external_search,
         {
             'end_with_ids': 'final',
-            'continue_search': 'router'
+            'budget_exhausted': 'final',
+            'continue_search': search_entry,
+            'retry_search': 'reformulate_query'
         }
     )
+    builder.add_edge('reformulate_query', search_entry)
+    if parallel_search:
+        builder.add_edge('parallel_search', 'web_search')
+        builder.add_edge('parallel_search', 'arxiv_search')
+        builder.add_edge(['process_web_results', 'process_arxiv_results'], 'merge_results')
+    else:
+        builder.add_conditional_edges(
+            'router',
+            conditional_router,
+            {
+                "web_search_branch": "web_search",
+                "arxiv_search_branch": "arxiv_search"
+            }
+        )
+        builder.add_edge('process_web_results', 'merge_results')
+        builder.add_edge('process_arxiv_results', 'merge_results')
+    builder.add_edge('web_search', 'process_web_results')
+    builder.add_edge('arxiv_search', 'process_arxiv_results')
+    builder.add_edge('merge_results', 'add_to_db')
     builder.add_conditional_edges(
-        'router',
-        conditional_router,
+        'add_to_db',
+        check_new_documents,
         {
-            "web_search_branch": "web_search",
-            "arxiv_search_branch": "arxiv_search"
+            'retrieve': 'retrieve_from_db',
+            'nothing_new': 'final'
         }
     )
-    builder.add_edge('web_search', 'process_web_results')
-    builder.add_edge('process_web_results', 'add_to_db')
-    builder.add_edge('arxiv_search', 'process_arxiv_results')
-    builder.add_edge('process_arxiv_results', 'add_to_db')
-    builder.add_edge('add_to_db', 'retrieve_from_db')
     builder.add_edge('final', END)
     graph = builder.compile()
     return graph
 
+
+GRAPH_BUILDERS = {
+    "default": create_graph,
+    "parallel": partial(create_graph, parallel_search=True),
+}
+
+_compiled_graphs = {}
+_graphs_lock = threading.Lock()
+
+
+def register_graph_variant(name: str, builder) -> None:
+    """Registers a builder for an alternative graph variant."""
+    GRAPH_BUILDERS[name] = builder
+
+
+def get_graph(variant: str = "default", **options):
+    """
+    Returns the process-wide compiled graph for a variant/config, compiling it on first use.
+    """
+    if variant not in GRAPH_BUILDERS:
+        raise ValueError(f"Unknown graph variant: {variant}")
+
+    key = (variant, tuple(sorted(options.items())))
+    graph = _compiled_graphs.get(key)
+    if graph is not None:
+        return graph
+
+    with _graphs_lock:
+        graph = _compiled_graphs.get(key)
+        if graph is None:
+            graph = GRAPH_BUILDERS[variant](**options)
+            _compiled_graphs[key] = graph
+    return graph
+
+
+def preload_graphs(variants) -> None:
+    """Compiles the given graph variants ahead of the first connection."""
+    for variant in variants:
+        get_graph(variant)
+        print(f"[INFO] Preloaded graph variant '{variant}'.")
+
 if __name__ == '__main__':
     graph = create_graph()
     img = graph.get_graph().draw_mermaid_png()
@@ -1,48 +1,179 @@
+import asyncio
+import time
 from typing import Literal
-import requests
-from bs4 import BeautifulSoup
 
+from langchain_core.callbacks.manager import adispatch_custom_event
 from langchain_core.messages import HumanMessage
-from langchain_core.output_parsers import JsonOutputParser
-from langchain_community.document_loaders import PyPDFLoader
+from qdrant_client.http import models
 
-import uuid
 from langchain_core.documents import Document
-from ..vectordb.store import get_qdrant_store
+from ..vectordb.store import get_qdrant_store, source_point_id, content_hash, make_source_chunks
+from ..vectordb.client import get_qdrant_client
+from ..vectordb.search import hybrid_search, hybrid_search_chunks
+from ..cache.content import fetch_content
+from ..cache.semantic import semantic_cache
+from ..metrics import qdrant_latency, search_rounds, rounds_per_request
 
 from ..schemas import GraphState
-from ..config import llm
+from ..config import (
+    QDRANT_COLLECTION_NAME,
+    DENSE_VECTOR_NAME,
+    RETRIEVAL_MODE,
+    STORE_SOURCE_CHUNKS,
+    GRADER_MODE,
+    MAX_SEARCH_ROUNDS,
+    SEARCH_TIME_BUDGET,
+    SEARCH_TOKEN_BUDGET,
+    SEMANTIC_CACHE_ENABLED,
+    WEB_SEARCH_RESULTS,
+    WEB_PROBE_CONCURRENCY,
+    WEB_PROCESS_CONCURRENCY,
+    HTML_EXTRACTOR,
+    WEB_CONTEXT_MAX_TOKENS,
+    WEB_PROCESS_DEADLINE,
+    ARXIV_SEARCH_MODE,
+    ARXIV_PROCESS_CONCURRENCY,
+    ARXIV_PROCESS_DEADLINE,
+    PDF_MAX_PAGES,
+    PDF_MAX_CHARS,
+)
 from ..prompts import (
     REWRITE_PROMPT,
-    ROUTER_PROMPT_TEMPLATE,
+    REFORMULATE_PROMPT_TEMPLATE,
     WEB_SUMMARY_PROMPT_TEMPLATE,
     ARXIV_SUMMARY_PROMPT_TEMPLATE,
-    DOCUMENT_GRADER_PROMPT_TEMPLATE
 )
-from ..tools.web_search_tool import Web_Searcher_Tool
+from .grading import grade_documents
+from .routing import route_query
+from .utils import token_count, invoke_llm
+from ..tools.web_search_tool import Web_Searcher_Tool, extract_page
 from ..tools.arxiv_search_tool import Arxiv_Search_Tool
+from ..tools.pdf_ingest import load_pdf
 
-web_search_tool = Web_Searcher_Tool()
-arxiv_search_tool = Arxiv_Search_Tool()
+web_search_tool = Web_Searcher_Tool(
+    max_results=WEB_SEARCH_RESULTS,
+    probe_concurrency=WEB_PROBE_CONCURRENCY,
+    extractor=HTML_EXTRACTOR,
+    max_context_tokens=WEB_CONTEXT_MAX_TOKENS,
+)
+arxiv_search_tool = Arxiv_Search_Tool(mode=ARXIV_SEARCH_MODE)
+
+def _source_metadata(item: dict) -> dict:
+    """Builds the VectorDB metadata for a web or arXiv search result."""
+    metadata = {
+        "title": item.get("title", "N/A"),
+        "source": item.get("link") or item.get("url"),
+    }
+    if "authors" in item:
+        metadata["authors"] = item.get("authors", "N/A")
+    return metadata
+
+async def _gather_bounded(coros: list, concurrency: int, deadline: float | None) -> list:
+    """
+    Runs coroutines with at most `concurrency` in flight. Results stay aligned with
+    the inputs; anything unfinished when `deadline` seconds elapse is cancelled and
+    comes back as None.
+    """
+    if not coros:
+        return []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def bounded(coro):
+        async with semaphore:
+            return await coro
+
+    tasks = [asyncio.create_task(bounded(coro)) for coro in coros]
+    done, pending = await asyncio.wait(tasks, timeout=deadline)
+    for task in pending:
+        task.cancel()
+    if pending:
+        print(f"[WARN] Deadline of {deadline}s reached, dropping {len(pending)} unfinished item(s).")
+    return [task.result() if task in done and task.exception() is None else None for task in tasks]
+
+def _remaining_budget(state: GraphState) -> float | None:
+    """Seconds left before the current search round's deadline, if it has one."""
+    deadline = state.get("search_deadline")
+    return None if deadline is None else max(0.0, deadline - time.time())
+
+def _node_deadline(state: GraphState, default: float) -> float:
+    remaining = _remaining_budget(state)
+    return default if remaining is None else min(default, remaining)
+
+async def _search_within_budget(state: GraphState, search, label: str) -> list:
+    """
+    Awaits a search tool call. Within a budgeted (parallel) round, a branch that
+    fails or runs out of time yields no results instead of failing the whole run.
+    """
+    remaining = _remaining_budget(state)
+    if remaining is None:
+        return await search
+    try:
+        return await asyncio.wait_for(search, timeout=remaining)
+    except Exception as e:
+        print(f"[WARN] {label} produced no results within the branch budget: {e!r}")
+        return []
 
-def rewrite_query_node(state: GraphState) -> dict:
+async def rewrite_query_node(state: GraphState) -> dict:
     """Rewrites the initial user query for search efficiency."""
-    result = llm.invoke([REWRITE_PROMPT, HumanMessage(state['user_query'])])
-    return {'rewritten_query': result.content}
-
-def retrieve_from_db_node(state: GraphState) -> dict:
+    result = await invoke_llm("rewrite", [REWRITE_PROMPT, HumanMessage(state['user_query'])])
+    return {
+        'rewritten_query': result.content,
+        'previous_queries': [result.content],
+        'search_round': 0,
+        'started_at': time.time(),
+        'token_usage': token_count(result),
+    }
+
+async def reformulate_query_node(state: GraphState) -> dict:
+    """Rewords the query before another external search round, avoiding wordings that already failed."""
+    previous_queries = state.get("previous_queries", [])
+    prompt = REFORMULATE_PROMPT_TEMPLATE.invoke({
+        "user_query": state["user_query"],
+        "previous_queries": "\n".join(f"- {q}" for q in previous_queries),
+    })
+    result = await invoke_llm("reformulate", prompt)
+    print(f"[INFO] Round {state.get('search_round', 0) + 1}: reformulated query to '{result.content}'.")
+    return {
+        'rewritten_query': result.content,
+        'previous_queries': previous_queries + [result.content],
+        'token_usage': token_count(result),
+    }
+
+async def semantic_cache_node(state: GraphState) -> dict:
+    """Looks up the answer of a previously seen, semantically equivalent query."""
+    if not SEMANTIC_CACHE_ENABLED:
+        return {"cache_hit": False}
+    try:
+        cached_results = await semantic_cache.lookup(state["rewritten_query"])
+    except Exception as e:
+        print(f"[WARN] Semantic cache lookup failed: {e}")
+        cached_results = None
+    if cached_results is None:
+        return {"cache_hit": False}
+    print(f"Semantic cache hit (hit rate {semantic_cache.hit_rate():.0%}).")
+    return {"cache_hit": True, **cached_results}
+
+def check_cache_hit(state: GraphState) -> Literal["hit", "miss"]:
+    """Ends the run early when the semantic cache answered the query."""
+    return "hit" if state.get("cache_hit") else "miss"
+
+async def retrieve_from_db_node(state: GraphState) -> dict:
     """
     Use rewritten_query to search for related documents in Qdrant.
     """
     query = state["rewritten_query"]
-    qdrant_store = get_qdrant_store()
-    
-    found_docs = qdrant_store.similarity_search(query=query, k=3)
-    return {"retrieved_documents": found_docs}
 
-def grade_retrieved_documents_node(state: GraphState) -> dict:
+    # Score grading needs the raw dense similarity; fused scores are rank- or per-query-relative.
+    search = hybrid_search_chunks if RETRIEVAL_MODE == "chunks" else hybrid_search
+    found = await search(query, dense_scores=GRADER_MODE == "score")
+    return {
+        "retrieved_documents": [doc for doc, _ in found],
+        "retrieved_scores": [score for _, score in found],
+    }
+
+async def grade_retrieved_documents_node(state: GraphState) -> dict:
     """
-    Uses an LLM to grade the relevance of retrieved documents.
+    Grades the relevance of retrieved documents, locally or with an LLM depending on GRADER_MODE.
     """
 
     query = state["rewritten_query"]
@@ -51,149 +182,332 @@ def grade_retrieved_documents_node(state: GraphState) -> dict:
     if not retrieved_docs:
         return {"relevant_doc_ids": None}
 
-    formatted_docs = ""
-    for i, doc in enumerate(retrieved_docs):
-        formatted_docs += f"\n\n--- Document {i} ---\n{doc.page_content}"
-
-    parser = JsonOutputParser()
-    chain = DOCUMENT_GRADER_PROMPT_TEMPLATE | llm | parser
-    
-    try:
-        response = chain.invoke({
-        "query": query,
-        "documents": formatted_docs
-    })
-        relevant_indices = response.get("relevant_indices", [])
-    except Exception as e:
-        relevant_indices = []
+    relevant_indices, tokens, decisions = await grade_documents(
+        query, retrieved_docs, [doc.metadata.get("_dense_score") for doc in retrieved_docs]
+    )
 
     if not relevant_indices:
-        return {"relevant_doc_ids": None}
+        return {"relevant_doc_ids": None, "token_usage": tokens}
 
     top_indices = relevant_indices[:3]
+    scores = state.get("retrieved_scores") or []
     final_ids = []
     for i in top_indices:
         if i < len(retrieved_docs):
-            doc_id = retrieved_docs[i].metadata.get("_id")
+            doc = retrieved_docs[i]
+            doc_id = doc.metadata.get("_id")
             final_ids.append(doc_id)
-
-    print(f"LLM Grader selected {len(final_ids)} relevant document(s).")
-    return {"relevant_doc_ids": final_ids if final_ids else None}
-
-
-def should_continue_to_external_search(state: GraphState) -> Literal["continue_search", "end_with_ids"]:
+            # Lets the client show each approved passage before the run finishes.
+            await adispatch_custom_event("document", {
+                "id": str(doc_id),
+                "content": doc.page_content,
+                "score": scores[i] if i < len(scores) else None,
+                "title": doc.metadata.get("title"),
+                "source": doc.metadata.get("source"),
+            })
+
+    print(f"Grader ({GRADER_MODE}, decisions {decisions}) selected {len(final_ids)} relevant document(s).")
+    return {"relevant_doc_ids": final_ids if final_ids else None, "token_usage": tokens}
+
+
+def _exhausted_budget(state: GraphState) -> str | None:
+    """Names the loop budget (rounds, time or tokens) the run has used up, if any."""
+    if state.get("search_round", 0) >= MAX_SEARCH_ROUNDS:
+        return f"{MAX_SEARCH_ROUNDS} external search round(s)"
+    if time.time() - state.get("started_at", time.time()) >= SEARCH_TIME_BUDGET:
+        return f"{SEARCH_TIME_BUDGET:.0f}s time budget"
+    if state.get("token_usage", 0) >= SEARCH_TOKEN_BUDGET:
+        return f"{SEARCH_TOKEN_BUDGET} token budget"
+    return None
+
+def should_continue_to_external_search(
+    state: GraphState,
+) -> Literal["end_with_ids", "continue_search", "retry_search", "budget_exhausted"]:
     """
-    Checks if the grader found any relevant document IDs.
+    Checks if the grader found any relevant document IDs and, if not, whether
+    the run may afford another external search round.
     """
     if state.get("relevant_doc_ids"):
         print("Relevant documents found and graded. Ending process.")
         return "end_with_ids"
-    else:
+    exhausted = _exhausted_budget(state)
+    if exhausted:
+        print(f"No relevant documents found and the {exhausted} is used up. Ending process.")
+        return "budget_exhausted"
+    if state.get("search_round", 0) == 0:
         print("No relevant documents found after grading. Continuing to external search.")
         return "continue_search"
+    print("Still no relevant documents. Retrying external search with a reworded query.")
+    return "retry_search"
+
+def check_new_documents(state: GraphState) -> Literal["retrieve", "nothing_new"]:
+    """
+    Skips another retrieval and grading pass when the last round found no
+    sources. Sources that were already stored count as found: the reworded
+    query may rank them higher, or a concurrent session may have stored them.
+    """
+    counts = state.get("db_add_counts") or {}
+    if sum(counts.get(key, 0) for key in ("inserted", "updated", "metadata_only", "skipped")) > 0:
+        return "retrieve"
+    print("External search found no sources. Ending process.")
+    return "nothing_new"
     
-def final_results_node(state: GraphState) -> dict:
-    relevant_doc_ids = state['relevant_doc_ids']
+async def final_results_node(state: GraphState) -> dict:
+    """Returns the graded documents in grader order, with their retrieval scores."""
+    retrieved = {
+        doc.metadata.get('_id'): (doc, score)
+        for doc, score in zip(state.get('retrieved_documents', []), state.get('retrieved_scores', []))
+    }
     results = []
-    for doc in state['retrieved_documents']:
-        if doc.metadata.get('_id') in relevant_doc_ids:
+    scores = []
+    source_ids = []
+    for doc_id in state.get('relevant_doc_ids') or []:
+        if doc_id in retrieved:
+            doc, score = retrieved[doc_id]
             results.append(doc.page_content)
-    return {'final_results': results}
+            scores.append(score)
+            source_ids.append(doc_id)
+    rounds_per_request.observe(state.get('search_round', 0))
+    if SEMANTIC_CACHE_ENABLED and results:
+        try:
+            cache_key = (state.get('previous_queries') or [state['rewritten_query']])[0]
+            await semantic_cache.store(cache_key, results, scores, source_ids)
+        except Exception as e:
+            print(f"[WARN] Could not store answer in semantic cache: {e}")
+    return {'final_results': results, 'final_scores': scores}
 
 
-def router_node(state: GraphState) -> dict:
+async def router_node(state: GraphState) -> dict:
     """Determines the appropriate tool (web or arXiv) for the query."""
-    prompt = ROUTER_PROMPT_TEMPLATE.invoke({"query": state['rewritten_query']})
-    result = llm.invoke(prompt).content
-    parsed_result = JsonOutputParser().invoke(result)
-    return {'routing_decision': parsed_result}
+    decision, tokens, _ = await route_query(state['rewritten_query'])
+    return {'routing_decision': decision, 'token_usage': tokens}
+
+async def parallel_search_node(state: GraphState, time_budget: float) -> dict:
+    """Starts a round that searches the web and arXiv at once, sharing one time budget."""
+    return {
+        "routing_decision": {"route": "parallel", "arxiv_field": "all"},
+        "search_deadline": time.time() + time_budget,
+    }
 
-def web_search_node(state: GraphState) -> dict:
+async def web_search_node(state: GraphState) -> dict:
     """Performs a web search."""
-    search_results = web_search_tool.invoke(state['rewritten_query'])
+    search_results = await _search_within_budget(
+        state, web_search_tool.ainvoke(state['rewritten_query']), "Web search"
+    )
     return {'web_search_results': search_results}
 
-def process_web_results_node(state: GraphState) -> dict:
-    """Scrapes and summarizes content from web search results."""
-    summaries = []
+async def process_web_results_node(state: GraphState) -> dict:
+    """Scrapes and summarizes content from web search results concurrently."""
     user_query = state['rewritten_query']
-    for result in state['web_search_results']:
+    tokens = 0
+
+    async def summarize(result: dict) -> dict | None:
+        nonlocal tokens
         url = result['url']
         try:
-            response = requests.get(url, timeout=10)
-            response.raise_for_status()
-            soup = BeautifulSoup(response.content, 'html.parser')
-            text = "\n".join([p.get_text() for p in soup.find_all('p')])
+            text = result.get("text")
+            if text is None:
+                content = await fetch_content(url, timeout=10)
+                _, text = await extract_page(content, HTML_EXTRACTOR, WEB_CONTEXT_MAX_TOKENS)
             prompt = WEB_SUMMARY_PROMPT_TEMPLATE.invoke({"query": user_query, "context": text})
-            summary = llm.invoke(prompt).content
-            summaries.append(summary)
+            message = await invoke_llm("web_summary", prompt)
+            tokens += token_count(message)
+            await adispatch_custom_event("summary", {
+                "kind": "web", "title": result.get("title"), "source": url, "summary": message.content,
+            })
+            return {"summary": message.content, "metadata": _source_metadata(result), "text": text}
         except Exception as e:
             print(f"[WARN] Skipping URL {url} due to error: {e}")
-    return {"processed_results": summaries}
+            return None
 
-def arxiv_search_node(state: GraphState) -> dict:
+    summaries = await _gather_bounded(
+        [summarize(result) for result in state['web_search_results']],
+        concurrency=WEB_PROCESS_CONCURRENCY,
+        deadline=_node_deadline(state, WEB_PROCESS_DEADLINE),
+    )
+    return {"web_processed_results": [s for s in summaries if s is not None], "token_usage": tokens}
+
+async def arxiv_search_node(state: GraphState) -> dict:
     """Performs a search on arXiv."""
     payload = {'query': state['rewritten_query'], 'search_type': state['routing_decision']['arxiv_field']}
-    search_results = arxiv_search_tool.invoke(payload)
+    search_results = await _search_within_budget(state, arxiv_search_tool.ainvoke(payload), "arXiv search")
     return {'arxiv_search_results': search_results}
 
-def process_arxiv_results_node(state: GraphState) -> dict:
-    """Downloads, extracts text, and summarizes arXiv papers."""
-    summaries = []
+async def process_arxiv_results_node(state: GraphState) -> dict:
+    """Downloads, extracts text, and summarizes arXiv papers concurrently."""
     user_query = state['rewritten_query']
-    for result in state['arxiv_search_results']:
-        pdf_url = result['link'].replace('abs', 'pdf')
+    tokens = 0
+
+    async def summarize(result: dict) -> dict | None:
+        nonlocal tokens
+        pdf_url = result.get('pdf_link') or result['link'].replace('/abs/', '/pdf/')
         try:
-            loader = PyPDFLoader(pdf_url)
-            docs = loader.load()[:5]
-            context = " ".join([doc.page_content for doc in docs])
-            prompt = ARXIV_SUMMARY_PROMPT_TEMPLATE.invoke({'context': context, 'query': user_query})
-            summary = llm.invoke(prompt).content
-            summaries.append(summary)
+            pdf = await load_pdf(pdf_url, max_pages=PDF_MAX_PAGES, max_chars=PDF_MAX_CHARS)
+            start = time.perf_counter()
+            prompt = ARXIV_SUMMARY_PROMPT_TEMPLATE.invoke({'context': pdf["text"], 'query': user_query})
+            message = await invoke_llm("arxiv_summary", prompt)
+            tokens += token_count(message)
+            await adispatch_custom_event("summary", {
+                "kind": "arxiv", "title": result.get("title"), "source": result.get("link"), "summary": message.content,
+            })
+            print(
+                f"[INFO] arXiv PDF {pdf_url}: {pdf['bytes'] // 1024} KiB, download {pdf['download_s']:.2f}s, "
+                f"parse {pdf['parse_s']:.2f}s, summary {time.perf_counter() - start:.2f}s"
+            )
+            return {"summary": message.content, "metadata": _source_metadata(result), "text": pdf["text"]}
         except Exception as e:
             print(f"[WARN] Failed to process arXiv PDF {pdf_url}: {e}")
-    return {"processed_results": summaries}
-
-def add_to_db_node(state: GraphState) -> dict:
+            return None
+
+    summaries = await _gather_bounded(
+        [summarize(result) for result in state['arxiv_search_results']],
+        concurrency=ARXIV_PROCESS_CONCURRENCY,
+        deadline=_node_deadline(state, ARXIV_PROCESS_DEADLINE),
+    )
+    return {"arxiv_processed_results": [s for s in summaries if s is not None], "token_usage": tokens}
+
+async def merge_results_node(state: GraphState) -> dict:
+    """Combines the processed results of the branches that ran, dropping duplicate sources."""
+    merged = []
+    seen_sources = set()
+    for item in state.get("web_processed_results", []) + state.get("arxiv_processed_results", []):
+        source = item["metadata"]["source"]
+        if source in seen_sources:
+            continue
+        seen_sources.add(source)
+        merged.append(item)
+    return {
+        "processed_results": merged,
+        "web_processed_results": [],
+        "arxiv_processed_results": [],
+        "search_deadline": None,
+    }
+
+async def add_to_db_node(state: GraphState) -> dict:
+    """
+    Stores new summaries in Qdrant. The content hash covers the extracted source
+    text, not the summary (which is sampled and differs between runs), so an
+    unchanged source that is already stored is skipped (or only gets its
+    metadata refreshed) and only new or changed sources are embedded.
+    """
     qdrant_store = get_qdrant_store()
 
-    route = state['routing_decision']['route']
-    original_results = state['web_search_results'] if route == 'web_search' else state['arxiv_search_results']
-    processed_summaries = state['processed_results']
-    documents_to_add = []
-    ids_to_add = []
+    processed_results = state['processed_results']
+    search_round = state.get('search_round', 0) + 1
+    search_rounds.inc()
 
-    if not original_results or not processed_summaries:
+    if not processed_results:
         status = "Nothing to add to DB."
         print(f"[INFO] {status}")
-        return {"db_add_status": status}
-
-
-    for i, summary in enumerate(processed_summaries):
-        original_item = original_results[i]
-        
-        metadata = {
-            "title": original_item.get("title", "N/A"),
-            "source": original_item.get("link") or original_item.get("url"),
-        }
-        if route == 'arxiv_search':
-            metadata["authors"] = original_item.get("authors", "N/A")
+        return {"db_add_status": status, "db_added_count": 0, "db_add_counts": {}, "search_round": search_round}
 
-        doc = Document(page_content=summary, metadata=metadata)
-        documents_to_add.append(doc)
-
-        source_id = str(uuid.uuid5(uuid.NAMESPACE_DNS, metadata["source"]))
-        ids_to_add.append(source_id)
+    candidates = {}
+    for item in processed_results:
+        metadata = {**item["metadata"], "content_hash": content_hash(item.get("text") or item["summary"])}
+        candidates[source_point_id(metadata["source"])] = (item["summary"], metadata, item.get("text"))
 
+    added_count = 0
+    counts = {}
     try:
-        qdrant_store.add_documents(documents=documents_to_add, ids=ids_to_add)
-        status = f"Successfully added {len(documents_to_add)} documents to VectorDB."
+        with qdrant_latency.time(operation="retrieve"):
+            existing = await asyncio.to_thread(
+                get_qdrant_client().retrieve,
+                collection_name=QDRANT_COLLECTION_NAME,
+                ids=list(candidates),
+                with_payload=True,
+                with_vectors=False,
+            )
+        stored_metadata = {str(point.id): (point.payload or {}).get("metadata", {}) for point in existing}
+
+        documents_to_add, ids_to_add, payload_updates = [], [], []
+        chunk_documents, chunk_ids, stale_parents = [], [], []
+        inserted = updated = skipped = 0
+        for point_id, (summary, metadata, text) in candidates.items():
+            stored = stored_metadata.get(point_id)
+            if stored is None or stored.get("content_hash") != metadata["content_hash"]:
+                documents_to_add.append(Document(page_content=summary, metadata=metadata))
+                ids_to_add.append(point_id)
+                inserted += stored is None
+                updated += stored is not None
+                if STORE_SOURCE_CHUNKS and text:
+                    if stored is not None:
+                        stale_parents.append(point_id)
+                    documents, ids = make_source_chunks(text, metadata)
+                    chunk_documents += documents
+                    chunk_ids += ids
+            elif stored != metadata:
+                payload_updates.append((point_id, metadata))
+            else:
+                skipped += 1
+
+        if stale_parents:
+            with qdrant_latency.time(operation="delete_chunks"):
+                await asyncio.to_thread(
+                    get_qdrant_client().delete,
+                    collection_name=QDRANT_COLLECTION_NAME,
+                    points_selector=models.FilterSelector(filter=models.Filter(must=[
+                        models.FieldCondition(key="metadata.parent_id", match=models.MatchAny(any=stale_parents))
+                    ])),
+                )
+        if documents_to_add or chunk_documents:
+            # Includes embedding the documents, which dominates for new sources.
+            with qdrant_latency.time(operation="add_documents"):
+                await qdrant_store.aadd_documents(
+                    documents=documents_to_add + chunk_documents, ids=ids_to_add + chunk_ids
+                )
+        for point_id, metadata in payload_updates:
+            with qdrant_latency.time(operation="set_payload"):
+                await asyncio.to_thread(
+                    get_qdrant_client().set_payload,
+                    collection_name=QDRANT_COLLECTION_NAME,
+                    payload={"metadata": metadata},
+                    points=[point_id],
+                )
+
+        added_count = len(documents_to_add)
+        counts = {
+            "inserted": inserted,
+            "updated": updated,
+            "metadata_only": len(payload_updates),
+            "skipped": skipped,
+            "chunks": len(chunk_documents),
+        }
+        status = (
+            f"VectorDB updated: {inserted} inserted, {updated} re-embedded, "
+            f"{len(payload_updates)} metadata-only, {skipped} unchanged, {len(chunk_documents)} chunks stored."
+        )
         print(f"[INFO] {status}")
     except Exception as e:
         status = f"Error adding to VectorDB: {e}"
         print(f"[ERROR] {status}")
-        
-    return {"db_add_status": status}
+
+    if SEMANTIC_CACHE_ENABLED and added_count:
+        try:
+            await _invalidate_semantic_cache(ids_to_add, [i for i in ids_to_add if i in stored_metadata])
+        except Exception as e:
+            print(f"[WARN] Could not invalidate semantic cache entries: {e}")
+
+    return {
+        "db_add_status": status,
+        "db_added_count": added_count,
+        "db_add_counts": counts,
+        "search_round": search_round,
+    }
+
+async def _invalidate_semantic_cache(added_ids: list, changed_ids: list) -> None:
+    """Drops cached answers made stale by the summaries just stored, reusing their stored embeddings."""
+    with qdrant_latency.time(operation="retrieve_vectors"):
+        points = await asyncio.to_thread(
+            get_qdrant_client().retrieve,
+            collection_name=QDRANT_COLLECTION_NAME,
+            ids=added_ids,
+            with_payload=False,
+            with_vectors=[DENSE_VECTOR_NAME],
+        )
+    vectors = [point.vector[DENSE_VECTOR_NAME] for point in points if point.vector]
+    dropped = await semantic_cache.invalidate(changed_ids, vectors)
+    if dropped:
+        print(f"[INFO] Dropped {dropped} cached answers affected by the new documents.")
 
 def conditional_router(state: GraphState) -> Literal["web_search_branch", "arxiv_search_branch"]:
     """Determines the execution path based on the routing decision."""
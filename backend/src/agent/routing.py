@@ -0,0 +1,198 @@
+import asyncio
+import math
+from typing import List, Tuple
+
+from langchain_core.output_parsers import JsonOutputParser
+
+from ..config import (
+    get_embedding_model,
+    ROUTER_MODE,
+    ROUTER_MIN_SIMILARITY,
+    ROUTER_MIN_MARGIN,
+)
+from ..metrics import router_decisions
+from ..prompts import ROUTER_PROMPT_TEMPLATE
+from .utils import token_count, invoke_llm
+
+ARXIV_FIELDS = ("all", "title", "author", "abstract")
+
+# Labeled examples in the shape rewrite_query_node produces: general topics as
+# Vietnamese keywords, academic ones as English technical keywords.
+ROUTE_PROTOTYPES = {
+    ("web_search", None): [
+        "tin tức công nghệ mới nhất",
+        "giá vàng hôm nay",
+        "kinh nghiệm du lịch Đà Nẵng",
+        "cách nấu phở bò",
+        "lợi ích của việc học tiếng Anh",
+        "lịch thi đấu bóng đá",
+        "mẹo tiết kiệm tiền cho sinh viên",
+        "phim hay nhất năm",
+        "thời tiết Hà Nội cuối tuần",
+        "cách giảm căng thẳng khi làm việc",
+        "lịch sử Việt Nam thời Lý",
+        "xu hướng thời trang mùa hè",
+        "best smartphones to buy",
+        "how to start a small business",
+    ],
+    ("arxiv_search", "all"): [
+        "retrieval augmented generation",
+        "graph neural networks molecular property prediction",
+        "large language model reasoning",
+        "diffusion models image generation",
+        "reinforcement learning from human feedback",
+        "vision transformer self-supervised pretraining",
+        "quantum error correction surface codes",
+        "federated learning privacy",
+        "protein structure prediction deep learning",
+        "speech recognition low-resource languages",
+        "mạng nơ-ron tích chập nhận dạng ảnh",
+        "học sâu xử lý ngôn ngữ tự nhiên",
+    ],
+    ("arxiv_search", "title"): [
+        "Attention Is All You Need",
+        "BERT: Pre-training of Deep Bidirectional Transformers",
+        "paper titled Deep Residual Learning for Image Recognition",
+        "Denoising Diffusion Probabilistic Models paper",
+        "bài báo Language Models are Few-Shot Learners",
+    ],
+    ("arxiv_search", "author"): [
+        "papers by Yann LeCun",
+        "Geoffrey Hinton publications",
+        "research by Yoshua Bengio",
+        "Kaiming He recent papers",
+        "các bài báo của tác giả Andrew Ng",
+    ],
+    ("arxiv_search", "abstract"): [
+        "methods that reduce hallucination in language models",
+        "approaches for detecting anomalies in time series data",
+        "techniques to compress neural networks for mobile devices",
+        "studies measuring bias in face recognition systems",
+        "work on explaining predictions of black-box models",
+    ],
+}
+
+
+def _normalise(vector: List[float]) -> List[float]:
+    norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+    return [v / norm for v in vector]
+
+
+class PrototypeRouter:
+    """
+    Nearest-prototype classifier over the shared embedding model.
+
+    Each label (route, arXiv field) scores the query by its best cosine
+    similarity to the label's prototypes. The route is trusted when the best
+    label reaches `min_similarity` and beats the best label of the other route
+    by at least `min_margin`. The arXiv field falls back to "all" when the
+    field labels are too close to tell apart.
+    """
+
+    def __init__(self, prototypes: dict, min_similarity: float, min_margin: float):
+        self.prototypes = prototypes
+        self.min_similarity = min_similarity
+        self.min_margin = min_margin
+        self._vectors: List[Tuple[Tuple[str, str | None], List[float]]] | None = None
+        self._lock = asyncio.Lock()
+
+    async def load(self):
+        """Embeds the prototypes once; later calls return the cached vectors."""
+        if self._vectors is None:
+            async with self._lock:
+                if self._vectors is None:
+                    labels = [label for label, texts in self.prototypes.items() for _ in texts]
+                    texts = [text for texts in self.prototypes.values() for text in texts]
+                    vectors = await get_embedding_model().aembed_documents(texts)
+                    self._vectors = [(label, _normalise(v)) for label, v in zip(labels, vectors)]
+        return self._vectors
+
+    async def scores(self, query: str) -> dict:
+        """Best cosine similarity of the query to each label's prototypes."""
+        prototypes = await self.load()
+        query_vector = _normalise(await get_embedding_model().aembed_query(query))
+        scores = {}
+        for label, vector in prototypes:
+            similarity = sum(a * b for a, b in zip(query_vector, vector))
+            scores[label] = max(scores.get(label, -1.0), similarity)
+        return scores
+
+    async def route(self, query: str) -> Tuple[dict, bool]:
+        """Returns (routing decision, whether it is confident enough to skip the LLM)."""
+        scores = await self.scores(query)
+        best = {}
+        for (route, field), score in scores.items():
+            best[route] = max(best.get(route, -1.0), score)
+        ranked = sorted(best.items(), key=lambda item: item[1], reverse=True)
+        route, top = ranked[0]
+        margin = top - ranked[1][1] if len(ranked) > 1 else top
+        confident = top >= self.min_similarity and margin >= self.min_margin
+
+        field = None
+        if route == "arxiv_search":
+            fields = sorted(
+                ((f, s) for (r, f), s in scores.items() if r == route), key=lambda item: item[1], reverse=True
+            )
+            field = fields[0][0]
+            if len(fields) > 1 and fields[0][1] - fields[1][1] < self.min_margin:
+                field = "all"
+        return {"route": route, "arxiv_field": field}, confident
+
+
+prototype_router = PrototypeRouter(ROUTE_PROTOTYPES, ROUTER_MIN_SIMILARITY, ROUTER_MIN_MARGIN)
+
+
+def _valid_decision(decision) -> dict | None:
+    if not isinstance(decision, dict) or decision.get("route") not in ("web_search", "arxiv_search"):
+        return None
+    if decision["route"] == "arxiv_search":
+        field = decision.get("arxiv_field")
+        return {"route": "arxiv_search", "arxiv_field": field if field in ARXIV_FIELDS else "all"}
+    return {"route": "web_search", "arxiv_field": None}
+
+
+def _parse_decision(message) -> dict | None:
+    try:
+        return _valid_decision(JsonOutputParser().invoke(message.content))
+    except Exception:
+        return None
+
+
+async def llm_route(query: str) -> Tuple[dict | None, int]:
+    """Asks the LLM for a route. Returns (decision, or None when the reply is unusable; tokens used)."""
+    prompt = ROUTER_PROMPT_TEMPLATE.invoke({"query": query})
+    message = await invoke_llm("router", prompt, validate=lambda m: _parse_decision(m) is not None)
+    return _parse_decision(message), token_count(message)
+
+
+async def route_query(query: str, mode: str = ROUTER_MODE) -> Tuple[dict, int, str]:
+    """
+    Chooses between web and arXiv search, and the arXiv field to search.
+
+    Modes:
+      - "llm":       the LLM routes every query (the original behaviour).
+      - "embedding": the prototype router decides, and the LLM is asked only
+                     when it is not confident.
+
+    An unusable LLM reply falls back to the prototype router's guess in
+    "embedding" mode and to web search in "llm" mode.
+
+    Returns (decision, tokens spent, method that decided).
+    """
+    if mode not in ("llm", "embedding"):
+        raise ValueError(f"Unknown router mode: {mode}")
+
+    guess = None
+    if mode == "embedding":
+        guess, confident = await prototype_router.route(query)
+        if confident:
+            router_decisions.inc(method="embedding")
+            return guess, 0, "embedding"
+
+    decision, tokens = await llm_route(query)
+    if decision is None:
+        print(f"[WARN] Router reply for '{query}' was not a valid route; using fallback.")
+        router_decisions.inc(method="fallback")
+        return guess or {"route": "web_search", "arxiv_field": None}, tokens, "fallback"
+    router_decisions.inc(method="llm")
+    return decision, tokens, "llm"
@@ -0,0 +1,38 @@
+import time
+from typing import Callable
+
+from ..cache.llm import get_llm_cache
+from ..config import get_llm, LLM_CACHE_ENABLED
+from ..metrics import record_llm_usage
+
+
+def token_count(message) -> int:
+    """Total tokens reported by the model for one response, when available."""
+    usage = getattr(message, "usage_metadata", None) or {}
+    return usage.get("total_tokens", 0)
+
+
+async def invoke_llm(template: str, prompt, validate: Callable[[object], bool] | None = None):
+    """
+    Calls the LLM and records the call, its latency and token usage under `template`.
+    Templates listed in LLM_CACHE_TEMPLATES are answered from the response cache when possible.
+
+    `validate(message)` tells whether the caller can use a response. Only usable
+    responses are cached, and a cached one that is not usable is asked again, so
+    a malformed reply is never replayed for the cache TTL.
+    """
+    llm = get_llm()
+    cache = get_llm_cache() if LLM_CACHE_ENABLED else None
+    if cache is not None and cache.enabled_for(template):
+        cached = await cache.lookup(llm, template, prompt)
+        if cached is not None and (validate is None or validate(cached)):
+            return cached
+    else:
+        cache = None
+
+    start = time.perf_counter()
+    message = await llm.ainvoke(prompt, config={"run_name": template, "tags": [f"template:{template}"]})
+    record_llm_usage(template, message, time.perf_counter() - start)
+    if cache is not None and (validate is None or validate(message)):
+        await cache.store(llm, template, prompt, message)
+    return message
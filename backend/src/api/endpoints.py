@@ -1,11 +1,16 @@
 import asyncio
+import time
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+from fastapi.responses import PlainTextResponse
 
-from ..agent.graph import create_graph
+from ..agent.graph import get_graph
 from ..prompts import STEP_DESCRIPTIONS, TRANSLATION_FEEDBACK_PROMPT
 
-from ..schemas import TranslationFeedbackRequest, TranslationFeedbackResponse, Feedback
-from ..config import llm
+from ..schemas import GraphOutput, TranslationFeedbackRequest, TranslationFeedbackResponse, Feedback
+from ..agent.utils import invoke_llm
+from ..config import MAX_SEARCH_ROUNDS, WS_SEND_QUEUE_SIZE, WS_SEND_TIMEOUT, WS_STREAM_TEMPLATES
+from ..metrics import registry
+from .streaming import EventSender
 from langchain_core.output_parsers import JsonOutputParser
 
 
@@ -15,30 +20,79 @@ router = APIRouter()
 async def websocket_endpoint(websocket: WebSocket):
     """
     Handles the WebSocket connection to run the agent and stream events.
+
+    Besides "step" labels, the client receives each approved passage ("document")
+    as soon as the grader accepts it, each source summary ("summary") as it is
+    written, summary tokens ("token") while they are generated, and the final
+    "result". With `?timings=1`, a "timing" event with its duration follows every node.
     """
     await websocket.accept()
-    langgraph_app = create_graph()
+    sender = EventSender(websocket, WS_SEND_QUEUE_SIZE, WS_SEND_TIMEOUT)
     try:
+        langgraph_app = get_graph(websocket.query_params.get("variant", "default"))
+        send_timings = websocket.query_params.get("timings", "").lower() in ("1", "true")
+        node_started = {}
         query_data = await websocket.receive_text()
         inputs = {"user_query": query_data}
         config = {"recursion_limit": 50}
+        # Node updates merged as the run goes, so the result has the same shape
+        # whichever node ended it (the semantic cache on a hit, `final` otherwise).
+        state = dict(inputs)
 
-        async for event in langgraph_app.astream_events(inputs, config=config, version="v1"):
+        async for event in langgraph_app.astream_events(inputs, config=config, version="v2"):
             kind = event["event"]
-            if kind == "on_chain_start":
+            if kind == "on_chat_model_stream":
+                if event["name"] in WS_STREAM_TEMPLATES:
+                    text = event["data"]["chunk"].content
+                    if isinstance(text, str) and text:
+                        sender.offer({"type": "token", "run_id": event["run_id"], "template": event["name"], "text": text})
+            elif kind == "on_custom_event":
+                await sender.send({"type": event["name"], "data": event["data"]})
+            elif kind == "on_chain_start":
                 node_name = event["name"]
+                if send_timings and event.get("metadata", {}).get("langgraph_node") == node_name:
+                    node_started[event["run_id"]] = time.perf_counter()
                 if node_name in STEP_DESCRIPTIONS:
-                    await websocket.send_json({"type": "step", "message": STEP_DESCRIPTIONS[node_name]})
-            elif kind == "on_chain_end" and event["name"] == "LangGraph":
-                print(event["data"]["output"])
-                await websocket.send_json({"type": "result", "data": event["data"]["output"]})
+                    await sender.send({"type": "step", "node": node_name, "message": STEP_DESCRIPTIONS[node_name]})
+            elif kind == "on_chain_end" and event["run_id"] in node_started:
+                duration = time.perf_counter() - node_started.pop(event["run_id"])
+                await sender.send({"type": "timing", "node": event["name"], "duration_s": round(duration, 4)})
+
+            if (
+                kind == "on_chain_end"
+                and event.get("metadata", {}).get("langgraph_node") == event["name"]
+                and isinstance(event["data"].get("output"), dict)
+            ):
+                state.update(event["data"]["output"])
+
+            if kind == "on_chain_end" and event["name"] == "add_to_db":
+                output = event["data"].get("output") or {}
+                await sender.send({
+                    "type": "loop",
+                    "round": output.get("search_round"),
+                    "max_rounds": MAX_SEARCH_ROUNDS,
+                    "added": output.get("db_added_count", 0),
+                    "counts": output.get("db_add_counts", {}),
+                })
+
+        result = {key: state.get(key) for key in GraphOutput.__annotations__}
+        result["final_results"] = result["final_results"] or []
+        result["final_scores"] = result["final_scores"] or []
+        await sender.send({"type": "result", "data": result, "dropped_tokens": sender.dropped})
 
     except WebSocketDisconnect:
         print("Client disconnected")
     except Exception as e:
         print(f"An error occurred: {e}")
-        await websocket.send_json({"type": "error", "message": str(e)})
+        try:
+            await sender.send({"type": "error", "message": str(e)})
+        except Exception:
+            pass
     finally:
+        try:
+            await sender.aclose()
+        except Exception:
+            pass
         await websocket.close()
 
 @router.post("/feedback", response_model=TranslationFeedbackResponse)
@@ -49,12 +103,19 @@ async def get_translation_feedback(request: TranslationFeedbackRequest):
     print(f"Received feedback request for sentence: '{request.current_sentence}'")
 
     parser = JsonOutputParser(pydantic_object=Feedback)
-    chain = TRANSLATION_FEEDBACK_PROMPT | llm | parser
-
-    feedback_result = await chain.ainvoke({
+    prompt = TRANSLATION_FEEDBACK_PROMPT.invoke({
         "original_passage": request.original_passage,
         "current_sentence": request.current_sentence,
         "user_translation": request.user_translation
     })
+    feedback_result = parser.invoke(await invoke_llm("translation_feedback", prompt))
+
+    return TranslationFeedbackResponse(feedback_data=feedback_result)
 
-    return TranslationFeedbackResponse(feedback_data=feedback_result)
\ No newline at end of file
+@router.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """
+    Exposes node latency, LLM calls and tokens per prompt template, Qdrant and
+    HTTP latency, cache hit rates and search-loop counts in the Prometheus text format.
+    """
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
@@ -0,0 +1,61 @@
+import asyncio
+
+from fastapi import WebSocket, WebSocketDisconnect
+
+
+class EventSender:
+    """
+    Bounded outbound queue for one WebSocket, drained by its own task.
+
+    `send` waits for room in the queue; `offer` is for events that can be lost
+    (streamed tokens): when the queue is full they are dropped and counted. A
+    send that takes longer than `send_timeout` fails the socket.
+
+    This bounds what waits to be written to the socket, not the graph run:
+    astream_events buffers its events in an unbounded queue, so a slow client
+    delays delivery and leaves events buffered there rather than slowing the
+    run down. The send timeout is what cuts off a client that stops reading.
+    """
+
+    def __init__(self, websocket: WebSocket, maxsize: int, send_timeout: float):
+        self.websocket = websocket
+        self.send_timeout = send_timeout
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize)
+        self.dropped = 0
+        self._task = asyncio.create_task(self._drain())
+
+    async def _drain(self) -> None:
+        while True:
+            message = await self.queue.get()
+            if message is None:
+                return
+            await asyncio.wait_for(self.websocket.send_json(message), self.send_timeout)
+
+    def _check_alive(self) -> None:
+        if self._task.done():
+            if not self._task.cancelled() and self._task.exception() is not None:
+                raise self._task.exception()
+            raise WebSocketDisconnect()
+
+    async def send(self, message: dict) -> None:
+        self._check_alive()
+        put = asyncio.ensure_future(self.queue.put(message))
+        await asyncio.wait({put, self._task}, return_when=asyncio.FIRST_COMPLETED)
+        if not put.done():
+            put.cancel()
+            self._check_alive()
+
+    def offer(self, message: dict) -> bool:
+        self._check_alive()
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            self.dropped += 1
+            return False
+        return True
+
+    async def aclose(self) -> None:
+        """Flushes what is queued, then stops the drain task."""
+        if not self._task.done():
+            await self.send(None)
+            await asyncio.gather(self._task, return_exceptions=True)
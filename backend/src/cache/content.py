@@ -0,0 +1,215 @@
+import asyncio
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict
+
+from ..config import (
+    CONTENT_CACHE_ENABLED,
+    CONTENT_CACHE_DIR,
+    CONTENT_CACHE_TTL,
+    CONTENT_CACHE_MAX_BYTES,
+    HTTP_MAX_RETRIES,
+)
+from ..http_client import get as http_get
+from ..metrics import registry
+
+
+class ContentFetchError(Exception):
+    """Raised when an upstream fetch returns an error status."""
+
+
+@dataclass
+class FetchResult:
+    status: int
+    content: bytes
+    headers: Dict[str, str] = field(default_factory=dict)
+
+
+Fetcher = Callable[[str, Dict[str, str], float, int], Awaitable[FetchResult]]
+
+
+async def httpx_fetcher(url: str, headers: Dict[str, str], timeout: float, retries: int = HTTP_MAX_RETRIES) -> FetchResult:
+    """Default fetcher backed by the shared async HTTP client."""
+    response = await http_get(url, headers=headers, timeout=timeout, retries=retries)
+    return FetchResult(response.status_code, response.content, dict(response.headers))
+
+
+class ContentCache:
+    """
+    URL-keyed cache of fetched pages and PDFs on local disk.
+
+    Bodies live in one file per URL; an SQLite index tracks validators
+    (ETag / Last-Modified), fetch time for the TTL and last access for LRU
+    eviction once the total size exceeds `max_bytes`. Entries older than the
+    TTL are revalidated with a conditional request instead of re-downloaded
+    when the server supports it.
+    """
+
+    def __init__(self, directory: str, ttl: float, max_bytes: int, fetcher: Fetcher = httpx_fetcher):
+        self.directory = directory
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.fetcher = fetcher
+        self.stats = {"hits": 0, "misses": 0, "revalidated": 0, "evictions": 0}
+
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(os.path.join(directory, "index.sqlite3"), check_same_thread=False)
+        self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                size INTEGER NOT NULL,
+                fetched_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+            """
+        )
+        self._db.commit()
+
+    @staticmethod
+    def _key(url: str) -> str:
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.bin")
+
+    def _lookup(self, key: str):
+        with self._lock:
+            return self._db.execute(
+                "SELECT etag, last_modified, fetched_at FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+
+    def _touch(self, key: str, refreshed: bool = False) -> None:
+        now = time.time()
+        with self._lock:
+            if refreshed:
+                self._db.execute("UPDATE entries SET last_access = ?, fetched_at = ? WHERE key = ?", (now, now, key))
+            else:
+                self._db.execute("UPDATE entries SET last_access = ? WHERE key = ?", (now, key))
+            self._db.commit()
+
+    def _read(self, key: str) -> bytes | None:
+        try:
+            with open(self._path(key), "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def _store(self, key: str, url: str, result: FetchResult) -> None:
+        tmp_path = self._path(key) + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(result.content)
+        os.replace(tmp_path, self._path(key))
+
+        headers = {k.lower(): v for k, v in result.headers.items()}
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, url, headers.get("etag"), headers.get("last-modified"), len(result.content), now, now),
+            )
+            self._db.commit()
+        self._evict()
+
+    def _evict(self) -> None:
+        """Drops least recently used entries until the cache fits in `max_bytes`."""
+        with self._lock:
+            total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+            if total <= self.max_bytes:
+                return
+            victims = []
+            for key, size in self._db.execute("SELECT key, size FROM entries ORDER BY last_access ASC"):
+                if total <= self.max_bytes:
+                    break
+                victims.append(key)
+                total -= size
+            self._db.executemany("DELETE FROM entries WHERE key = ?", [(k,) for k in victims])
+            self._db.commit()
+        for key in victims:
+            try:
+                os.remove(self._path(key))
+            except FileNotFoundError:
+                pass
+        self.stats["evictions"] += len(victims)
+
+    async def fetch(self, url: str, timeout: float = 10, retries: int = HTTP_MAX_RETRIES) -> bytes:
+        """Returns the body for `url`, from disk when fresh or still valid upstream."""
+        key = self._key(url)
+        entry = await asyncio.to_thread(self._lookup, key)
+        cached = await asyncio.to_thread(self._read, key) if entry else None
+
+        headers = {}
+        if cached is not None:
+            etag, last_modified, fetched_at = entry
+            if time.time() - fetched_at < self.ttl:
+                self.stats["hits"] += 1
+                await asyncio.to_thread(self._touch, key)
+                return cached
+            if etag:
+                headers["If-None-Match"] = etag
+            if last_modified:
+                headers["If-Modified-Since"] = last_modified
+
+        result = await self.fetcher(url, headers, timeout, retries)
+        if result.status == 304 and cached is not None:
+            self.stats["revalidated"] += 1
+            await asyncio.to_thread(self._touch, key, True)
+            return cached
+        if result.status >= 400:
+            raise ContentFetchError(f"HTTP {result.status} for {url}")
+
+        self.stats["misses"] += 1
+        await asyncio.to_thread(self._store, key, url, result)
+        return result.content
+
+    def hit_rate(self) -> float:
+        served = self.stats["hits"] + self.stats["revalidated"]
+        total = served + self.stats["misses"]
+        return served / total if total else 0.0
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+_content_cache: ContentCache | None = None
+
+
+def get_content_cache() -> ContentCache:
+    """Returns the process-wide content cache."""
+    global _content_cache
+    if _content_cache is None:
+        _content_cache = ContentCache(CONTENT_CACHE_DIR, CONTENT_CACHE_TTL, CONTENT_CACHE_MAX_BYTES)
+    return _content_cache
+
+
+async def fetch_content(url: str, timeout: float = 10, retries: int = HTTP_MAX_RETRIES) -> bytes:
+    """
+    Fetches a URL through the shared content cache, or directly when it is disabled.
+    Pass a low `retries` for optional fetches that are cheaper to skip than to wait for.
+    """
+    if CONTENT_CACHE_ENABLED:
+        return await get_content_cache().fetch(url, timeout=timeout, retries=retries)
+    result = await httpx_fetcher(url, {}, timeout, retries)
+    if result.status >= 400:
+        raise ContentFetchError(f"HTTP {result.status} for {url}")
+    return result.content
+
+
+def _content_cache_samples():
+    if _content_cache is None:
+        return
+    for event, value in _content_cache.stats.items():
+        yield "ai_coach_content_cache_events_total", "Content cache events since startup.", {"event": event}, value
+    yield "ai_coach_content_cache_hit_rate", "Content cache hit rate since startup.", {}, _content_cache.hit_rate()
+
+
+registry.register_collector(_content_cache_samples)
@@ -0,0 +1,210 @@
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Iterable, List, Tuple
+
+from langchain_core.messages import AIMessage
+
+from ..config import (
+    LLM_CACHE_BACKEND,
+    LLM_CACHE_PATH,
+    LLM_CACHE_TTL,
+    LLM_CACHE_MAX_ENTRIES,
+    LLM_CACHE_TEMPLATES,
+)
+from ..metrics import llm_cache_lookups, llm_cache_saved_tokens, registry
+
+
+class MemoryBackend:
+    """Per-process LRU of at most `max_entries` entries."""
+
+    blocking = False
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, Tuple[str, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> str | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at < time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: str, expires_at: float) -> int:
+        """Stores an entry and returns how many were evicted to make room."""
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            evicted = 0
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                evicted += 1
+            return evicted
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteBackend:
+    """SQLite table shared by every worker on the host; least recently used entries go first."""
+
+    blocking = True
+
+    def __init__(self, path: str, max_entries: int):
+        self.max_entries = max_entries
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                expires_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+            """
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS responses_last_access ON responses (last_access)")
+        self._db.commit()
+
+    def get(self, key: str) -> str | None:
+        now = time.time()
+        with self._lock:
+            row = self._db.execute("SELECT value, expires_at FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            if row[1] < now:
+                self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._db.commit()
+                return None
+            self._db.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+            self._db.commit()
+            return row[0]
+
+    def set(self, key: str, value: str, expires_at: float) -> int:
+        """Stores an entry and returns how many were evicted to make room."""
+        now = time.time()
+        with self._lock:
+            self._db.execute("INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?)", (key, value, expires_at, now))
+            self._db.execute("DELETE FROM responses WHERE expires_at < ?", (now,))
+            excess = self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0] - self.max_entries
+            if excess > 0:
+                self._db.execute(
+                    "DELETE FROM responses WHERE key IN (SELECT key FROM responses ORDER BY last_access ASC LIMIT ?)",
+                    (excess,),
+                )
+            self._db.commit()
+            return max(excess, 0)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+def _normalise(text) -> str:
+    return " ".join(str(text).split())
+
+
+class LLMCache:
+    """
+    Exact-match cache of LLM responses for the prompt templates in `templates`.
+
+    The key hashes the model's identifying parameters, the template name and the
+    prompt messages with whitespace collapsed, so a changed model, temperature
+    or prompt wording never reuses an old answer. Entries expire after `ttl`
+    seconds. A hit returns the cached text without usage metadata, since it
+    spent no tokens; the tokens the original call used are counted as saved.
+    """
+
+    def __init__(self, backend, ttl: float, templates: Iterable[str]):
+        self.backend = backend
+        self.ttl = ttl
+        self.templates = set(templates)
+        self.stats = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0}
+
+    def enabled_for(self, template: str) -> bool:
+        return template in self.templates
+
+    @staticmethod
+    def key(llm, template: str, prompt) -> str:
+        model = f"{llm._llm_type}:{json.dumps(llm._identifying_params, sort_keys=True, default=str)}"
+        if isinstance(prompt, str):
+            messages: List[Tuple[str, str]] = [("human", _normalise(prompt))]
+        else:
+            messages = [(getattr(m, "type", "human"), _normalise(getattr(m, "content", m))) for m in prompt]
+        payload = json.dumps([model, template, messages], ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    async def _call(self, method, *args):
+        if self.backend.blocking:
+            return await asyncio.to_thread(method, *args)
+        return method(*args)
+
+    async def lookup(self, llm, template: str, prompt) -> AIMessage | None:
+        raw = await self._call(self.backend.get, self.key(llm, template, prompt))
+        if raw is None:
+            self.stats["misses"] += 1
+            llm_cache_lookups.inc(template=template, result="miss")
+            return None
+        entry = json.loads(raw)
+        self.stats["hits"] += 1
+        llm_cache_lookups.inc(template=template, result="hit")
+        llm_cache_saved_tokens.inc(entry["tokens"], template=template)
+        return AIMessage(content=entry["content"], response_metadata={"cached": True})
+
+    async def store(self, llm, template: str, prompt, message) -> None:
+        if not isinstance(message.content, str) or not message.content:
+            return
+        usage = getattr(message, "usage_metadata", None) or {}
+        value = json.dumps({"content": message.content, "tokens": usage.get("total_tokens", 0)}, ensure_ascii=False)
+        evicted = await self._call(self.backend.set, self.key(llm, template, prompt), value, time.time() + self.ttl)
+        self.stats["stores"] += 1
+        self.stats["evictions"] += evicted
+
+    def hit_rate(self) -> float:
+        total = self.stats["hits"] + self.stats["misses"]
+        return self.stats["hits"] / total if total else 0.0
+
+
+_llm_cache: LLMCache | None = None
+
+
+def get_llm_cache() -> LLMCache:
+    """Returns the process-wide LLM response cache."""
+    global _llm_cache
+    if _llm_cache is None:
+        if LLM_CACHE_BACKEND == "memory":
+            backend = MemoryBackend(LLM_CACHE_MAX_ENTRIES)
+        else:
+            backend = SQLiteBackend(LLM_CACHE_PATH, LLM_CACHE_MAX_ENTRIES)
+        _llm_cache = LLMCache(backend, LLM_CACHE_TTL, LLM_CACHE_TEMPLATES)
+    return _llm_cache
+
+
+def _llm_cache_samples():
+    if _llm_cache is None:
+        return
+    for event, value in _llm_cache.stats.items():
+        yield "ai_coach_llm_cache_events_total", "LLM response cache events since startup.", {"event": event}, value
+    yield "ai_coach_llm_cache_hit_rate", "LLM response cache hit rate since startup.", {}, _llm_cache.hit_rate()
+    yield "ai_coach_llm_cache_entries", "Entries currently in the LLM response cache.", {}, len(_llm_cache.backend)
+
+
+registry.register_collector(_llm_cache_samples)
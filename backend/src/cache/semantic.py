@@ -0,0 +1,159 @@
+import asyncio
+import time
+import uuid
+from typing import List
+
+from qdrant_client.http import models
+
+from ..config import (
+    get_embedding_model,
+    DENSE_VECTOR_DIM,
+    SEMANTIC_CACHE_COLLECTION_NAME,
+    SEMANTIC_CACHE_THRESHOLD,
+    SEMANTIC_CACHE_TTL,
+    SEMANTIC_CACHE_INVALIDATE_SIMILARITY,
+)
+from ..vectordb.client import get_qdrant_client
+from ..metrics import qdrant_latency, registry
+
+
+class SemanticCache:
+    """
+    Answer cache keyed on the embedding of the rewritten query.
+
+    Entries live in their own Qdrant collection. A lookup returns the stored
+    `final_results` of the closest cached query when its cosine similarity is at
+    least `threshold` and the entry is younger than `ttl` seconds. When the
+    knowledge base changes, only answers that cite a changed source or whose
+    query is within `invalidate_similarity` of a new summary are dropped.
+    """
+
+    def __init__(self, collection_name: str, threshold: float, ttl: float, invalidate_similarity: float):
+        self.collection_name = collection_name
+        self.threshold = threshold
+        self.ttl = ttl
+        self.invalidate_similarity = invalidate_similarity
+        self.stats = {"hits": 0, "misses": 0, "stores": 0, "invalidations": 0}
+        self._ready = False
+
+    def _ensure_collection(self) -> None:
+        if self._ready:
+            return
+        client = get_qdrant_client()
+        if not client.collection_exists(self.collection_name):
+            client.create_collection(
+                collection_name=self.collection_name,
+                vectors_config=models.VectorParams(size=DENSE_VECTOR_DIM, distance=models.Distance.COSINE),
+            )
+        self._ready = True
+
+    def _fresh_filter(self) -> models.Filter:
+        return models.Filter(
+            must=[models.FieldCondition(key="created_at", range=models.Range(gte=time.time() - self.ttl))]
+        )
+
+    async def lookup(self, query: str) -> dict | None:
+        """Returns the cached `final_results` and `final_scores` for a near-duplicate query, or None."""
+        vector = await get_embedding_model().aembed_query(query)
+        await asyncio.to_thread(self._ensure_collection)
+        with qdrant_latency.time(operation="semantic_cache_lookup"):
+            response = await asyncio.to_thread(
+                get_qdrant_client().query_points,
+                collection_name=self.collection_name,
+                query=vector,
+                query_filter=self._fresh_filter(),
+                score_threshold=self.threshold,
+                limit=1,
+                with_payload=True,
+            )
+        if not response.points:
+            self.stats["misses"] += 1
+            return None
+        self.stats["hits"] += 1
+        payload = response.points[0].payload
+        return {"final_results": payload["final_results"], "final_scores": payload.get("final_scores", [])}
+
+    async def store(
+        self, query: str, final_results: List[str], final_scores: List[float], source_ids: List[str] = ()
+    ) -> None:
+        """Caches the final results for a rewritten query, with the ids of the sources they came from."""
+        vector = await get_embedding_model().aembed_query(query)
+        point = models.PointStruct(
+            id=str(uuid.uuid5(uuid.NAMESPACE_DNS, query)),
+            vector=vector,
+            payload={
+                "query": query,
+                "final_results": final_results,
+                "final_scores": final_scores,
+                "source_ids": list(source_ids),
+                "created_at": time.time(),
+            },
+        )
+        await asyncio.to_thread(self._ensure_collection)
+        with qdrant_latency.time(operation="semantic_cache_store"):
+            await asyncio.to_thread(get_qdrant_client().upsert, collection_name=self.collection_name, points=[point])
+        self.stats["stores"] += 1
+
+    def _stale_ids(self, changed_source_ids: List[str], new_vectors: List[List[float]]) -> set:
+        client = get_qdrant_client()
+        stale = set()
+        if changed_source_ids:
+            source_filter = models.Filter(must=[
+                models.FieldCondition(key="source_ids", match=models.MatchAny(any=list(changed_source_ids)))
+            ])
+            offset = None
+            while True:
+                points, offset = client.scroll(
+                    collection_name=self.collection_name, scroll_filter=source_filter,
+                    limit=256, offset=offset, with_payload=False,
+                )
+                stale.update(point.id for point in points)
+                if offset is None:
+                    break
+        if new_vectors:
+            responses = client.query_batch_points(
+                collection_name=self.collection_name,
+                requests=[
+                    models.QueryRequest(query=vector, score_threshold=self.invalidate_similarity, limit=256)
+                    for vector in new_vectors
+                ],
+            )
+            stale.update(point.id for response in responses for point in response.points)
+        return stale
+
+    async def invalidate(self, changed_source_ids: List[str], new_vectors: List[List[float]]) -> int:
+        """
+        Drops the answers made stale by a knowledge base update: those citing a
+        source in `changed_source_ids`, and those whose query is close to one of
+        `new_vectors` (dense embeddings of the newly stored summaries).
+        Returns the number of answers dropped.
+        """
+        await asyncio.to_thread(self._ensure_collection)
+        with qdrant_latency.time(operation="semantic_cache_invalidate"):
+            stale = await asyncio.to_thread(self._stale_ids, changed_source_ids, new_vectors)
+            if stale:
+                await asyncio.to_thread(
+                    get_qdrant_client().delete,
+                    collection_name=self.collection_name,
+                    points_selector=models.PointIdsList(points=list(stale)),
+                )
+        self.stats["invalidations"] += len(stale)
+        return len(stale)
+
+    def hit_rate(self) -> float:
+        total = self.stats["hits"] + self.stats["misses"]
+        return self.stats["hits"] / total if total else 0.0
+
+
+semantic_cache = SemanticCache(
+    SEMANTIC_CACHE_COLLECTION_NAME, SEMANTIC_CACHE_THRESHOLD, SEMANTIC_CACHE_TTL, SEMANTIC_CACHE_INVALIDATE_SIMILARITY
+)
+
+
+def _semantic_cache_samples():
+    for event, value in semantic_cache.stats.items():
+        yield "ai_coach_semantic_cache_events_total", "Semantic cache events since startup.", {"event": event}, value
+    yield "ai_coach_semantic_cache_hit_rate", "Semantic cache hit rate since startup.", {}, semantic_cache.hit_rate()
+
+
+registry.register_collector(_semantic_cache_samples)
@@ -1,27 +1,210 @@
 import os
+import threading
 from dotenv import load_dotenv
-from langchain_google_genai import ChatGoogleGenerativeAI
-import os
-from dotenv import load_dotenv
-from langchain_huggingface import HuggingFaceEmbeddings
-from langchain_qdrant import FastEmbedSparse
 
 
 load_dotenv()
-os.environ["GOOGLE_API_KEY"] = os.getenv('GG_API_KEY')
-
-llm = ChatGoogleGenerativeAI(
-    model="gemini-2.0-flash",
-    temperature=1.0,
-    max_retries=2,
-)
 
 QDRANT_URL = os.getenv("QDRANT_URL")
 QDRANT_COLLECTION_NAME = "ai_coach_collection"
 DENSE_VECTOR_DIM = 1024 
 DENSE_VECTOR_NAME = "dense_vector"
 SPARSE_VECTOR_NAME = "sparse_vector"
+# One of the profiles in src/vectordb/profiles.py; search rescoring follows it.
+QDRANT_COLLECTION_PROFILE = os.getenv("QDRANT_COLLECTION_PROFILE", "default")
+QUANTIZATION_OVERSAMPLING = float(os.getenv("QUANTIZATION_OVERSAMPLING", "2.0"))
+
+RETRIEVAL_K = int(os.getenv("RETRIEVAL_K", "3"))
+# "rrf" scores only reflect rank; "dbsf" scores are normalised within each query.
+# Neither is an absolute relevance score, which is why GRADER_MODE=score grades
+# on the dense cosine similarity instead.
+RETRIEVAL_FUSION = os.getenv("RETRIEVAL_FUSION", "rrf").lower()
+RETRIEVAL_PREFETCH_LIMIT = int(os.getenv("RETRIEVAL_PREFETCH_LIMIT", "20"))
+RETRIEVAL_SCORE_THRESHOLD = float(os.environ["RETRIEVAL_SCORE_THRESHOLD"]) if "RETRIEVAL_SCORE_THRESHOLD" in os.environ else None
+
+# "summary" searches the stored summaries; "chunks" searches stored source text
+# chunks (see STORE_SOURCE_CHUNKS) and returns the summaries of the best sources.
+RETRIEVAL_MODE = os.getenv("RETRIEVAL_MODE", "summary")
+STORE_SOURCE_CHUNKS = os.getenv("STORE_SOURCE_CHUNKS", "false").lower() == "true"
+CHUNK_SIZE = int(os.getenv("CHUNK_SIZE", "1000"))
+CHUNK_OVERLAP = int(os.getenv("CHUNK_OVERLAP", "150"))
+
+# "llm", "reranker" (cross-encoder score) or "score" (dense cosine similarity of
+# the query and the document); the thresholds apply to the two local modes.
+GRADER_MODE = os.getenv("GRADER_MODE", "llm")
+RERANKER_MODEL = os.getenv("RERANKER_MODEL", "BAAI/bge-reranker-v2-m3")
+GRADER_RELEVANT_THRESHOLD = float(os.getenv("GRADER_RELEVANT_THRESHOLD", "0.7"))
+GRADER_IRRELEVANT_THRESHOLD = float(os.getenv("GRADER_IRRELEVANT_THRESHOLD", "0.3"))
+
+# "llm" asks the LLM for every route; "embedding" matches the query against labeled
+# prototype queries and asks the LLM only when the best match is weak or ambiguous.
+ROUTER_MODE = os.getenv("ROUTER_MODE", "llm")
+ROUTER_MIN_SIMILARITY = float(os.getenv("ROUTER_MIN_SIMILARITY", "0.5"))
+ROUTER_MIN_MARGIN = float(os.getenv("ROUTER_MIN_MARGIN", "0.05"))
+
+MAX_SEARCH_ROUNDS = int(os.getenv("MAX_SEARCH_ROUNDS", "3"))
+SEARCH_TIME_BUDGET = float(os.getenv("SEARCH_TIME_BUDGET", "120"))
+SEARCH_TOKEN_BUDGET = int(os.getenv("SEARCH_TOKEN_BUDGET", "60000"))
+
+WEB_SEARCH_RESULTS = int(os.getenv("WEB_SEARCH_RESULTS", "3"))
+WEB_PROBE_CONCURRENCY = int(os.getenv("WEB_PROBE_CONCURRENCY", "6"))
+# "auto" picks selectolax, then lxml, then BeautifulSoup, whichever is installed.
+HTML_EXTRACTOR = os.getenv("HTML_EXTRACTOR", "auto").lower()
+WEB_CONTEXT_MAX_TOKENS = int(os.getenv("WEB_CONTEXT_MAX_TOKENS", "3000"))
+WEB_PROCESS_CONCURRENCY = int(os.getenv("WEB_PROCESS_CONCURRENCY", "5"))
+WEB_PROCESS_DEADLINE = float(os.getenv("WEB_PROCESS_DEADLINE", "30"))
+# "api" queries the Atom export API; "html" scrapes the arxiv.org search page.
+ARXIV_SEARCH_MODE = os.getenv("ARXIV_SEARCH_MODE", "api").lower()
+ARXIV_PROCESS_CONCURRENCY = int(os.getenv("ARXIV_PROCESS_CONCURRENCY", "3"))
+ARXIV_PROCESS_DEADLINE = float(os.getenv("ARXIV_PROCESS_DEADLINE", "60"))
+PDF_MAX_PAGES = int(os.getenv("PDF_MAX_PAGES", "5"))
+PDF_MAX_CHARS = int(os.getenv("PDF_MAX_CHARS", "20000"))
+BRANCH_TIME_BUDGET = float(os.getenv("BRANCH_TIME_BUDGET", "45"))
+PARSE_WORKERS = int(os.getenv("PARSE_WORKERS", str(os.cpu_count() or 1)))
+
+HTTP_TIMEOUT = float(os.getenv("HTTP_TIMEOUT", "10"))
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+HTTP_MAX_KEEPALIVE = int(os.getenv("HTTP_MAX_KEEPALIVE", "20"))
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30"))
+# Only takes effect when the optional `h2` package is installed.
+HTTP2_ENABLED = os.getenv("HTTP2_ENABLED", "true").lower() == "true"
+HTTP_PER_HOST_CONCURRENCY = int(os.getenv("HTTP_PER_HOST_CONCURRENCY", "6"))
+HTTP_MAX_RETRIES = int(os.getenv("HTTP_MAX_RETRIES", "3"))
+HTTP_BACKOFF_BASE = float(os.getenv("HTTP_BACKOFF_BASE", "0.5"))
+HTTP_BACKOFF_MAX = float(os.getenv("HTTP_BACKOFF_MAX", "10"))
+# Comma-separated "host=seconds" minimum spacing between requests to a host (and its
+# subdomains). arXiv asks API clients to wait 3 seconds between calls.
+HTTP_HOST_MIN_INTERVAL = {
+    host.strip(): float(seconds)
+    for host, _, seconds in (
+        pair.partition("=") for pair in os.getenv("HTTP_HOST_MIN_INTERVAL", "arxiv.org=1,export.arxiv.org=3").split(",")
+    )
+    if host.strip() and seconds.strip()
+}
+
+CONTENT_CACHE_ENABLED = os.getenv("CONTENT_CACHE_ENABLED", "true").lower() == "true"
+CONTENT_CACHE_DIR = os.getenv("CONTENT_CACHE_DIR", ".cache/content")
+CONTENT_CACHE_TTL = float(os.getenv("CONTENT_CACHE_TTL", str(7 * 24 * 3600)))
+CONTENT_CACHE_MAX_BYTES = int(os.getenv("CONTENT_CACHE_MAX_BYTES", str(512 * 1024 * 1024)))
+
+SEMANTIC_CACHE_ENABLED = os.getenv("SEMANTIC_CACHE_ENABLED", "true").lower() == "true"
+SEMANTIC_CACHE_COLLECTION_NAME = "ai_coach_semantic_cache"
+SEMANTIC_CACHE_THRESHOLD = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.92"))
+SEMANTIC_CACHE_TTL = float(os.getenv("SEMANTIC_CACHE_TTL", str(24 * 3600)))
+# Cached answers whose query is at least this similar to a newly stored summary are dropped.
+SEMANTIC_CACHE_INVALIDATE_SIMILARITY = float(os.getenv("SEMANTIC_CACHE_INVALIDATE_SIMILARITY", "0.6"))
+
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true"
+# "sqlite" persists responses across restarts and workers; "memory" is a per-process LRU.
+LLM_CACHE_BACKEND = os.getenv("LLM_CACHE_BACKEND", "sqlite")
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", ".cache/llm.sqlite3")
+LLM_CACHE_TTL = float(os.getenv("LLM_CACHE_TTL", str(7 * 24 * 3600)))
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "10000"))
+# Prompt templates whose responses may be reused for identical inputs.
+LLM_CACHE_TEMPLATES = [
+    t.strip() for t in os.getenv("LLM_CACHE_TEMPLATES", "rewrite,router,web_summary,arxiv_summary").split(",") if t.strip()
+]
+
+# Per-socket outbound buffer for streamed events; token events are dropped while it is full.
+WS_SEND_QUEUE_SIZE = int(os.getenv("WS_SEND_QUEUE_SIZE", "256"))
+WS_SEND_TIMEOUT = float(os.getenv("WS_SEND_TIMEOUT", "10"))
+# Prompt templates whose tokens are streamed to the client as they are generated.
+WS_STREAM_TEMPLATES = [t.strip() for t in os.getenv("WS_STREAM_TEMPLATES", "web_summary,arxiv_summary").split(",") if t.strip()]
+
+WARM_UP_ON_STARTUP = os.getenv("WARM_UP_ON_STARTUP", "true").lower() == "true"
+PRELOAD_GRAPH_VARIANTS = [v.strip() for v in os.getenv("PRELOAD_GRAPH_VARIANTS", "default").split(",") if v.strip()]
+
+EMBED_BATCHING_ENABLED = os.getenv("EMBED_BATCHING_ENABLED", "true").lower() == "true"
+EMBED_BATCH_SIZE = int(os.getenv("EMBED_BATCH_SIZE", "64"))
+EMBED_BATCH_WAIT_MS = float(os.getenv("EMBED_BATCH_WAIT_MS", "10"))
+
+# Models and clients are built on first use rather than at import time, so that
+# importing src.config (the app, the setup script, tooling) stays cheap.
+_instances = {}
+_instances_lock = threading.RLock()
+
+
+def _lazy(name: str, factory):
+    instance = _instances.get(name)
+    if instance is None:
+        with _instances_lock:
+            instance = _instances.get(name)
+            if instance is None:
+                instance = factory()
+                _instances[name] = instance
+    return instance
+
+
+def _create_llm():
+    from langchain_google_genai import ChatGoogleGenerativeAI
+
+    return ChatGoogleGenerativeAI(
+        model="gemini-2.0-flash",
+        temperature=1.0,
+        max_retries=2,
+        google_api_key=os.getenv("GG_API_KEY"),
+    )
+
+
+def _create_embedding_model():
+    from langchain_huggingface import HuggingFaceEmbeddings
+    from .vectordb.batching import BatchedEmbeddings
+
+    model = HuggingFaceEmbeddings(model_name="BAAI/bge-m3")
+    if EMBED_BATCHING_ENABLED:
+        model = BatchedEmbeddings(model, EMBED_BATCH_SIZE, EMBED_BATCH_WAIT_MS / 1000)
+    return model
+
+
+def _create_sparse_embedding_model():
+    from langchain_qdrant import FastEmbedSparse
+    from .vectordb.batching import BatchedSparseEmbeddings
+
+    model = FastEmbedSparse(model_name="Qdrant/bm25")
+    if EMBED_BATCHING_ENABLED:
+        model = BatchedSparseEmbeddings(model, EMBED_BATCH_SIZE, EMBED_BATCH_WAIT_MS / 1000)
+    return model
+
+
+def _create_reranker():
+    from sentence_transformers import CrossEncoder
+
+    return CrossEncoder(RERANKER_MODEL)
+
+
+def get_llm():
+    """Returns the shared chat model."""
+    return _lazy("llm", _create_llm)
+
+
+def get_embedding_model():
+    """Returns the shared dense embedding model (bge-m3)."""
+    return _lazy("embedding_model", _create_embedding_model)
+
+
+def get_sparse_embedding_model():
+    """Returns the shared sparse embedding model (BM25)."""
+    return _lazy("sparse_embedding_model", _create_sparse_embedding_model)
+
+
+def get_reranker():
+    """Returns the shared cross-encoder used by the local document grader."""
+    return _lazy("reranker", _create_reranker)
+
+
+def override_instances(**instances) -> None:
+    """
+    Replaces shared models by name (llm, embedding_model, sparse_embedding_model,
+    reranker), e.g. with deterministic fakes for offline benchmarks.
+    """
+    with _instances_lock:
+        _instances.update(instances)
 
-embedding_model = HuggingFaceEmbeddings(model_name="BAAI/bge-m3")
-sparse_embedding_model = FastEmbedSparse(model_name="Qdrant/bm25")
 
+def warm_up() -> None:
+    """Loads the models ahead of the first request and runs one embedding to initialise them."""
+    get_llm()
+    get_embedding_model().embed_query("warm up")
+    get_sparse_embedding_model().embed_query("warm up")
+    if GRADER_MODE == "reranker":
+        get_reranker().predict([("warm up", "warm up")])
@@ -0,0 +1,295 @@
+import asyncio
+import random
+import threading
+import time
+import weakref
+from collections import defaultdict, deque
+from urllib.parse import urlsplit
+
+import httpx
+
+from .metrics import registry
+from .config import (
+    HTTP_TIMEOUT,
+    HTTP_MAX_CONNECTIONS,
+    HTTP_MAX_KEEPALIVE,
+    HTTP_KEEPALIVE_EXPIRY,
+    HTTP2_ENABLED,
+    HTTP_PER_HOST_CONCURRENCY,
+    HTTP_MAX_RETRIES,
+    HTTP_BACKOFF_BASE,
+    HTTP_BACKOFF_MAX,
+    HTTP_HOST_MIN_INTERVAL,
+)
+
+DEFAULT_TIMEOUT = HTTP_TIMEOUT
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+HTTP2 = HTTP2_ENABLED and _http2_available()
+
+
+class HttpMetrics:
+    """Per-host counters for outbound requests: attempts, retries, new connections and latency."""
+
+    def __init__(self, window: int = 512):
+        self.window = window
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self._hosts = defaultdict(lambda: {
+                "requests": 0,
+                "errors": 0,
+                "retries": 0,
+                "connections": 0,
+                "latencies": deque(maxlen=self.window),
+            })
+
+    def record(self, host: str, latency: float, error: bool = False) -> None:
+        with self._lock:
+            stats = self._hosts[host]
+            stats["requests"] += 1
+            stats["errors"] += error
+            stats["latencies"].append(latency)
+
+    def retry(self, host: str) -> None:
+        with self._lock:
+            self._hosts[host]["retries"] += 1
+
+    def connection_opened(self, host: str) -> None:
+        with self._lock:
+            self._hosts[host]["connections"] += 1
+
+    def summary(self) -> dict:
+        """Per-host stats; `reuse_rate` is the share of requests served on an already open connection."""
+        with self._lock:
+            summary = {}
+            for host, stats in self._hosts.items():
+                latencies = sorted(stats["latencies"])
+                requests = stats["requests"]
+                summary[host] = {
+                    "requests": requests,
+                    "errors": stats["errors"],
+                    "retries": stats["retries"],
+                    "connections": stats["connections"],
+                    "reuse_rate": max(0.0, 1 - stats["connections"] / requests) if requests else 0.0,
+                    "latency_avg_s": sum(latencies) / len(latencies) if latencies else 0.0,
+                    "latency_p50_s": latencies[len(latencies) // 2] if latencies else 0.0,
+                    "latency_p95_s": latencies[int(len(latencies) * 0.95)] if latencies else 0.0,
+                }
+            return summary
+
+
+class HostRateLimiter:
+    """
+    Spaces requests to the same host at least `intervals[host]` seconds apart.
+    A configured host also covers its subdomains; the most specific entry wins.
+    """
+
+    def __init__(self, intervals: dict[str, float]):
+        self.intervals = intervals
+        self._next_slot = {}
+        self._lock = threading.Lock()
+
+    def interval(self, host: str) -> float:
+        matches = [h for h in self.intervals if host == h or host.endswith("." + h)]
+        return self.intervals[max(matches, key=len)] if matches else 0.0
+
+    def reserve(self, host: str) -> float:
+        """Books the next free slot for `host` and returns how long to wait for it."""
+        interval = self.interval(host)
+        if not interval:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, 0.0))
+            self._next_slot[host] = slot + interval
+            return slot - now
+
+
+http_metrics = HttpMetrics()
+rate_limiter = HostRateLimiter(HTTP_HOST_MIN_INTERVAL)
+
+
+# Transport for clients created from now on; None means real network I/O.
+_transport: httpx.AsyncBaseTransport | httpx.BaseTransport | None = None
+
+
+def use_transport(transport: httpx.AsyncBaseTransport | httpx.BaseTransport | None) -> None:
+    """
+    Routes outbound requests through `transport` (e.g. an httpx.MockTransport
+    serving recorded fixtures) by dropping the current clients. Pass None to go
+    back to the network.
+    """
+    global _transport, _sync_client
+    _transport = transport
+    _loop_state.clear()
+    with _sync_lock:
+        _sync_client = None
+
+
+def _client_options() -> dict:
+    return {
+        "transport": _transport,
+        "timeout": DEFAULT_TIMEOUT,
+        "follow_redirects": True,
+        "http2": HTTP2,
+        "limits": httpx.Limits(
+            max_connections=HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=HTTP_MAX_KEEPALIVE,
+            keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+        ),
+    }
+
+
+def _retry_delay(attempt: int, response: httpx.Response | None = None) -> float:
+    """Honours Retry-After when the server sends seconds, otherwise exponential backoff with full jitter."""
+    if response is not None:
+        retry_after = response.headers.get("Retry-After", "")
+        if retry_after.isdigit():
+            return min(float(retry_after), HTTP_BACKOFF_MAX)
+    return random.uniform(0, min(HTTP_BACKOFF_MAX, HTTP_BACKOFF_BASE * 2 ** attempt))
+
+
+# httpx async connections belong to the event loop that opened them, so each loop
+# (the server's, or one started by a tool's sync entry point) gets its own pool.
+_loop_state: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict]" = weakref.WeakKeyDictionary()
+
+
+def _state_for_running_loop() -> dict:
+    loop = asyncio.get_running_loop()
+    state = _loop_state.get(loop)
+    if state is None or state["client"].is_closed:
+        state = {"client": httpx.AsyncClient(**_client_options()), "semaphores": {}}
+        _loop_state[loop] = state
+    return state
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """Returns the pooled async HTTP client of the running event loop."""
+    return _state_for_running_loop()["client"]
+
+
+async def request(method: str, url: str, retries: int = HTTP_MAX_RETRIES, **kwargs) -> httpx.Response:
+    """
+    Sends a request through the pooled async client, with per-host concurrency
+    and rate limits, and retries on transport errors and 429/5xx responses.
+    The last response is returned as-is; callers decide how to treat error statuses.
+    """
+    state = _state_for_running_loop()
+    host = urlsplit(url).hostname or ""
+    semaphore = state["semaphores"].setdefault(host, asyncio.Semaphore(HTTP_PER_HOST_CONCURRENCY))
+
+    async def trace(event: str, info: dict) -> None:
+        if event == "connection.connect_tcp.started":
+            http_metrics.connection_opened(host)
+
+    for attempt in range(retries + 1):
+        async with semaphore:
+            await asyncio.sleep(rate_limiter.reserve(host))
+            start = time.perf_counter()
+            try:
+                response = await state["client"].request(method, url, extensions={"trace": trace}, **kwargs)
+            except httpx.TransportError:
+                http_metrics.record(host, time.perf_counter() - start, error=True)
+                if attempt == retries:
+                    raise
+                delay = _retry_delay(attempt)
+            else:
+                http_metrics.record(host, time.perf_counter() - start, error=response.status_code >= 400)
+                if response.status_code not in RETRY_STATUSES or attempt == retries:
+                    return response
+                delay = _retry_delay(attempt, response)
+        http_metrics.retry(host)
+        await asyncio.sleep(delay)
+
+
+async def get(url: str, **kwargs) -> httpx.Response:
+    return await request("GET", url, **kwargs)
+
+
+_sync_client: httpx.Client | None = None
+_sync_lock = threading.Lock()
+_sync_semaphores: dict[str, threading.BoundedSemaphore] = {}
+
+
+def get_client() -> httpx.Client:
+    """Returns the pooled sync HTTP client, for code paths that cannot await."""
+    global _sync_client
+    with _sync_lock:
+        if _sync_client is None or _sync_client.is_closed:
+            _sync_client = httpx.Client(**_client_options())
+        return _sync_client
+
+
+def request_sync(method: str, url: str, retries: int = HTTP_MAX_RETRIES, **kwargs) -> httpx.Response:
+    """Blocking counterpart of `request`, sharing its limits, retries and metrics."""
+    client = get_client()
+    host = urlsplit(url).hostname or ""
+    with _sync_lock:
+        semaphore = _sync_semaphores.setdefault(host, threading.BoundedSemaphore(HTTP_PER_HOST_CONCURRENCY))
+
+    def trace(event: str, info: dict) -> None:
+        if event == "connection.connect_tcp.started":
+            http_metrics.connection_opened(host)
+
+    for attempt in range(retries + 1):
+        with semaphore:
+            time.sleep(rate_limiter.reserve(host))
+            start = time.perf_counter()
+            try:
+                response = client.request(method, url, extensions={"trace": trace}, **kwargs)
+            except httpx.TransportError:
+                http_metrics.record(host, time.perf_counter() - start, error=True)
+                if attempt == retries:
+                    raise
+                delay = _retry_delay(attempt)
+            else:
+                http_metrics.record(host, time.perf_counter() - start, error=response.status_code >= 400)
+                if response.status_code not in RETRY_STATUSES or attempt == retries:
+                    return response
+                delay = _retry_delay(attempt, response)
+        http_metrics.retry(host)
+        time.sleep(delay)
+
+
+def get_sync(url: str, **kwargs) -> httpx.Response:
+    return request_sync("GET", url, **kwargs)
+
+
+async def aclose_async_client() -> None:
+    """Closes the running loop's async client and the shared sync client."""
+    global _sync_client
+    loop = asyncio.get_running_loop()
+    state = _loop_state.pop(loop, None)
+    if state is not None:
+        await state["client"].aclose()
+    with _sync_lock:
+        if _sync_client is not None:
+            _sync_client.close()
+            _sync_client = None
+
+
+def _http_samples():
+    for host, stats in http_metrics.summary().items():
+        labels = {"host": host}
+        yield "ai_coach_http_requests_total", "Outbound HTTP attempts since startup.", labels, stats["requests"]
+        yield "ai_coach_http_errors_total", "Outbound HTTP attempts that failed or returned >= 400.", labels, stats["errors"]
+        yield "ai_coach_http_retries_total", "Outbound HTTP retries since startup.", labels, stats["retries"]
+        yield "ai_coach_http_connections_total", "New outbound HTTP connections since startup.", labels, stats["connections"]
+        yield "ai_coach_http_connection_reuse_rate", "Share of outbound HTTP attempts on a reused connection.", labels, stats["reuse_rate"]
+        yield "ai_coach_http_latency_p50_seconds", "Median outbound HTTP latency over the recent window.", labels, stats["latency_p50_s"]
+        yield "ai_coach_http_latency_p95_seconds", "95th percentile outbound HTTP latency over the recent window.", labels, stats["latency_p95_s"]
+
+
+registry.register_collector(_http_samples)
@@ -0,0 +1,208 @@
+import functools
+import inspect
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, List, Tuple
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+
+def _escape(value) -> str:
+    """Escapes a label value as the Prometheus text format requires."""
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels_text(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Counter:
+    """Monotonic counter with optional labels."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labels: Iterable[str] = ()):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = tuple(str(labels[name]) for name in self.labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            return [f"{self.name}{_labels_text(self.labels, key)} {value}" for key, value in self._values.items()]
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {",".join(key) or "total": value for key, value in self._values.items()}
+
+
+class Histogram:
+    """Cumulative-bucket histogram with optional labels, as Prometheus expects."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labels: Iterable[str] = (), buckets: Iterable[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[Tuple[str, ...], dict] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels) -> None:
+        key = tuple(str(labels[name]) for name in self.labels)
+        with self._lock:
+            series = self._series.setdefault(key, {"counts": [0] * len(self.buckets), "sum": 0.0, "count": 0})
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series["counts"][i] += 1
+            series["sum"] += value
+            series["count"] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def samples(self) -> List[str]:
+        lines = []
+        with self._lock:
+            for key, series in self._series.items():
+                for bound, count in zip(self.buckets, series["counts"]):
+                    le = 'le="%s"' % bound
+                    lines.append(f"{self.name}_bucket{_labels_text(self.labels, key, le)} {count}")
+                le = 'le="+Inf"'
+                lines.append(f"{self.name}_bucket{_labels_text(self.labels, key, le)} {series['count']}")
+                lines.append(f"{self.name}_sum{_labels_text(self.labels, key)} {series['sum']}")
+                lines.append(f"{self.name}_count{_labels_text(self.labels, key)} {series['count']}")
+        return lines
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                ",".join(key) or "total": {
+                    "count": series["count"],
+                    "sum_s": series["sum"],
+                    "avg_s": series["sum"] / series["count"] if series["count"] else 0.0,
+                }
+                for key, series in self._series.items()
+            }
+
+
+class MetricsRegistry:
+    """
+    In-process metrics rendered in the Prometheus text format. Besides its own
+    counters and histograms it polls collectors, which report stats kept
+    elsewhere (HTTP client, caches) at scrape time. Collector samples named
+    `*_total` are running counts and typed as counters; the rest are gauges.
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, Counter | Histogram] = {}
+        self._collectors: List[Callable[[], Iterable[Tuple[str, str, Dict[str, str], float]]]] = []
+
+    def counter(self, name: str, help: str, labels: Iterable[str] = ()) -> Counter:
+        return self._metrics.setdefault(name, Counter(name, help, labels))
+
+    def histogram(self, name: str, help: str, labels: Iterable[str] = (), buckets: Iterable[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._metrics.setdefault(name, Histogram(name, help, labels, buckets))
+
+    def register_collector(self, collector: Callable[[], Iterable[Tuple[str, str, Dict[str, str], float]]]) -> None:
+        """`collector()` yields (name, help, labels, value) samples; see the class docstring for types."""
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        collected: Dict[str, Tuple[str, List[str]]] = {}
+        for collector in self._collectors:
+            try:
+                samples = list(collector())
+            except Exception as e:
+                print(f"[WARN] Metrics collector failed: {e}")
+                continue
+            for name, help, labels, value in samples:
+                text = _labels_text(tuple(labels), tuple(labels.values()))
+                collected.setdefault(name, (help, []))[1].append(f"{name}{text} {value}")
+        for name, (help, samples) in collected.items():
+            lines.append(f"# HELP {name} {help}")
+            lines.append(f"# TYPE {name} {'counter' if name.endswith('_total') else 'gauge'}")
+            lines.extend(samples)
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+node_latency = registry.histogram(
+    "ai_coach_node_duration_seconds", "Wall time of each agent graph node.", labels=("node",)
+)
+llm_calls = registry.counter("ai_coach_llm_calls_total", "LLM calls by prompt template.", labels=("template",))
+llm_tokens = registry.counter(
+    "ai_coach_llm_tokens_total", "LLM tokens by prompt template and direction.", labels=("template", "direction")
+)
+llm_latency = registry.histogram(
+    "ai_coach_llm_duration_seconds", "LLM call latency by prompt template.", labels=("template",)
+)
+llm_cache_lookups = registry.counter(
+    "ai_coach_llm_cache_lookups_total", "LLM response cache lookups by prompt template and result.",
+    labels=("template", "result"),
+)
+llm_cache_saved_tokens = registry.counter(
+    "ai_coach_llm_cache_saved_tokens_total", "LLM tokens not spent thanks to cache hits, by prompt template.",
+    labels=("template",),
+)
+qdrant_latency = registry.histogram(
+    "ai_coach_qdrant_duration_seconds", "Qdrant call latency by operation.", labels=("operation",)
+)
+router_decisions = registry.counter(
+    "ai_coach_router_decisions_total", "Routing decisions by the method that made them.", labels=("method",)
+)
+search_rounds = registry.counter(
+    "ai_coach_search_rounds_total", "External search loop iterations (one per add_to_db run)."
+)
+rounds_per_request = registry.histogram(
+    "ai_coach_search_rounds_per_request", "External search rounds a request needed before answering.",
+    buckets=(0, 1, 2, 3, 4, 5, 8),
+)
+
+
+def record_llm_usage(template: str, message, duration: float) -> None:
+    """Counts one LLM call and the tokens its response reports."""
+    llm_calls.inc(template=template)
+    llm_latency.observe(duration, template=template)
+    usage = getattr(message, "usage_metadata", None) or {}
+    for direction in ("input", "output"):
+        tokens = usage.get(f"{direction}_tokens", 0)
+        if tokens:
+            llm_tokens.inc(tokens, template=template, direction=direction)
+
+
+def timed_node(name: str, node: Callable) -> Callable:
+    """Wraps a graph node so its wall time is recorded under `name`."""
+    if inspect.iscoroutinefunction(node):
+        @functools.wraps(node)
+        async def timed(*args, **kwargs):
+            with node_latency.time(node=name):
+                return await node(*args, **kwargs)
+    else:
+        @functools.wraps(node)
+        def timed(*args, **kwargs):
+            with node_latency.time(node=name):
+                return node(*args, **kwargs)
+    return timed
@@ -21,6 +21,18 @@ REWRITE_PROMPT = SystemMessage(
     """
 )
 
+REFORMULATE_PROMPT_TEMPLATE = PromptTemplate.from_template(
+    """
+    You are a multilingual query optimization expert. Earlier search queries for the user's question did not find relevant material.
+    Write ONE new search query for the same question using different wording: synonyms, a broader or more specific phrasing, or the other language (Vietnamese or English) where it fits the topic.
+    Do not repeat any of the previous queries.
+    User's question: {user_query}
+    Previous queries:
+    {previous_queries}
+    Your response must ONLY be the new query string, with no explanation or prefix.
+    """
+)
+
 ROUTER_PROMPT_TEMPLATE = PromptTemplate.from_template(
     """
     You are an intelligent routing agent. Classify the user's query for either 'web_search' (general topics) or 'arxiv_search' (scientific/academic research). For 'arxiv_search', specify the field: 'title', 'author', 'abstract', or 'all'.
@@ -88,14 +100,18 @@ DOCUMENT_GRADER_PROMPT_TEMPLATE = PromptTemplate.from_template(
 
 STEP_DESCRIPTIONS = {
     "rewrite_query": "✍️ Optimizing query...",
+    "semantic_cache": "⚡ Checking previously answered questions...",
     "retrieve_from_db": "🔎 Searching internal knowledge base...",
-    "grade_documents": "⚖️ Grading document relevance...", 
-    "final_results": "✅ Preparing final answer...", 
+    "grade": "⚖️ Grading document relevance...",
+    "final": "✅ Preparing final answer...",
+    "reformulate_query": "🔁 Rewording the query for another search round...",
     "router": "🧭 Analyzing and routing for external search...",
+    "parallel_search": "🧭 Searching the web and ArXiv in parallel...",
     "web_search": "🌐 Searching the web...",
     "arxiv_search": "🔬 Searching ArXiv...",
-    "setup_loop": "⚙️ Preparing to process new information...",
-    "summarize_item": "📄 Summarizing new information...",
+    "process_web_results": "📄 Processing and summarizing web results...",
+    "process_arxiv_results": "📚 Processing and summarizing scientific documents...",
+    "merge_results": "⚙️ Preparing to process new information...",
     "add_to_db": "💾 Saving new information to database...",
 }
 
@@ -1,4 +1,5 @@
-from typing import TypedDict, List
+import operator
+from typing import Annotated, TypedDict, List
 from langchain_core.documents import Document
 from pydantic import BaseModel, Field
 
@@ -8,14 +9,26 @@ class GraphState(TypedDict):
     """
     user_query: str
     rewritten_query: str
+    previous_queries: List[str]
+    cache_hit: bool
+    search_round: int
+    started_at: float
+    token_usage: Annotated[int, operator.add]
     routing_decision: dict
     web_search_results: dict
     arxiv_search_results: dict
-    processed_results: List[str]
+    web_processed_results: List[dict]
+    arxiv_processed_results: List[dict]
+    search_deadline: float | None
+    processed_results: List[dict]
     db_add_status: str | None
+    db_added_count: int
+    db_add_counts: dict
     retrieved_documents: List[Document]
+    retrieved_scores: List[float]
     relevant_doc_ids: List[str] | None
     final_results: List[str]
+    final_scores: List[float]
 
 class GraphInput(TypedDict):
     """
@@ -31,6 +44,9 @@ class GraphOutput(TypedDict):
     user_query: str
     rewritten_query: str
     final_results: List[str]
+    final_scores: List[float]
+    cache_hit: bool
+    search_round: int
 
 
 class TranslationFeedbackRequest(BaseModel):
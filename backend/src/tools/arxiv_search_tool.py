@@ -1,9 +1,87 @@
+import asyncio
 from langchain_core.tools import BaseTool
-import requests
 from bs4 import BeautifulSoup
 import re
+import xml.etree.ElementTree as ET
+from io import BytesIO
 from typing import List, Dict, Any
 
+from ..http_client import get as http_get, get_sync as http_get_sync
+
+ATOM = "{http://www.w3.org/2005/Atom}"
+
+# Routing fields mapped to arXiv API search prefixes.
+API_FIELD_PREFIXES = {"all": "all", "title": "ti", "author": "au", "abstract": "abs"}
+# Words dropped before building an API query; everything else counts as a key term.
+STOPWORDS = {
+    "a", "about", "an", "and", "approach", "approaches", "are", "as", "at", "based", "by", "can", "do",
+    "does", "for", "from", "how", "in", "into", "is", "method", "methods", "of", "on", "or", "paper",
+    "papers", "research", "studies", "study", "technique", "techniques", "that", "the", "these", "this",
+    "to", "using", "via", "what", "which", "with", "work",
+}
+MAX_KEY_TERMS = 6
+
+
+def _pdf_link(abs_link: str) -> str:
+    return re.sub(r"/abs/", "/pdf/", abs_link, count=1)
+
+
+def _parse_results(content: bytes) -> List[Dict[str, Any]]:
+    """Extracts the paper entries from an arXiv search results page."""
+    soup = BeautifulSoup(content, 'html.parser')
+    results = []
+    for paper in soup.find_all("li", class_="arxiv-result"):
+        title = paper.find("p", class_="title").text.strip()
+        authors_p = paper.find("p", class_="authors")
+        authors = re.sub(r'^Authors:\s*', '', authors_p.text).strip()
+
+        abstract_span = paper.find("span", class_="abstract-full")
+        abstract = abstract_span.text.replace("△ Less", "").strip()
+
+        list_title = paper.find("p", class_="list-title")
+        link_tag = list_title.find("a")
+        link = link_tag["href"] if link_tag else "No link found"
+        pdf_tag = list_title.find("a", string="pdf")
+
+        results.append({
+            "title": title,
+            "authors": authors,
+            "abstract": abstract,
+            "link": link,
+            "pdf_link": pdf_tag["href"] if pdf_tag else _pdf_link(link),
+        })
+    return results
+
+
+def _parse_atom(content: bytes) -> List[Dict[str, Any]]:
+    """
+    Extracts the paper entries from an arXiv API Atom feed. The (already
+    downloaded) feed is walked with iterparse and each entry is cleared once
+    read, so only one entry's elements are kept at a time.
+    """
+    results = []
+    for _, entry in ET.iterparse(BytesIO(content), events=("end",)):
+        if entry.tag != f"{ATOM}entry":
+            continue
+        # Same form as the search page's links (https, no version), so a paper keeps its point ID across modes.
+        link = re.sub(r"v\d+$", "", (entry.findtext(f"{ATOM}id") or "").strip().replace("http://", "https://", 1))
+        # Malformed queries come back as a single entry pointing at the API error docs.
+        if "/api/errors" not in link:
+            pdf_link = next(
+                (l.get("href").replace("http://", "https://", 1) for l in entry.iterfind(f"{ATOM}link") if l.get("title") == "pdf"),
+                _pdf_link(link),
+            )
+            results.append({
+                "title": " ".join((entry.findtext(f"{ATOM}title") or "").split()),
+                "authors": ", ".join(
+                    (a.findtext(f"{ATOM}name") or "").strip() for a in entry.iterfind(f"{ATOM}author")
+                ),
+                "abstract": " ".join((entry.findtext(f"{ATOM}summary") or "").split()),
+                "link": link,
+                "pdf_link": pdf_link,
+            })
+        entry.clear()
+    return results
 
 
 class Arxiv_Search_Tool(BaseTool):
@@ -16,61 +94,100 @@ class Arxiv_Search_Tool(BaseTool):
         "machine learning, physics, and other academic topics from reliable sources. "
         "Provides titles, authors, abstracts, and links."
     )
-
+    mode: str = "api"
+    page_size: int = 25
+    base_url: str = "https://arxiv.org/search/"
+    api_url: str = "https://export.arxiv.org/api/query"
+
+    def _params(self, query: str, search_type: str, start: int) -> Dict[str, str]:
+        return {
+            "searchtype": search_type,
+            "query": query,
+            "abstracts": "show",
+            "order": "-announced_date_first",
+            "size": str(self.page_size),
+            "start": str(start)
+        }
+
+    def _api_searches(self, query: str, search_type: str) -> List[Dict[str, str]]:
+        """
+        Search queries to try in order until one returns papers; at most two,
+        since arXiv asks clients to space API calls out.
+
+        Titles and authors are looked up as a phrase first, then by all their
+        words. Other fields need all key terms (stopwords dropped), newest
+        first, and fall back to any key term ranked by relevance, so long
+        natural-language queries still find something.
+        """
+        prefix = API_FIELD_PREFIXES.get(search_type, "all")
+        words = re.findall(r"[\w-]+", query)
+        if prefix in ("ti", "au"):
+            phrase = " ".join(words) or query
+            searches = [{"search_query": f'{prefix}:"{phrase}"', "sortBy": "relevance"}]
+            if len(words) > 1:
+                searches.append({"search_query": " AND ".join(f"{prefix}:{w}" for w in words), "sortBy": "relevance"})
+            return searches
+        terms = [w for w in words if w.lower() not in STOPWORDS and len(w) > 1][:MAX_KEY_TERMS] or words or [query]
+        searches = [{"search_query": " AND ".join(f"{prefix}:{t}" for t in terms), "sortBy": "submittedDate"}]
+        if len(terms) > 1:
+            searches.append({"search_query": " OR ".join(f"{prefix}:{t}" for t in terms), "sortBy": "relevance"})
+        return searches
+
+    def _api_params(self, search: Dict[str, str], max_results: int) -> Dict[str, str]:
+        return {**search, "start": "0", "max_results": str(max_results), "sortOrder": "descending"}
 
     def _run(self, query: str, search_type: str,max_results: int = 3) -> List[Dict[str, Any]]:
         """Use the tool."""
-        page_size = 25 
-        base_url = "https://arxiv.org/search/"
+        clamped_max_results = min(max_results, 50)
+
+        if self.mode == "api":
+            papers = []
+            for search in self._api_searches(query, search_type):
+                response = http_get_sync(self.api_url, params=self._api_params(search, clamped_max_results))
+                response.raise_for_status()
+                papers = _parse_atom(response.content)
+                if papers:
+                    break
+            return papers[:clamped_max_results]
+
         results = []
         start = 0
+        while len(results) < clamped_max_results:
+            response = http_get_sync(self.base_url, params=self._params(query, search_type, start))
+            response.raise_for_status() 
+
+            papers = _parse_results(response.content)
+            if not papers:
+                break 
+            results.extend(papers)
+            start += self.page_size
+
+        return results[:clamped_max_results]
 
-        clamped_max_results = min(max_results, 50) 
+    async def _arun(self, query: str, search_type: str, max_results: int = 3) -> List[Dict[str, Any]]:
+        """Use the tool asynchronously."""
+        clamped_max_results = min(max_results, 50)
 
+        if self.mode == "api":
+            papers = []
+            for search in self._api_searches(query, search_type):
+                response = await http_get(self.api_url, params=self._api_params(search, clamped_max_results))
+                response.raise_for_status()
+                papers = await asyncio.to_thread(_parse_atom, response.content)
+                if papers:
+                    break
+            return papers[:clamped_max_results]
+
+        results = []
+        start = 0
         while len(results) < clamped_max_results:
-            params = {
-                "searchtype": search_type,
-                "query": query,
-                "abstracts": "show",
-                "order": "-announced_date_first",
-                "size": str(page_size),
-                "start": str(start)
-            }
-
-            try:
-                response = requests.get(base_url, params=params)
-                response.raise_for_status() 
-                soup = BeautifulSoup(response.content, 'html.parser')
-
-                papers = soup.find_all("li", class_="arxiv-result")
-                if not papers:
-                    break 
-
-                for paper in papers:
-                    if len(results) >= clamped_max_results:
-                        break
-
-                    title = paper.find("p", class_="title").text.strip()
-                    authors_p = paper.find("p", class_="authors")
-                    authors = re.sub(r'^Authors:\s*', '', authors_p.text).strip()
-                    
-                    abstract_span = paper.find("span", class_="abstract-full")
-                    abstract = abstract_span.text.replace("△ Less", "").strip()
-                    
-                    link_tag = paper.find("p", class_="list-title").find("a")
-                    link = link_tag["href"] if link_tag else "No link found"
-
-                    results.append({
-                        "title": title,
-                        "authors": authors,
-                        "abstract": abstract,
-                        "link": link
-                    })
-
-                start += page_size
-
-            except requests.RequestException as e:
-                raise e
+            response = await http_get(self.base_url, params=self._params(query, search_type, start))
+            response.raise_for_status()
 
-        return results[:clamped_max_results]
+            papers = await asyncio.to_thread(_parse_results, response.content)
+            if not papers:
+                break
+            results.extend(papers)
+            start += self.page_size
 
+        return results[:clamped_max_results]
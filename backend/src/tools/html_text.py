@@ -0,0 +1,130 @@
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Elements whose content is never article text.
+BOILERPLATE_TAGS = (
+    "script", "style", "noscript", "template", "svg", "iframe", "form", "button",
+    "nav", "header", "footer", "aside", "menu",
+)
+# Elements treated as text blocks; anything outside them is ignored.
+BLOCK_TAGS = ("h1", "h2", "h3", "h4", "h5", "h6", "p", "li", "blockquote", "pre", "td", "dd")
+HEADING_TAGS = {"h1", "h2", "h3", "h4", "h5", "h6"}
+
+MIN_BLOCK_CHARS = 30
+MAX_LINK_DENSITY = 0.5
+CHARS_PER_TOKEN = 4
+
+# A block is (tag, text, characters of link text inside it).
+Block = Tuple[str, str, int]
+Extractor = Callable[[bytes], Tuple[Optional[str], List[Block]]]
+
+
+def _selectolax_blocks(content: bytes) -> Tuple[Optional[str], List[Block]]:
+    # selectolax 1.0 removed the old Modest backend (selectolax.parser); Lexbor is the supported one.
+    from selectolax.lexbor import LexborHTMLParser
+
+    tree = LexborHTMLParser(content)
+    title_node = tree.css_first("title")
+    title = title_node.text(strip=True) if title_node is not None else None
+    tree.strip_tags(list(BOILERPLATE_TAGS))
+    root = tree.body or tree.root
+    if root is None:
+        return title, []
+    blocks = []
+    for node in root.css(",".join(BLOCK_TAGS)):
+        text = " ".join(node.text(separator=" ").split())
+        links = sum(len(a.text(strip=True)) for a in node.css("a"))
+        blocks.append((node.tag, text, links))
+    return title, blocks
+
+
+def _lxml_blocks(content: bytes) -> Tuple[Optional[str], List[Block]]:
+    from lxml import etree, html
+
+    try:
+        doc = html.fromstring(content)
+    except (etree.ParserError, ValueError):
+        return None, []
+    title = doc.findtext(".//title")
+    etree.strip_elements(doc, *BOILERPLATE_TAGS, with_tail=False)
+    blocks = []
+    for node in doc.iter(*BLOCK_TAGS):
+        text = " ".join(node.text_content().split())
+        links = sum(len(a.text_content().strip()) for a in node.iter("a"))
+        blocks.append((node.tag, text, links))
+    return title.strip() if title else None, blocks
+
+
+def _bs4_blocks(content: bytes) -> Tuple[Optional[str], List[Block]]:
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(content, "html.parser")
+    title = soup.title.text.strip() if soup.title is not None else None
+    for tag in soup(BOILERPLATE_TAGS):
+        tag.decompose()
+    blocks = []
+    for node in soup.find_all(BLOCK_TAGS):
+        text = " ".join(node.get_text(" ").split())
+        links = sum(len(a.get_text(strip=True)) for a in node.find_all("a"))
+        blocks.append((node.name, text, links))
+    return title, blocks
+
+
+# Extraction backends by name. Add new ones here rather than registering them at
+# runtime: extraction runs in spawned workers, which only see this module's state.
+EXTRACTORS: Dict[str, Extractor] = {
+    "selectolax": _selectolax_blocks,
+    "lxml": _lxml_blocks,
+    "bs4": _bs4_blocks,
+}
+
+
+def available_extractor() -> str:
+    """Name of the fastest installed backend (selectolax, then lxml, then BeautifulSoup)."""
+    for name, module in (("selectolax", "selectolax.lexbor"), ("lxml", "lxml.html")):
+        try:
+            __import__(module)
+        except ImportError:
+            continue
+        return name
+    return "bs4"
+
+
+def _is_content(tag: str, text: str, links: int) -> bool:
+    if not text:
+        return False
+    if tag in HEADING_TAGS:
+        return True
+    return len(text) >= MIN_BLOCK_CHARS and links / len(text) <= MAX_LINK_DENSITY
+
+
+def cap_tokens(text: str, max_tokens: Optional[int]) -> str:
+    """Cuts text to roughly `max_tokens` tokens, at a line break when one is close enough."""
+    if not max_tokens:
+        return text
+    limit = max_tokens * CHARS_PER_TOKEN
+    if len(text) <= limit:
+        return text
+    cut = text.rfind("\n", 0, limit)
+    return text[:cut if cut > limit // 2 else limit]
+
+
+def extract_html_text(content: bytes, extractor: str = "auto", max_tokens: Optional[int] = None) -> Tuple[Optional[str], str]:
+    """
+    Returns a page's title and its main text: boilerplate elements are dropped,
+    short or link-heavy blocks (menus, tag clouds, "related" lists) are skipped,
+    repeated blocks are kept once, and the result is capped at about `max_tokens`.
+
+    Runs inside the parsing process pool, so this module stays free of heavy imports.
+    """
+    if extractor == "auto":
+        extractor = available_extractor()
+    title, blocks = EXTRACTORS[extractor](content)
+    seen = set()
+    lines = []
+    for tag, text, links in blocks:
+        # Blocks come in document order, so a nested block directly follows its container.
+        if text in seen or (lines and text in lines[-1]) or not _is_content(tag, text, links):
+            continue
+        seen.add(text)
+        lines.append(text)
+    return title or None, cap_tokens("\n".join(lines), max_tokens)
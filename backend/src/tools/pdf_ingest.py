@@ -0,0 +1,27 @@
+import time
+from typing import Any, Dict
+
+from ..cache.content import fetch_content
+from ..workers import run_in_process_pool
+from .pdf_text import extract_pdf_text
+
+
+async def load_pdf(url: str, max_pages: int = 5, max_chars: int = 20000) -> Dict[str, Any]:
+    """
+    Downloads a PDF (through the content cache) and extracts its leading text in
+    the shared process pool. Returns the text together with per-stage timings in seconds.
+    """
+    start = time.perf_counter()
+    content = await fetch_content(url, timeout=30)
+    downloaded = time.perf_counter()
+
+    text = await run_in_process_pool(extract_pdf_text, content, max_pages, max_chars)
+    parsed = time.perf_counter()
+
+    return {
+        "url": url,
+        "text": text,
+        "bytes": len(content),
+        "download_s": downloaded - start,
+        "parse_s": parsed - downloaded,
+    }
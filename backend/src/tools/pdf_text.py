@@ -0,0 +1,23 @@
+import io
+
+from pypdf import PdfReader
+
+
+def extract_pdf_text(data: bytes, max_pages: int, max_chars: int) -> str:
+    """
+    Extracts text from the first pages of a PDF, stopping as soon as either the
+    page or the character limit is reached. pypdf resolves pages lazily, so the
+    rest of the document is never parsed.
+
+    Runs inside the parsing process pool, so this module stays free of heavy imports.
+    """
+    reader = PdfReader(io.BytesIO(data))
+    parts = []
+    total = 0
+    for index in range(min(max_pages, len(reader.pages))):
+        text = reader.pages[index].extract_text() or ""
+        parts.append(text)
+        total += len(text)
+        if total >= max_chars:
+            break
+    return " ".join(parts)[:max_chars]
@@ -1,33 +1,96 @@
+import asyncio
+from typing import Any, Dict, List, Optional
 from langchain_core.tools import BaseTool
 from googlesearch import search
-import requests
-from bs4 import BeautifulSoup
 
+from ..cache.content import fetch_content
+from ..workers import run_in_process_pool
+from .html_text import extract_html_text
 
-def google_scrape(url):
+
+async def extract_page(content: bytes, extractor: str = "auto", max_tokens: Optional[int] = None) -> tuple[Optional[str], str]:
+    """Extracts a page's title and main text in the shared process pool."""
+    return await run_in_process_pool(extract_html_text, content, extractor, max_tokens)
+
+
+async def probe_page(
+    url: str, timeout: float = 10, extractor: str = "auto", max_tokens: Optional[int] = None, retries: int = 0
+) -> Optional[Dict[str, str]]:
+    """
+    Fetches a page and returns its url, title and main text, or None if it has no usable title.
+    Probes do not retry by default: another candidate is cheaper than waiting on a dead one.
+    """
     try:
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()
-    except:
+        content = await fetch_content(url, timeout=timeout, retries=retries)
+        title, text = await extract_page(content, extractor, max_tokens)
+    except Exception:
         return None
-    soup = BeautifulSoup(response.content, "html.parser")
-    return soup.title.text if soup.title is not None else None
+    if not title:
+        return None
+    return {"url": url, "title": title, "text": text}
+
 
 class Web_Searcher_Tool(BaseTool):
     """A tool for searching the web using DuckDuckGo."""
     name: str = "web_searcher"
     description: str = "Useful for when you need to answer questions about current events or look up information on the web."
-    
+    max_results: int = 3
+    max_candidates: int = 100
+    probe_concurrency: int = 6
+    probe_timeout: float = 10
+    probe_retries: int = 0
+    extractor: str = "auto"
+    max_context_tokens: Optional[int] = None
+
     def _run(self, query: str):
         """Use the tool."""
-        done = 0
+        return asyncio.run(self._arun(query))
+
+    async def _arun(self, query: str) -> List[Dict[str, Any]]:
+        """
+        Use the tool asynchronously.
+
+        Candidate URLs are probed `probe_concurrency` at a time; the first
+        `max_results` successes are returned in search-rank order and any probes
+        still running are cancelled. A probe that is still running once later
+        ranks have succeeded often enough to fill the results is skipped, so
+        one slow page does not hold the others back. Each result keeps the
+        page text it fetched.
+        """
+        urls = search(query, num_results=self.max_candidates)
+        pending: Dict[int, asyncio.Task] = {}
+        finished: Dict[int, Optional[Dict[str, str]]] = {}
         results = []
-        for url in search(query, num_results=100):
-            res = google_scrape(url)
-            if res:
-                results.append({'url': url, 'title': res})
-                done += 1
-            if done == 3:
-                break
-        return results
+        next_rank = emitted = 0
+        exhausted = False
+        try:
+            while len(results) < self.max_results:
+                while not exhausted and len(pending) < self.probe_concurrency:
+                    url = await asyncio.to_thread(next, urls, None)
+                    if url is None:
+                        exhausted = True
+                        break
+                    pending[next_rank] = asyncio.create_task(
+                        probe_page(url, self.probe_timeout, self.extractor, self.max_context_tokens, self.probe_retries)
+                    )
+                    next_rank += 1
+                if not pending:
+                    break
 
+                done, _ = await asyncio.wait(pending.values(), return_when=asyncio.FIRST_COMPLETED)
+                for rank in [rank for rank, task in pending.items() if task in done]:
+                    finished[rank] = pending.pop(rank).result()
+                while emitted < next_rank and len(results) < self.max_results:
+                    if emitted in finished:
+                        page = finished.pop(emitted)
+                        if page:
+                            results.append(page)
+                    elif sum(1 for page in finished.values() if page) >= self.max_results - len(results):
+                        pending.pop(emitted).cancel()
+                    else:
+                        break
+                    emitted += 1
+        finally:
+            for task in pending.values():
+                task.cancel()
+        return results
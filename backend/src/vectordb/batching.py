@@ -0,0 +1,180 @@
+import asyncio
+import threading
+import time
+import weakref
+from collections import deque
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List
+
+from langchain_core.embeddings import Embeddings
+from langchain_qdrant import FastEmbedSparse, SparseEmbeddings, SparseVector
+
+from src.metrics import registry
+
+_batchers: "weakref.WeakSet[MicroBatcher]" = weakref.WeakSet()
+
+
+class MicroBatcher:
+    """
+    Collects embedding requests from concurrent callers and runs them as batched
+    calls on the one dedicated worker thread of a model.
+
+    Requests go to named lanes (e.g. "queries" and "documents"), each with its
+    own `embed_fn`, so one model never runs two forward passes at once. The
+    worker picks the first lane with waiting requests, in the order the lanes
+    were given (so queries can go first), keeps gathering that lane's requests
+    for up to `max_wait` seconds or until `max_batch_size` texts are queued,
+    calls its `embed_fn` once and hands each caller back its own slice.
+    """
+
+    def __init__(self, name: str, embed_fns: Dict[str, Callable[[List[str]], List[Any]]], max_batch_size: int, max_wait: float):
+        self.name = name
+        self.embed_fns = embed_fns
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.stats = {lane: {"requests": 0, "texts": 0, "batches": 0, "busy_s": 0.0} for lane in embed_fns}
+        self._pending: Dict[str, deque] = {lane: deque() for lane in embed_fns}
+        self._sizes = {lane: 0 for lane in embed_fns}
+        self._condition = threading.Condition()
+        self._worker = threading.Thread(target=self._run, name=f"embed-batcher-{name}", daemon=True)
+        self._worker.start()
+        _batchers.add(self)
+
+    def submit(self, lane: str, texts: List[str]) -> Future:
+        """Queues texts on `lane`; the future resolves to their vectors."""
+        future: Future = Future()
+        if not texts:
+            future.set_result([])
+            return future
+        with self._condition:
+            self._pending[lane].append((list(texts), future))
+            self._sizes[lane] += len(texts)
+            self._condition.notify()
+        return future
+
+    def _next_batch(self) -> tuple:
+        with self._condition:
+            while not any(self._pending.values()):
+                self._condition.wait()
+            lane = next(lane for lane, pending in self._pending.items() if pending)
+            deadline = time.monotonic() + self.max_wait
+            while self._sizes[lane] < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._condition.wait(remaining)
+
+            pending, size = [], 0
+            queued = self._pending[lane]
+            while queued and (not pending or size + len(queued[0][0]) <= self.max_batch_size):
+                item = queued.popleft()
+                pending.append(item)
+                size += len(item[0])
+            self._sizes[lane] -= size
+            return lane, pending
+
+    def _run(self) -> None:
+        while True:
+            lane, pending = self._next_batch()
+            texts = [text for item_texts, _ in pending for text in item_texts]
+            start = time.perf_counter()
+            try:
+                vectors = self.embed_fns[lane](texts)
+            except Exception as e:
+                for _, future in pending:
+                    future.set_exception(e)
+                continue
+            stats = self.stats[lane]
+            stats["busy_s"] += time.perf_counter() - start
+            stats["requests"] += len(pending)
+            stats["texts"] += len(texts)
+            stats["batches"] += 1
+
+            offset = 0
+            for item_texts, future in pending:
+                future.set_result(vectors[offset:offset + len(item_texts)])
+                offset += len(item_texts)
+
+    def summary(self, lane: str) -> dict:
+        """Returns batching efficiency and throughput figures for one lane."""
+        stats = self.stats[lane]
+        batches = stats["batches"] or 1
+        busy = stats["busy_s"] or float("inf")
+        return {
+            **stats,
+            "avg_batch_size": stats["texts"] / batches,
+            "texts_per_s": stats["texts"] / busy,
+        }
+
+
+class BatchedEmbeddings(Embeddings):
+    """
+    Dense embeddings whose calls are coalesced across sessions by one MicroBatcher.
+
+    Queries are batched through `embed_documents` as well, which is only correct
+    for models that encode queries and documents the same way (bge-m3 does).
+    Pass `batch_queries=False` for instruction-prefixed models.
+    """
+
+    def __init__(self, base: Embeddings, max_batch_size: int = 64, max_wait: float = 0.01, batch_queries: bool = True):
+        self.base = base
+        query_fn = base.embed_documents if batch_queries else (lambda texts: [base.embed_query(t) for t in texts])
+        self.batcher = MicroBatcher(
+            "dense", {"queries": query_fn, "documents": base.embed_documents}, max_batch_size, max_wait
+        )
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.batcher.submit("documents", texts).result()
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.batcher.submit("queries", [text]).result()[0]
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        return await asyncio.wrap_future(self.batcher.submit("documents", texts))
+
+    async def aembed_query(self, text: str) -> List[float]:
+        return (await asyncio.wrap_future(self.batcher.submit("queries", [text])))[0]
+
+
+class BatchedSparseEmbeddings(SparseEmbeddings):
+    """Sparse (FastEmbed) embeddings whose calls are coalesced across sessions by one MicroBatcher."""
+
+    def __init__(self, base: FastEmbedSparse, max_batch_size: int = 64, max_wait: float = 0.01):
+        self.base = base
+        self.batcher = MicroBatcher(
+            "sparse", {"queries": self._embed_queries, "documents": base.embed_documents}, max_batch_size, max_wait
+        )
+
+    def _embed_queries(self, texts: List[str]) -> List[SparseVector]:
+        # FastEmbed's query_embed accepts many queries at once; FastEmbedSparse only exposes one.
+        return [
+            SparseVector(indices=vector.indices.tolist(), values=vector.values.tolist())
+            for vector in self.base._model.query_embed(texts)
+        ]
+
+    def embed_documents(self, texts: List[str]) -> List[SparseVector]:
+        return self.batcher.submit("documents", texts).result()
+
+    def embed_query(self, text: str) -> SparseVector:
+        return self.batcher.submit("queries", [text]).result()[0]
+
+    async def aembed_documents(self, texts: List[str]) -> List[SparseVector]:
+        return await asyncio.wrap_future(self.batcher.submit("documents", texts))
+
+    async def aembed_query(self, text: str) -> SparseVector:
+        return (await asyncio.wrap_future(self.batcher.submit("queries", [text])))[0]
+
+
+def _batching_samples():
+    for batcher in list(_batchers):
+        for lane in batcher.stats:
+            summary = batcher.summary(lane)
+            labels = {"model": batcher.name, "lane": lane}
+            yield "ai_coach_embed_batch_requests_total", "Embedding requests served by the micro-batcher.", labels, summary["requests"]
+            yield "ai_coach_embed_batch_texts_total", "Texts embedded by the micro-batcher.", labels, summary["texts"]
+            yield "ai_coach_embed_batches_total", "Batched embedding calls run by the micro-batcher.", labels, summary["batches"]
+            yield "ai_coach_embed_batch_avg_size", "Average texts per batched embedding call.", labels, summary["avg_batch_size"]
+            yield "ai_coach_embed_batch_texts_per_second", "Texts embedded per second of model time.", labels, summary["texts_per_s"]
+
+
+registry.register_collector(_batching_samples)
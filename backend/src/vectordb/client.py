@@ -1,4 +1,22 @@
+import threading
 from qdrant_client import QdrantClient
 from src.config import QDRANT_URL
 
-client = QdrantClient(url=QDRANT_URL)
\ No newline at end of file
+_client: QdrantClient | None = None
+_client_lock = threading.Lock()
+
+
+def get_qdrant_client() -> QdrantClient:
+    """
+    Returns the shared Qdrant client, creating it on first use. QDRANT_URL=":memory:"
+    runs Qdrant's local in-process engine instead of connecting to a server.
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                if QDRANT_URL == ":memory:":
+                    _client = QdrantClient(location=":memory:")
+                else:
+                    _client = QdrantClient(url=QDRANT_URL)
+    return _client
\ No newline at end of file
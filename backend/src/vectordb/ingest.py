@@ -0,0 +1,230 @@
+"""
+Bulk offline ingestion into the Qdrant collection.
+
+Streams documents from local JSONL and PDF files, chunks them, embeds dense and
+sparse vectors in large batches on a worker pool and hands each embedded batch
+to persistent upload threads, so embedding and uploading overlap. Progress is
+checkpointed once a batch and every batch before it are uploaded, so an
+interrupted run resumes where it stopped.
+
+JSONL rows need a `text` (or `page_content`/`summary`) and a `source` (or
+`url`/`link`); `title` and `authors` are kept as metadata. PDFs use their
+file URI as the source.
+
+Points follow the layout add_to_db_node writes: one parent point per source
+(standing in for the summary, with the leading chunk as its text and the
+source text's content hash) and `kind="chunk"` points linked to it through
+`parent_id`, so both retrieval modes find ingested sources and a later
+add_to_db of the same source replaces them cleanly.
+
+Usage (from backend/):
+    python -m src.vectordb.ingest data/ --batch-size 128 --workers 2
+"""
+import argparse
+import json
+import os
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Iterator, List, Tuple
+
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+from qdrant_client.http import models
+
+from src.vectordb.client import get_qdrant_client
+from src.vectordb.store import source_point_id, content_hash, make_source_chunks
+from src.tools.pdf_text import extract_pdf_text
+from src.config import (
+    QDRANT_COLLECTION_NAME,
+    DENSE_VECTOR_NAME,
+    SPARSE_VECTOR_NAME,
+    get_embedding_model,
+    get_sparse_embedding_model,
+)
+
+Record = Tuple[str, int, dict]
+
+
+def iter_files(paths: List[str]) -> Iterator[Path]:
+    for path in map(Path, paths):
+        candidates = sorted(path.rglob("*")) if path.is_dir() else [path]
+        for candidate in candidates:
+            if candidate.suffix.lower() in (".jsonl", ".pdf"):
+                yield candidate
+
+
+def iter_records(path: Path, skip: int) -> Iterator[Record]:
+    """Yields (file, record index, record) for every record after the first `skip`."""
+    if path.suffix.lower() == ".pdf":
+        if skip < 1:
+            text = extract_pdf_text(path.read_bytes(), max_pages=10_000, max_chars=10_000_000)
+            yield str(path), 0, {"text": text, "source": path.resolve().as_uri(), "title": path.stem}
+        return
+    with open(path, encoding="utf-8") as f:
+        for index, line in enumerate(f):
+            if index < skip or not line.strip():
+                continue
+            row = json.loads(line)
+            yield str(path), index, {
+                "text": row.get("text") or row.get("page_content") or row.get("summary") or "",
+                "source": row.get("source") or row.get("url") or row.get("link"),
+                "title": row.get("title", "N/A"),
+                "authors": row.get("authors"),
+            }
+
+
+def chunk_record(record: dict, splitter: RecursiveCharacterTextSplitter) -> List[Tuple[str, str, dict]]:
+    """
+    Splits a record into (point id, text, metadata) points: the source's parent
+    point, then its chunks.
+    """
+    metadata = {"title": record["title"], "source": record["source"], "content_hash": content_hash(record["text"])}
+    if record.get("authors"):
+        metadata["authors"] = record["authors"]
+    documents, ids = make_source_chunks(record["text"], metadata, splitter)
+    if not documents:
+        return []
+    parent = (source_point_id(record["source"]), documents[0].page_content, metadata)
+    return [parent] + [(point_id, doc.page_content, doc.metadata) for doc, point_id in zip(documents, ids)]
+
+
+def iter_batches(paths: List[str], checkpoint: dict, splitter, batch_size: int):
+    """
+    Groups chunks into batches that end on record boundaries, so checkpoints stay
+    exact. Yields (chunks, (file, resume position)); the last batch of a file
+    carries position -1, meaning the file is done, and may be empty.
+    """
+    for path in iter_files(paths):
+        done = checkpoint.get(str(path), 0)
+        if done == -1:
+            continue
+        batch = []
+        for file, index, record in iter_records(path, done):
+            if not record["text"] or not record["source"]:
+                continue
+            batch.extend(chunk_record(record, splitter))
+            if len(batch) >= batch_size:
+                yield batch, (file, index + 1)
+                batch = []
+        yield batch, (str(path), -1)
+
+
+def embed_batch(batch, dense_model, sparse_model) -> List[models.PointStruct]:
+    texts = [text for _, text, _ in batch]
+    dense_vectors = dense_model.embed_documents(texts)
+    sparse_vectors = sparse_model.embed_documents(texts)
+    return [
+        models.PointStruct(
+            id=point_id,
+            vector={
+                DENSE_VECTOR_NAME: dense,
+                SPARSE_VECTOR_NAME: models.SparseVector(indices=sparse.indices, values=sparse.values),
+            },
+            payload={"page_content": text, "metadata": metadata},
+        )
+        for (point_id, text, metadata), dense, sparse in zip(batch, dense_vectors, sparse_vectors)
+    ]
+
+
+def upload_batch(client, points: List[models.PointStruct], upload_batch_size: int) -> int:
+    for i in range(0, len(points), upload_batch_size):
+        client.upsert(
+            collection_name=QDRANT_COLLECTION_NAME, points=points[i:i + upload_batch_size], wait=True
+        )
+    return len(points)
+
+
+def load_checkpoint(path: str) -> dict:
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    return {}
+
+
+def save_checkpoint(path: str, checkpoint: dict) -> None:
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(checkpoint, f)
+    os.replace(tmp_path, path)
+
+
+def ingest(
+    paths: List[str],
+    batch_size: int,
+    workers: int,
+    upload_batch_size: int,
+    upload_parallel: int,
+    chunk_size: int,
+    chunk_overlap: int,
+    checkpoint_path: str,
+) -> None:
+    checkpoint = load_checkpoint(checkpoint_path)
+    splitter = RecursiveCharacterTextSplitter(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+    # Bulk batches are already large: call the models directly rather than through the micro-batchers.
+    dense_model = getattr(get_embedding_model(), "base", get_embedding_model())
+    sparse_model = getattr(get_sparse_embedding_model(), "base", get_sparse_embedding_model())
+    client = get_qdrant_client()
+
+    start = time.perf_counter()
+    stats = {"points": 0, "batches": 0}
+    embedding, uploading = deque(), deque()
+
+    def start_upload() -> None:
+        # Oldest batch first: the embedders keep working while the upload threads send it.
+        future, position = embedding.popleft()
+        uploading.append((uploader.submit(upload_batch, client, future.result(), upload_batch_size), position))
+
+    def finish_uploads(block: bool) -> None:
+        # Checkpoints follow submission order, so they only ever move forward.
+        while uploading and (block or uploading[0][0].done()):
+            future, (file, position) = uploading.popleft()
+            stats["points"] += future.result()
+            stats["batches"] += 1
+            checkpoint[file] = position
+            save_checkpoint(checkpoint_path, checkpoint)
+            elapsed = time.perf_counter() - start
+            print(f"[INFO] {stats['points']} points in {elapsed:.1f}s ({stats['points'] / elapsed:.1f} points/s), "
+                  f"{file} @ {'done' if position == -1 else position}")
+            block = block and len(uploading) >= upload_parallel * 2
+
+    with ThreadPoolExecutor(max_workers=workers) as executor, \
+            ThreadPoolExecutor(max_workers=upload_parallel, thread_name_prefix="upload") as uploader:
+        for batch, position in iter_batches(paths, checkpoint, splitter, batch_size):
+            embedding.append((executor.submit(embed_batch, batch, dense_model, sparse_model), position))
+            if len(embedding) >= workers * 2:
+                start_upload()
+                finish_uploads(block=len(uploading) >= upload_parallel * 2)
+        while embedding:
+            start_upload()
+            finish_uploads(block=False)
+        while uploading:
+            finish_uploads(block=True)
+
+    elapsed = time.perf_counter() - start
+    print(f"✅ Ingested {stats['points']} points in {stats['batches']} batches, {elapsed:.1f}s "
+          f"({stats['points'] / elapsed if elapsed else 0:.1f} points/s).")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("paths", nargs="+", help="JSONL/PDF files or directories to ingest")
+    parser.add_argument("--batch-size", type=int, default=128, help="chunks embedded per batch")
+    parser.add_argument("--workers", type=int, default=2, help="embedding worker threads")
+    parser.add_argument("--upload-batch-size", type=int, default=64, help="points per upsert request")
+    parser.add_argument("--upload-parallel", type=int, default=2, help="upload worker threads")
+    parser.add_argument("--chunk-size", type=int, default=1200, help="characters per chunk")
+    parser.add_argument("--chunk-overlap", type=int, default=150)
+    parser.add_argument("--checkpoint", default=".cache/ingest_checkpoint.json")
+    args = parser.parse_args()
+    ingest(
+        args.paths,
+        batch_size=args.batch_size,
+        workers=args.workers,
+        upload_batch_size=args.upload_batch_size,
+        upload_parallel=args.upload_parallel,
+        chunk_size=args.chunk_size,
+        chunk_overlap=args.chunk_overlap,
+        checkpoint_path=args.checkpoint,
+    )
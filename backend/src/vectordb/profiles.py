@@ -0,0 +1,75 @@
+from qdrant_client.http import models
+
+# Storage/index profiles for the main collection. "default" reproduces the
+# original setup: everything in RAM, no quantization.
+COLLECTION_PROFILES = {
+    "default": {
+        "quantization": None,
+        "on_disk": False,
+        "sparse_on_disk": False,
+        "hnsw_m": 16,
+        "hnsw_ef_construct": 100,
+        "on_disk_payload": False,
+    },
+    # int8 vectors kept in RAM for search, originals on disk for rescoring (~4x less RAM).
+    "scalar": {
+        "quantization": "scalar",
+        "on_disk": True,
+        "sparse_on_disk": True,
+        "hnsw_m": 16,
+        "hnsw_ef_construct": 128,
+        "on_disk_payload": True,
+    },
+    # 1 bit per dimension in RAM (~32x less RAM); needs oversampling + rescoring for recall.
+    "binary": {
+        "quantization": "binary",
+        "on_disk": True,
+        "sparse_on_disk": True,
+        "hnsw_m": 16,
+        "hnsw_ef_construct": 128,
+        "on_disk_payload": True,
+    },
+    # Everything on disk, smaller graph: minimum RAM, slowest searches.
+    "low_memory": {
+        "quantization": None,
+        "on_disk": True,
+        "sparse_on_disk": True,
+        "hnsw_m": 8,
+        "hnsw_ef_construct": 64,
+        "on_disk_payload": True,
+    },
+}
+
+PAYLOAD_INDEXES = {
+    "metadata.source": models.PayloadSchemaType.KEYWORD,
+    "metadata.title": models.PayloadSchemaType.TEXT,
+    "metadata.authors": models.PayloadSchemaType.TEXT,
+    "metadata.kind": models.PayloadSchemaType.KEYWORD,
+    "metadata.parent_id": models.PayloadSchemaType.KEYWORD,
+}
+
+
+def get_profile(name: str) -> dict:
+    if name not in COLLECTION_PROFILES:
+        raise ValueError(f"Unknown collection profile: {name}. Choose from {', '.join(COLLECTION_PROFILES)}.")
+    return COLLECTION_PROFILES[name]
+
+
+def quantization_config(profile: dict):
+    """Qdrant quantization config for a profile, or None when it does not quantize."""
+    if profile["quantization"] == "scalar":
+        return models.ScalarQuantization(
+            scalar=models.ScalarQuantizationConfig(type=models.ScalarType.INT8, quantile=0.99, always_ram=True)
+        )
+    if profile["quantization"] == "binary":
+        return models.BinaryQuantization(binary=models.BinaryQuantizationConfig(always_ram=True))
+    return None
+
+
+def search_params(profile: dict, oversampling: float) -> models.SearchParams | None:
+    """Dense search params that rescore quantized candidates with the original vectors."""
+    if profile["quantization"] is None:
+        return None
+    return models.SearchParams(
+        quantization=models.QuantizationSearchParams(rescore=True, oversampling=oversampling)
+    )
@@ -0,0 +1,170 @@
+import asyncio
+import math
+from typing import List, Tuple
+
+from langchain_core.documents import Document
+from qdrant_client.http import models
+
+from src.vectordb.client import get_qdrant_client
+from src.vectordb.profiles import get_profile, search_params
+from src.metrics import qdrant_latency
+from src.config import (
+    QDRANT_COLLECTION_NAME,
+    QDRANT_COLLECTION_PROFILE,
+    QUANTIZATION_OVERSAMPLING,
+    DENSE_VECTOR_NAME,
+    SPARSE_VECTOR_NAME,
+    RETRIEVAL_K,
+    RETRIEVAL_FUSION,
+    RETRIEVAL_PREFETCH_LIMIT,
+    RETRIEVAL_SCORE_THRESHOLD,
+    get_embedding_model,
+    get_sparse_embedding_model,
+)
+
+FUSIONS = {
+    "rrf": models.Fusion.RRF,
+    "dbsf": models.Fusion.DBSF,
+}
+
+
+def point_to_document(point, collection_name: str = QDRANT_COLLECTION_NAME) -> Document:
+    """Converts a Qdrant point written by QdrantVectorStore back into a Document."""
+    payload = point.payload or {}
+    metadata = dict(payload.get("metadata") or {})
+    metadata["_id"] = point.id
+    metadata["_collection_name"] = collection_name
+    return Document(page_content=payload.get("page_content", ""), metadata=metadata)
+
+
+SUMMARIES_ONLY = models.Filter(
+    must_not=[models.FieldCondition(key="metadata.kind", match=models.MatchValue(value="chunk"))]
+)
+CHUNKS_ONLY = models.Filter(
+    must=[models.FieldCondition(key="metadata.kind", match=models.MatchValue(value="chunk"))]
+)
+
+
+def _dense_score(query_vector: List[float], point) -> float | None:
+    """Cosine similarity of the query and a point returned with its dense vector."""
+    vector = (point.vector or {}).get(DENSE_VECTOR_NAME) if isinstance(point.vector, dict) else None
+    if not vector:
+        return None
+    norms = math.sqrt(sum(v * v for v in query_vector)) * math.sqrt(sum(v * v for v in vector))
+    return sum(a * b for a, b in zip(query_vector, vector)) / norms if norms else 0.0
+
+
+async def _hybrid_prefetch(
+    query: str, prefetch_limit: int, query_filter: models.Filter | None
+) -> List[models.Prefetch]:
+    """Embeds the query and builds the dense and sparse candidate prefetches."""
+    dense_vector, sparse_vector = await asyncio.gather(
+        get_embedding_model().aembed_query(query),
+        get_sparse_embedding_model().aembed_query(query),
+    )
+    return [
+        models.Prefetch(
+            query=dense_vector,
+            using=DENSE_VECTOR_NAME,
+            limit=prefetch_limit,
+            filter=query_filter,
+            params=search_params(get_profile(QDRANT_COLLECTION_PROFILE), QUANTIZATION_OVERSAMPLING),
+        ),
+        models.Prefetch(
+            query=models.SparseVector(indices=sparse_vector.indices, values=sparse_vector.values),
+            using=SPARSE_VECTOR_NAME,
+            limit=prefetch_limit,
+            filter=query_filter,
+        ),
+    ]
+
+
+async def hybrid_search(
+    query: str,
+    k: int = RETRIEVAL_K,
+    fusion: str = RETRIEVAL_FUSION,
+    prefetch_limit: int = RETRIEVAL_PREFETCH_LIMIT,
+    score_threshold: float | None = RETRIEVAL_SCORE_THRESHOLD,
+    query_filter: models.Filter | None = SUMMARIES_ONLY,
+    dense_scores: bool = False,
+) -> List[Tuple[Document, float]]:
+    """
+    Runs a dense + sparse hybrid query and returns (document, fused score) pairs, best first.
+
+    Each vector type prefetches `prefetch_limit` candidates, which are fused with
+    Reciprocal Rank Fusion ("rrf", rank-based scores) or Distribution-Based Score
+    Fusion ("dbsf", scores normalised within this query). By default only
+    summaries are searched, not stored source chunks.
+
+    With `dense_scores`, each document's metadata also gets `_dense_score`, the
+    raw cosine similarity of the query and the document's dense vector, which
+    unlike the fused score means the same thing from one query to the next.
+    """
+    if fusion not in FUSIONS:
+        raise ValueError(f"Unknown fusion method: {fusion}")
+
+    prefetch = await _hybrid_prefetch(query, max(prefetch_limit, k), query_filter)
+    with qdrant_latency.time(operation="hybrid_search"):
+        response = await asyncio.to_thread(
+            get_qdrant_client().query_points,
+            collection_name=QDRANT_COLLECTION_NAME,
+            prefetch=prefetch,
+            query=models.FusionQuery(fusion=FUSIONS[fusion]),
+            query_filter=query_filter,
+            score_threshold=score_threshold,
+            limit=k,
+            with_payload=True,
+            with_vectors=[DENSE_VECTOR_NAME] if dense_scores else False,
+        )
+    results = []
+    for point in response.points:
+        doc = point_to_document(point)
+        if dense_scores:
+            doc.metadata["_dense_score"] = _dense_score(prefetch[0].query, point)
+        results.append((doc, point.score))
+    return results
+
+
+async def hybrid_search_chunks(
+    query: str,
+    k: int = RETRIEVAL_K,
+    fusion: str = RETRIEVAL_FUSION,
+    prefetch_limit: int = RETRIEVAL_PREFETCH_LIMIT,
+    score_threshold: float | None = RETRIEVAL_SCORE_THRESHOLD,
+    dense_scores: bool = False,
+) -> List[Tuple[Document, float]]:
+    """
+    Searches stored source chunks and collapses the hits by parent source.
+
+    Returns the parent summaries of the `k` best-matching sources, each scored
+    with its best chunk, so callers get the same documents as hybrid_search.
+    With `dense_scores`, `_dense_score` is the cosine similarity of that chunk.
+    """
+    if fusion not in FUSIONS:
+        raise ValueError(f"Unknown fusion method: {fusion}")
+
+    prefetch = await _hybrid_prefetch(query, max(prefetch_limit, k * 4), CHUNKS_ONLY)
+    with qdrant_latency.time(operation="hybrid_search_chunks"):
+        response = await asyncio.to_thread(
+            get_qdrant_client().query_points_groups,
+            collection_name=QDRANT_COLLECTION_NAME,
+            prefetch=prefetch,
+            query=models.FusionQuery(fusion=FUSIONS[fusion]),
+            query_filter=CHUNKS_ONLY,
+            group_by="metadata.parent_id",
+            group_size=1,
+            limit=k,
+            score_threshold=score_threshold,
+            with_payload=False,
+            with_vectors=[DENSE_VECTOR_NAME] if dense_scores else False,
+            with_lookup=models.WithLookup(collection=QDRANT_COLLECTION_NAME, with_payload=True, with_vectors=False),
+        )
+    results = []
+    for group in response.groups:
+        if group.lookup is None or not group.hits:
+            continue
+        doc = point_to_document(group.lookup)
+        if dense_scores:
+            doc.metadata["_dense_score"] = _dense_score(prefetch[0].query, group.hits[0])
+        results.append((doc, group.hits[0].score))
+    return results
@@ -1,33 +1,100 @@
+import argparse
 from qdrant_client.http import models
-from src.vectordb.client import client
+from src.vectordb.client import get_qdrant_client
+from src.vectordb.profiles import (
+    COLLECTION_PROFILES,
+    PAYLOAD_INDEXES,
+    get_profile,
+    quantization_config,
+)
 from src.config import (
     QDRANT_COLLECTION_NAME, 
+    QDRANT_COLLECTION_PROFILE,
     DENSE_VECTOR_DIM, 
     DENSE_VECTOR_NAME, 
     SPARSE_VECTOR_NAME
 )
 
-def create_qdrant_collection():
+def create_payload_indexes(client, collection_name: str = QDRANT_COLLECTION_NAME):
+    """Index the metadata fields used for filtering and dedup lookups."""
+    for field_name, field_schema in PAYLOAD_INDEXES.items():
+        client.create_payload_index(
+            collection_name=collection_name,
+            field_name=field_name,
+            field_schema=field_schema,
+        )
+
+def create_qdrant_collection(
+    profile_name: str = QDRANT_COLLECTION_PROFILE,
+    client=None,
+    collection_name: str = QDRANT_COLLECTION_NAME,
+):
     """Create a collection in Qdrant with configuration for both dense and sparse vectors."""
+    client = client or get_qdrant_client()
+    profile = get_profile(profile_name)
     try:
-        print(f"Attempting to create collection '{QDRANT_COLLECTION_NAME}'...")
+        print(f"Attempting to create collection '{collection_name}' with profile '{profile_name}'...")
         client.create_collection(
-            collection_name=QDRANT_COLLECTION_NAME,
+            collection_name=collection_name,
             vectors_config={
                 DENSE_VECTOR_NAME: models.VectorParams(
                     size=DENSE_VECTOR_DIM,
-                    distance=models.Distance.COSINE
+                    distance=models.Distance.COSINE,
+                    on_disk=profile["on_disk"],
                 )
             },
             sparse_vectors_config={
                 SPARSE_VECTOR_NAME: models.SparseVectorParams(
-                    index=models.SparseIndexParams(on_disk=False)
+                    index=models.SparseIndexParams(on_disk=profile["sparse_on_disk"])
                 )
             },
+            hnsw_config=models.HnswConfigDiff(m=profile["hnsw_m"], ef_construct=profile["hnsw_ef_construct"]),
+            quantization_config=quantization_config(profile),
+            on_disk_payload=profile["on_disk_payload"],
         )
-        print(f"✅ Collection '{QDRANT_COLLECTION_NAME}' created successfully!")
+        create_payload_indexes(client, collection_name)
+        print(f"✅ Collection '{collection_name}' created successfully!")
     except Exception as e:
         print(f"⚠️ Could not create collection: {e}")
 
+def migrate_qdrant_collection(
+    profile_name: str = QDRANT_COLLECTION_PROFILE,
+    client=None,
+    collection_name: str = QDRANT_COLLECTION_NAME,
+):
+    """
+    Apply a profile to an existing collection in place. Qdrant rebuilds the
+    affected indexes and quantized vectors in the background.
+    """
+    client = client or get_qdrant_client()
+    profile = get_profile(profile_name)
+    try:
+        print(f"Migrating collection '{collection_name}' to profile '{profile_name}'...")
+        client.update_collection(
+            collection_name=collection_name,
+            vectors_config={
+                DENSE_VECTOR_NAME: models.VectorParamsDiff(on_disk=profile["on_disk"])
+            },
+            sparse_vectors_config={
+                SPARSE_VECTOR_NAME: models.SparseVectorParams(
+                    index=models.SparseIndexParams(on_disk=profile["sparse_on_disk"])
+                )
+            },
+            hnsw_config=models.HnswConfigDiff(m=profile["hnsw_m"], ef_construct=profile["hnsw_ef_construct"]),
+            quantization_config=quantization_config(profile) or models.Disabled.DISABLED,
+            collection_params=models.CollectionParamsDiff(on_disk_payload=profile["on_disk_payload"]),
+        )
+        create_payload_indexes(client, collection_name)
+        print(f"✅ Collection '{collection_name}' migrated; optimizers will apply the changes in the background.")
+    except Exception as e:
+        print(f"⚠️ Could not migrate collection: {e}")
+
 if __name__ == "__main__":
-    create_qdrant_collection()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Create or migrate the Qdrant collection.")
+    parser.add_argument("--profile", default=QDRANT_COLLECTION_PROFILE, choices=list(COLLECTION_PROFILES))
+    parser.add_argument("--migrate", action="store_true", help="apply the profile to the existing collection")
+    args = parser.parse_args()
+    if args.migrate:
+        migrate_qdrant_collection(args.profile)
+    else:
+        create_qdrant_collection(args.profile)
@@ -1,21 +1,80 @@
+import hashlib
+import threading
+import uuid
+from langchain_core.documents import Document
 from langchain_qdrant import QdrantVectorStore, RetrievalMode
-from src.vectordb.client import client
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+from src.vectordb.client import get_qdrant_client
 from src.config import (
     QDRANT_COLLECTION_NAME,
-    embedding_model,
-    sparse_embedding_model,
+    get_embedding_model,
+    get_sparse_embedding_model,
     DENSE_VECTOR_NAME,
     SPARSE_VECTOR_NAME,
+    CHUNK_SIZE,
+    CHUNK_OVERLAP,
 )
 
+_store: QdrantVectorStore | None = None
+_store_lock = threading.Lock()
+
+
 def get_qdrant_store() -> QdrantVectorStore:
-    """Initializes and returns the configured QdrantVectorStore object."""
-    return QdrantVectorStore(
-        client=client,
-        collection_name=QDRANT_COLLECTION_NAME,
-        embedding=embedding_model,
-        sparse_embedding=sparse_embedding_model,
-        retrieval_mode=RetrievalMode.HYBRID,
-        vector_name=DENSE_VECTOR_NAME,
-        sparse_vector_name=SPARSE_VECTOR_NAME,
-    )
\ No newline at end of file
+    """
+    Returns the configured QdrantVectorStore object. It is built once, since
+    construction validates the collection against the server.
+    """
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = QdrantVectorStore(
+                    client=get_qdrant_client(),
+                    collection_name=QDRANT_COLLECTION_NAME,
+                    embedding=get_embedding_model(),
+                    sparse_embedding=get_sparse_embedding_model(),
+                    retrieval_mode=RetrievalMode.HYBRID,
+                    vector_name=DENSE_VECTOR_NAME,
+                    sparse_vector_name=SPARSE_VECTOR_NAME,
+                )
+    return _store
+
+
+def source_point_id(source: str) -> str:
+    """Deterministic point ID for a source URL, so re-adding a source overwrites it."""
+    return str(uuid.uuid5(uuid.NAMESPACE_DNS, source))
+
+
+def content_hash(text: str) -> str:
+    """Hash of a source's extracted text, stored in its metadata to detect unchanged re-crawls."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def chunk_point_id(source: str, index: int) -> str:
+    """Point ID of the `index`-th text chunk of a source."""
+    return source_point_id(f"{source}#chunk-{index}")
+
+
+def make_source_chunks(
+    text: str, metadata: dict, splitter: RecursiveCharacterTextSplitter | None = None
+) -> tuple[list[Document], list[str]]:
+    """
+    Splits a source's text into overlapping chunk Documents that point back to the
+    source's summary through `parent_id`. Returns the documents and their point IDs.
+    """
+    splitter = splitter or RecursiveCharacterTextSplitter(chunk_size=CHUNK_SIZE, chunk_overlap=CHUNK_OVERLAP)
+    source = metadata["source"]
+    documents, ids = [], []
+    for index, chunk in enumerate(splitter.split_text(text)):
+        documents.append(Document(
+            page_content=chunk,
+            metadata={
+                "title": metadata.get("title", "N/A"),
+                "source": source,
+                "parent_id": source_point_id(source),
+                "chunk_index": index,
+                "kind": "chunk",
+            },
+        ))
+        ids.append(chunk_point_id(source, index))
+    return documents, ids
\ No newline at end of file
@@ -0,0 +1,61 @@
+import asyncio
+import multiprocessing
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+
+from .config import PARSE_WORKERS
+
+_process_pool: ProcessPoolExecutor | None = None
+# One slot per pool worker, per event loop: work is only submitted when a worker is free.
+_pool_slots: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
+
+
+def get_process_pool() -> ProcessPoolExecutor:
+    """
+    Returns the shared process pool used for CPU-heavy parsing. Workers are
+    spawned rather than forked so they do not inherit the loaded models.
+    """
+    global _process_pool
+    if _process_pool is None:
+        _process_pool = ProcessPoolExecutor(
+            max_workers=PARSE_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _process_pool
+
+
+async def run_in_process_pool(fn, *args):
+    """
+    Runs `fn(*args)` in the shared process pool once a worker is free.
+
+    Callers wait for a slot before anything is submitted, so a caller cancelled
+    while waiting costs nothing, and work that is already running when its
+    caller is cancelled keeps its slot until it finishes instead of letting
+    more submissions queue up behind it in the pool.
+    """
+    loop = asyncio.get_running_loop()
+    slots = _pool_slots.get(loop)
+    if slots is None:
+        slots = _pool_slots[loop] = asyncio.Semaphore(PARSE_WORKERS)
+
+    await slots.acquire()
+    try:
+        future = get_process_pool().submit(fn, *args)
+    except BaseException:
+        slots.release()
+        raise
+
+    def release(_):
+        if not loop.is_closed():
+            loop.call_soon_threadsafe(slots.release)
+
+    future.add_done_callback(release)
+    return await asyncio.wrap_future(future)
+
+
+def shutdown_process_pool() -> None:
+    """Stops the shared process pool, if it was started."""
+    global _process_pool
+    if _process_pool is not None:
+        _process_pool.shutdown(wait=False, cancel_futures=True)
+        _process_pool = None
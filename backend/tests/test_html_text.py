@@ -0,0 +1,37 @@
+"""
+Checks that each HTML extraction backend actually runs and agrees on a sample page.
+
+Usage (from backend/):
+    python -m pytest tests
+"""
+import pytest
+
+from src.tools.html_text import EXTRACTORS, available_extractor, extract_html_text
+
+PAGE = b"""<!DOCTYPE html><html><head><title> Retrieval notes </title>
+<script>var tracking = "Script text that must never be extracted from the page";</script></head>
+<body><nav><ul><li><a href="/a">Home</a></li><li><a href="/b">About</a></li></ul></nav>
+<main><h1>Hybrid search</h1>
+<p>Dense and sparse retrieval are combined so that rare keywords and paraphrases are both found.</p>
+<p>Fusion merges the two ranked lists, and <a href="/rrf">reciprocal rank fusion</a> is the usual default.</p>
+<p><a href="/x">A paragraph that is nothing but one long link to somewhere else</a></p></main>
+<footer><p>Copyright notice that is long enough to pass the length check.</p></footer></body></html>"""
+
+EXPECTED = (
+    "Hybrid search\n"
+    "Dense and sparse retrieval are combined so that rare keywords and paraphrases are both found.\n"
+    "Fusion merges the two ranked lists, and reciprocal rank fusion is the usual default."
+)
+
+
+@pytest.mark.parametrize("extractor", sorted(EXTRACTORS))
+def test_extractor_keeps_article_text_only(extractor):
+    # Calls the backend directly, so a broken import fails here instead of falling back.
+    title, text = extract_html_text(PAGE, extractor=extractor)
+    assert title == "Retrieval notes"
+    assert text == EXPECTED
+
+
+def test_auto_prefers_selectolax_when_installed():
+    pytest.importorskip("selectolax.lexbor")
+    assert available_extractor() == "selectolax"
@@ -46,9 +46,11 @@ export default function DeepSearch() {
       const data = JSON.parse(event.data);
       if (data.type === 'step') {
         setStatusMessages(prev => [...prev, data.message]);
+      } else if (data.type === 'document') {
+        setPassages(prev => [...prev, data.data.content]);
       } else if (data.type === 'result') {
         const resultData = data.data;
-        const finalPassages = resultData?.final.final_results || [];
+        const finalPassages = resultData?.final_results || [];
         if (finalPassages.length > 0) {
           setPassages(finalPassages);
         } else {